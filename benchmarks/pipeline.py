@@ -0,0 +1,289 @@
+"""Throughput and peak memory of the extraction pipeline on synthetic workbooks.
+
+Generates workbooks with benchmarks.synthetic in a scratch data directory
+and times each stage in a fresh process, so every stage reports its own
+peak memory:
+
+    load          open each workbook read-only and read every sheet's cells
+    country       CountryWorksheet on the cells of every country sheet
+    forex         ForexWorksheet on the cells of every Forex sheet
+    extract       extract-forecasts end to end (cold sheet cache)
+    consolidate   consolidate-output for both kinds, in full
+    concepts      the variable-map join of consolidate-output --concepts
+
+country and forex read the cells untimed first, so they measure the
+parsers alone; load measures openpyxl alone. For consolidate and concepts
+workbooks/s counts survey months and sheets/s is not applicable. Rows are
+sheet rows for load and output rows otherwise. Peak memory is the stage
+process's peak resident set size, including the interpreter and imports;
+"+MiB" is its growth during the timed part.
+
+Stages a selected stage depends on (consolidate needs extract, concepts
+needs consolidate) are run as well but not reported.
+
+Usage:
+    python -m benchmarks.pipeline [--months 12] [--countries 25]
+        [--forecasters 30] [--variables 12] [--stages load country ...]
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import resource
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from pathlib import Path
+from typing import Callable, Dict, List, Sequence, Tuple
+
+import pandas as pd
+import pyarrow.parquet as pq
+
+from benchmarks import synthetic
+from consensus_economics.manifest import ExtractionManifest
+from consensus_economics.paths import Paths
+from consensus_economics.worksheets.base_worksheet import read_sheet_values
+from consensus_economics.worksheets.country_worksheet import CountryWorksheet
+from consensus_economics.worksheets.forex_worksheet import ForexWorksheet
+from consensus_economics.worksheets.workbook_cache import open_workbook
+from mains.getters import consolidate_output, extract_forecasts
+
+STAGES = ("load", "country", "forex", "extract", "consolidate", "concepts")
+REQUIRES = {"consolidate": "extract", "concepts": "consolidate"}
+
+# (workbooks, sheets, rows) processed by a stage
+Counts = Tuple[int, int, int]
+
+
+class GridCountryWorksheet(CountryWorksheet):
+    """CountryWorksheet over cells already read from the workbook."""
+
+    def __init__(self, date: str, country: str, rows: List[Tuple]) -> None:
+        self._rows = rows
+        super().__init__(date, country)
+
+    def _get_worksheet(self) -> pd.DataFrame:
+        return pd.DataFrame(self._rows)
+
+
+class GridForexWorksheet(ForexWorksheet):
+    """ForexWorksheet over cells already read from the workbook."""
+
+    def __init__(self, date: str, rows: List[Tuple]) -> None:
+        self._rows = rows
+        super().__init__(date)
+
+    def _get_worksheet(self) -> pd.DataFrame:
+        return pd.DataFrame(self._rows)
+
+
+def workbooks() -> Dict[str, Path]:
+    """Workbooks of the data directory by survey month."""
+    return {path.stem: path for path in sorted(Paths().xlsx.glob("*.xlsx"))}
+
+
+def read_grids(forex: bool) -> Dict[Tuple[str, str], List[Tuple]]:
+    """Cells of every country sheet, or every Forex sheet, keyed by (date, sheet)."""
+    grids = {}
+    for date, path in workbooks().items():
+        workbook = open_workbook(path, read_only=True)
+        for name in workbook.sheetnames:
+            if (name == "Forex") == forex:
+                grids[date, name] = read_sheet_values(workbook[name])
+        workbook.close()
+    return grids
+
+
+def peak_rss() -> int:
+    """Peak resident set size of this process so far, in bytes."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def load_stage(_: Dict) -> Callable[[], Counts]:
+    paths = workbooks()
+
+    def run() -> Counts:
+        sheets = rows = 0
+        for path in paths.values():
+            workbook = open_workbook(path, read_only=True)
+            for worksheet in workbook.worksheets:
+                rows += len(read_sheet_values(worksheet))
+                sheets += 1
+            workbook.close()
+        return len(paths), sheets, rows
+    return run
+
+
+def country_stage(_: Dict) -> Callable[[], Counts]:
+    grids = read_grids(forex=False)
+
+    def run() -> Counts:
+        rows = sum(
+            len(GridCountryWorksheet(date, country, cells).forecasters_data)
+            for (date, country), cells in grids.items()
+        )
+        return len({date for date, _ in grids}), len(grids), rows
+    return run
+
+
+def forex_stage(_: Dict) -> Callable[[], Counts]:
+    grids = read_grids(forex=True)
+
+    def run() -> Counts:
+        rows = sum(len(GridForexWorksheet(date, cells).forecasters_data)
+                   for (date, _), cells in grids.items())
+        return len(grids), len(grids), rows
+    return run
+
+
+def extract_stage(options: Dict) -> Callable[[], Counts]:
+    countries = synthetic.country_names(options["countries"])
+    dates = list(workbooks())
+
+    def run() -> Counts:
+        manifest = ExtractionManifest.load()
+        for date in dates:
+            extract_forecasts.process_date(
+                date, countries, manifest=manifest, formats=(options["format"],)
+            )
+        manifest.save()
+        rows = sum(
+            entry["rows"] for date in dates for entry in manifest.month(date).values()
+        )
+        return len(dates), len(dates) * (len(countries) + 1), rows
+    return run
+
+
+def consolidate_stage(options: Dict) -> Callable[[], Counts]:
+    source = "csv" if options["format"] == "csv" else "dataset"
+
+    def run() -> Counts:
+        rows = 0
+        for kind in extract_forecasts.KINDS:
+            consolidate_output.consolidate(kind, source)
+            rows += pq.read_metadata(Paths().output / f"{kind}.parquet").num_rows
+        return len(workbooks()), 0, rows
+    return run
+
+
+def concepts_stage(_: Dict) -> Callable[[], Counts]:
+    def run() -> Counts:
+        consolidate_output.build_concepts_layer()
+        target = Paths().output / "forecasters_concepts.parquet"
+        return len(workbooks()), 0, pq.read_metadata(target).num_rows
+    return run
+
+
+PREPARE = {
+    "load": load_stage,
+    "country": country_stage,
+    "forex": forex_stage,
+    "extract": extract_stage,
+    "consolidate": consolidate_stage,
+    "concepts": concepts_stage,
+}
+
+
+def run_stage(stage: str, root: str, options: Dict) -> Dict:
+    """
+    Pool task: prepare and time one stage in the directory holding data/.
+
+    Runs in a fresh process, so the peak memory is the stage's own. Output
+    of the pipeline is swallowed to keep the report readable.
+    """
+    os.chdir(root)
+    with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+        run = PREPARE[stage](options)
+        before = peak_rss()
+        start = time.perf_counter()
+        workbooks_done, sheets, rows = run()
+        seconds = time.perf_counter() - start
+    peak = peak_rss()
+    return {
+        "seconds": seconds,
+        "workbooks": workbooks_done,
+        "sheets": sheets,
+        "rows": rows,
+        "peak": peak,
+        "growth": peak - before,
+    }
+
+
+def with_requirements(stages: Sequence[str]) -> List[str]:
+    """The selected stages plus the stages they need, in pipeline order."""
+    needed = set(stages)
+    for stage in stages:
+        while stage in REQUIRES:
+            stage = REQUIRES[stage]
+            needed.add(stage)
+    return [stage for stage in STAGES if stage in needed]
+
+
+def report(stage: str, result: Dict) -> None:
+    seconds = result["seconds"]
+
+    def rate(count: int) -> str:
+        return f"{count / seconds:>11,.1f}" if count else f"{'-':>11}"
+
+    print(
+        f"{stage:<12} {seconds:8.2f} s  {rate(result['workbooks'])}  {rate(result['sheets'])}  "
+        f"{rate(result['rows'])}  {result['peak'] / 2**20:8.0f}  {result['growth'] / 2**20:+7.0f}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--months", type=int, default=12, help="Workbooks (default: 12)")
+    parser.add_argument("--countries", type=int, default=25, help="Country sheets (default: 25)")
+    parser.add_argument("--forecasters", type=int, default=30,
+                        help="Forecasters per sheet (default: 30)")
+    parser.add_argument("--variables", type=int, default=12,
+                        help="Paired variables per sheet (default: 12)")
+    parser.add_argument("--stages", nargs="+", choices=STAGES, default=list(STAGES),
+                        help="Stages to report (default: all)")
+    parser.add_argument("--format", choices=extract_forecasts.FORMATS, default="csv",
+                        help="Per-month output format of extract (default: csv)")
+    parser.add_argument("--keep", action="store_true",
+                        help="Keep the scratch data directory and print its location")
+    args = parser.parse_args()
+
+    root = Path(tempfile.mkdtemp(prefix="consensus-bench-"))
+    try:
+        start = time.perf_counter()
+        synthetic.generate(
+            root / "data" / "xlsx",
+            synthetic.survey_months("202401", args.months),
+            countries=args.countries,
+            forecasters=args.forecasters,
+            variables=args.variables,
+        )
+        print(
+            f"{args.months} workbooks x {args.countries + 1} sheets, {args.forecasters} "
+            f"forecasters x {args.variables} variables (generated in "
+            f"{time.perf_counter() - start:.1f} s)"
+        )
+        print(
+            f"{'stage':<12} {'time':>10}  {'workbooks/s':>11}  {'sheets/s':>11}  "
+            f"{'rows/s':>11}  {'peak MiB':>8}  {'+MiB':>7}"
+        )
+        options = {"countries": args.countries, "format": args.format}
+        for stage in with_requirements(args.stages):
+            # A fresh interpreter per stage, so peak memory is not inherited
+            with ProcessPoolExecutor(1, mp_context=get_context("spawn")) as pool:
+                result = pool.submit(run_stage, stage, str(root), options).result()
+            if stage in args.stages:
+                report(stage, result)
+    finally:
+        if args.keep:
+            print(f"Data kept in {root / 'data'}")
+        else:
+            shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
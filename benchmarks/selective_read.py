@@ -0,0 +1,129 @@
+"""Selective-read latency of the consolidated forecasters panel, by layout.
+
+Rewrites an existing forecasters.parquet in two layouts and times the same
+single-series queries against each through ConsensusStore:
+
+    survey-order  rows in survey month order, 128k-row row groups, snappy
+                  (the layout consolidate-output wrote before clustering)
+    clustered     the current consolidate-output layout: sorted by
+                  (country, variable, survey_date), ROW_GROUP_ROWS-row
+                  groups, zstd, statistics and page indexes
+
+A full pd.read_parquet followed by a pandas filter is timed as reference.
+
+Usage:
+    python -m benchmarks.selective_read [--panel PATH] [--queries N]
+"""
+
+import argparse
+import random
+import statistics
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+from consensus_economics.paths import Paths
+from consensus_economics.schema import consolidated_schema
+from consensus_economics.store import ConsensusStore
+from mains.getters import consolidate_output
+
+Query = Dict[str, str]
+
+
+def write_survey_order(table: pa.Table, target: Path) -> None:
+    """Rows in survey month order, as consolidated before clustering."""
+    order = pc.sort_indices(table["survey_date"])
+    pq.write_table(
+        table.take(order).unify_dictionaries().combine_chunks(),
+        target,
+        row_group_size=128 * 1024,
+        compression="snappy",
+    )
+
+
+def write_clustered(table: pa.Table, target: Path) -> None:
+    """Rows laid out exactly as consolidate-output writes them."""
+    step = 128 * 1024
+    slices = (table.slice(offset, step) for offset in range(0, table.num_rows, step))
+    consolidate_output.write_months(target, "forecasters", slices)
+
+
+def sample_queries(table: pa.Table, n: int, seed: int = 0) -> List[Query]:
+    """Random (country, variable, source) series present in the panel."""
+    keys = table.select(["country", "variable", "source"]).to_pandas().dropna()
+    series = keys.astype(str).drop_duplicates().sample(
+        n=min(n, len(keys)), random_state=random.Random(seed).randrange(2**31)
+    )
+    return series.to_dict("records")
+
+
+def time_queries(run: Callable[[Query], int], queries: List[Query]) -> Tuple[List[float], int]:
+    """Latency of each query in milliseconds, and the total rows returned."""
+    latencies, rows = [], 0
+    for query in queries:
+        start = time.perf_counter()
+        rows += run(query)
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies, rows
+
+
+def row_groups_read(store: ConsensusStore, queries: List[Query]) -> float:
+    """Average number of row groups a query has to decode."""
+    counts = [
+        sum(f.num_row_groups for f in store.query(**query).source.get_fragments())
+        for query in queries
+    ]
+    return statistics.mean(counts)
+
+
+def report(name: str, latencies: List[float], rows: int, groups: str) -> None:
+    ordered = sorted(latencies)
+    p95 = ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))]
+    print(
+        f"{name:<14} median {statistics.median(ordered):8.1f} ms   p95 {p95:8.1f} ms   "
+        f"rows {rows:>9,}   row groups/query {groups}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--panel", type=Path, help="forecasters.parquet to rewrite")
+    parser.add_argument("--queries", type=int, default=50, help="Series to query (default: 50)")
+    args = parser.parse_args()
+
+    panel = args.panel or Paths().output / "forecasters.parquet"
+    table = pq.read_table(panel, schema=consolidated_schema("forecasters"))
+    queries = sample_queries(table, args.queries)
+    print(f"{panel}: {table.num_rows:,} rows, {len(queries)} single-series queries")
+
+    def full_load(query: Query) -> int:
+        df = pd.read_parquet(panel)
+        mask = pd.Series(True, index=df.index)
+        for column, value in query.items():
+            mask &= df[column] == value
+        return int(mask.sum())
+
+    report("full load", *time_queries(full_load, queries[:5]), "all")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, write in (("survey-order", write_survey_order), ("clustered", write_clustered)):
+            path = Path(tmp) / f"{name}.parquet"
+            write(table, path)
+            store = ConsensusStore(path)
+            store.query(**queries[0]).count_rows()  # read the footer once
+            latencies, rows = time_queries(
+                lambda query: store.query(**query).to_table().num_rows, queries
+            )
+            total = pq.ParquetFile(path).metadata.num_row_groups
+            groups = f"{row_groups_read(store, queries):.1f} of {total}"
+            report(name, latencies, rows, groups)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,278 @@
+"""Synthetic Consensus Economics workbooks in the layout the parsers expect.
+
+The licensed workbooks cannot be committed, so parser benchmarks and tests
+that need an xlsx run on generated ones. Each workbook has one sheet per
+country plus a Forex sheet, laid out like the real files:
+
+    country sheet
+        row 0       title
+        rows 1-3    variable labels, wrapped over up to three rows; the
+                    release date ("September 9, 2024") at [3, 0]
+        row 4       units
+        row 5       target years (or Increase / No Change / Decrease)
+        rows 6-10   Consensus (Mean), High, Low, Standard Deviation,
+                    Number of Forecasts
+        row 25 on   one row per forecaster
+        columns     a current-/next-year pair per variable, then a
+                    monetary-policy probability triple
+
+    Forex sheet
+        row 3       release date at [3, 0]
+        rows 8-18   USD block: two header rows, then one row per currency
+        rows 19-24  EUR block, likewise
+        columns     spot rate in column 3, 3/12/24-month forecasts in
+                    columns 5, 7 and 9, each followed by a % change
+
+The Consensus statistics are computed from the forecaster cells, so the
+generated sheets are internally consistent. Generation is deterministic for
+a given seed.
+
+Usage:
+    python -m benchmarks.synthetic OUT_DIR [--start 202401] [--months 12]
+        [--countries 25] [--forecasters 30] [--variables 12]
+"""
+
+import argparse
+import calendar
+from pathlib import Path
+from typing import List, Optional, Sequence
+
+import numpy as np
+from openpyxl import Workbook
+
+from consensus_economics.config import COUNTRIES, CURRENCY_CODES
+
+FORECASTER_ROW = 25
+SUMMARY_ROWS = ["Consensus (Mean)", "High", "Low", "Standard Deviation", "Number of Forecasts"]
+TRIPLE_LEGS = ["Increase", "No Change", "Decrease"]
+
+# Raw labels as they appear in the workbooks, with their units
+VARIABLES = {
+    "Gross Domestic Product": "real, % change",
+    "Consumer Prices": "% change",
+    "Industrial Production": "% change",
+    "Unemployment Rate": "% of labour force",
+    "Current Account": "US$ billion",
+    "Personal Consumption": "real, % change",
+    "Business Investment": "real, % change",
+    "Producer Prices": "% change",
+    "Three month Interest Rates": "% per annum",
+    "10 Year Govt Bond Yield": "% per annum",
+    "Housing Starts": "million units",
+    "Corporate Profits": "% change",
+    "Budget Balance (Fiscal Years)": "US$ billion",
+    "Employment Costs": "% change",
+    "Gross National Product": "real, % change",
+}
+MONETARY_POLICY = "Money Policy Evaluation Prob. of Rate Change at Next"
+
+# Currencies quoted against the US dollar, then against the euro
+USD_CURRENCIES = list(CURRENCY_CODES)[:9]
+EUR_CURRENCIES = list(CURRENCY_CODES)[9:]
+
+
+def country_names(count: int) -> List[str]:
+    """Sheet names for count countries: the configured ones, then placeholders."""
+    return list(COUNTRIES[:count]) + [f"Country {i + 1}" for i in range(len(COUNTRIES), count)]
+
+
+def variable_names(count: int) -> List[str]:
+    """Labels for count paired variables: real labels, then placeholders."""
+    return list(VARIABLES)[:count] + [f"Variable {i + 1}" for i in range(len(VARIABLES), count)]
+
+
+def survey_months(start: str, count: int) -> List[str]:
+    """count consecutive YYYYMM months from start."""
+    first = int(start[:4]) * 12 + int(start[4:]) - 1
+    return [f"{month // 12}{month % 12 + 1:02d}" for month in range(first, first + count)]
+
+
+def release_date(date: str) -> str:
+    """Release date as printed in the sheets: the second Monday of the month."""
+    year, month = int(date[:4]), int(date[4:])
+    first_monday = (7 - calendar.monthrange(year, month)[0]) % 7 + 1
+    return f"{calendar.month_name[month]} {first_monday + 7}, {year}"
+
+
+def _wrap(label: str) -> List[Optional[str]]:
+    """Split a label over the three header rows, as the workbooks wrap it."""
+    words = label.split(" ")
+    parts = np.array_split(np.array(words, dtype=object), 3)
+    return [" ".join(part) or None for part in parts]
+
+
+def _cells(values: np.ndarray, missing: np.ndarray) -> List[List]:
+    """Rows of Python values, None where missing."""
+    cells = values.astype(object)
+    cells[missing] = None
+    return cells.tolist()
+
+
+def country_grid(
+    date: str,
+    country: str,
+    forecasters: int = 30,
+    variables: int = 12,
+    monetary_policy: bool = True,
+    missing: float = 0.05,
+    seed: int = 0,
+) -> List[List]:
+    """
+    Cells of one country sheet, row by row.
+
+    Args:
+        date: Survey month (yyyymm)
+        country: Country name, written in the title
+        forecasters: Forecaster rows from row 25 on
+        variables: Variables with a current-/next-year column pair
+        monetary_policy: Append a monetary-policy probability triple
+        missing: Share of forecaster cells left empty
+        seed: Seed; the same arguments always give the same sheet
+
+    Returns:
+        Rows of equal length
+    """
+    rng = np.random.default_rng([seed, int(date), sum(map(ord, country))])
+    year = int(date[:4])
+    labels = variable_names(variables)
+    width = 1 + 2 * len(labels) + (3 if monetary_policy else 0)
+    grid: List[List] = [[None] * width for _ in range(FORECASTER_ROW + forecasters)]
+    grid[0][0] = f"{country} - Consensus Forecasts"
+    grid[3][0] = release_date(date)
+
+    # Forecasts scatter around a level per variable; a share is missing
+    level = rng.uniform(-2.0, 8.0, size=(1, len(labels), 2))
+    values = np.round(level + rng.normal(0, 0.4, size=(forecasters, len(labels), 2)), 1)
+    absent = rng.random(values.shape) < missing
+    masked = np.ma.masked_array(values, absent)
+    counts = (~absent).sum(axis=0)
+    summary = np.stack([
+        masked.mean(axis=0).round(4).filled(np.nan),
+        masked.max(axis=0).filled(np.nan),
+        masked.min(axis=0).filled(np.nan),
+        masked.std(axis=0, ddof=1).round(4).filled(np.nan),
+        counts.astype(float),
+    ])
+    summary[:4][:, counts == 0] = np.nan
+
+    for v, label in enumerate(labels):
+        column = 1 + 2 * v
+        for row, part in enumerate(_wrap(label), start=1):
+            grid[row][column] = part
+        grid[4][column:column + 2] = [VARIABLES.get(label, "% change")] * 2
+        grid[5][column:column + 2] = [year, year + 1]
+    summary = summary.reshape(len(SUMMARY_ROWS), -1)
+    for row, (name, cells) in enumerate(
+        zip(SUMMARY_ROWS, _cells(summary, np.isnan(summary))), start=6
+    ):
+        grid[row][0] = name
+        grid[row][1:1 + len(cells)] = cells
+    forecaster_cells = _cells(values.reshape(forecasters, -1), absent.reshape(forecasters, -1))
+    for i, cells in enumerate(forecaster_cells):
+        grid[FORECASTER_ROW + i][0] = f"Forecaster {i + 1:03d}"
+        grid[FORECASTER_ROW + i][1:1 + len(cells)] = cells
+
+    if monetary_policy:
+        column = width - 3
+        for row, part in enumerate(_wrap(MONETARY_POLICY), start=1):
+            grid[row][column] = part
+        grid[4][column] = "% probability"
+        grid[5][column:] = TRIPLE_LEGS
+        increase = int(rng.integers(0, 101))
+        unchanged = int(rng.integers(0, 101 - increase))
+        grid[6][column:] = [increase, unchanged, 100 - increase - unchanged]
+    return grid
+
+
+def forex_grid(date: str, seed: int = 0) -> List[List]:
+    """Cells of the Forex sheet, row by row (see the module docstring)."""
+    rng = np.random.default_rng([seed, int(date)])
+    grid: List[List] = [[None] * 11 for _ in range(25)]
+    grid[0][0] = "Foreign Exchange Consensus Forecasts"
+    grid[3][0] = release_date(date)
+    blocks = ((8, "US$", USD_CURRENCIES), (19, "Euro", EUR_CURRENCIES))
+    for first, reference, currencies in blocks:
+        grid[first][0] = f"Currency per {reference}"
+        grid[first + 1][3:11] = ["Spot", None, "3 months", "% chg", "12 months", "% chg",
+                                 "24 months", "% chg"]
+        for i, name in enumerate(currencies):
+            spot = round(float(rng.uniform(0.5, 150.0)), 4)
+            forecasts = np.round(spot * (1 + rng.normal(0, 0.03, size=3)), 4).tolist()
+            row = grid[first + 2 + i]
+            row[0] = name
+            row[3] = spot
+            for column, forecast in zip((5, 7, 9), forecasts):
+                row[column] = forecast
+                row[column + 1] = round((forecast / spot - 1) * 100, 2)
+    return grid
+
+
+def write_workbook(
+    path: Path,
+    date: str,
+    countries: int = 25,
+    forecasters: int = 30,
+    variables: int = 12,
+    monetary_policy: bool = True,
+    missing: float = 0.05,
+    seed: int = 0,
+) -> Path:
+    """
+    Write one synthetic monthly workbook.
+
+    Args:
+        path: Target xlsx file
+        date: Survey month (yyyymm)
+        countries: Country sheets, named as in COUNTRIES (placeholders beyond)
+        forecasters, variables, monetary_policy, missing, seed: See country_grid
+
+    Returns:
+        path
+    """
+    workbook = Workbook(write_only=True)
+    for country in country_names(countries):
+        sheet = workbook.create_sheet(country)
+        for row in country_grid(
+            date, country, forecasters, variables, monetary_policy, missing, seed
+        ):
+            sheet.append(row)
+    sheet = workbook.create_sheet("Forex")
+    for row in forex_grid(date, seed):
+        sheet.append(row)
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    workbook.save(path)
+    return path
+
+
+def generate(directory: Path, dates: Sequence[str], **options) -> List[Path]:
+    """Write <directory>/<YYYYMM>.xlsx for each date; options as in write_workbook."""
+    return [write_workbook(Path(directory) / f"{date}.xlsx", date, **options) for date in dates]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("out", type=Path, help="Directory for the YYYYMM.xlsx files")
+    parser.add_argument("--start", default="202401", help="First survey month (default: 202401)")
+    parser.add_argument("--months", type=int, default=12, help="Workbooks (default: 12)")
+    parser.add_argument("--countries", type=int, default=25, help="Country sheets (default: 25)")
+    parser.add_argument("--forecasters", type=int, default=30,
+                        help="Forecasters per sheet (default: 30)")
+    parser.add_argument("--variables", type=int, default=12,
+                        help="Paired variables per sheet (default: 12)")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed (default: 0)")
+    args = parser.parse_args()
+
+    paths = generate(
+        args.out,
+        survey_months(args.start, args.months),
+        countries=args.countries,
+        forecasters=args.forecasters,
+        variables=args.variables,
+        seed=args.seed,
+    )
+    print(f"Wrote {len(paths)} workbooks to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
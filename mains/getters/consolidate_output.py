@@ -1,59 +1,260 @@
-"""Consolidate per-month output CSVs into single Parquet files.
+"""Consolidate per-month outputs into single Parquet files.
 
 Produces data/output/forecasters.parquet and data/output/forex.parquet with
 typed columns (categoricals for repeated strings, dates as dates) — the file
-you point an analysis at, instead of 800+ CSVs.
+you point an analysis at, instead of 800+ CSVs. The months are read from the
+per-month CSVs or, with --source dataset, from the partitioned Parquet
+dataset the extractors write with --format parquet.
+
+The files are clustered by series: forecasters rows are sorted by
+(country, variable, survey_date) and forex rows by (currency, survey_date),
+in row groups small enough that their min/max statistics let readers skip
+everything but the series they ask for. Statistics, page indexes and
+dictionary encoding are written for every column; compression is zstd by
+default (--compression, --compression-level).
+
+Months are streamed into per-country (per-currency) spill files and each is
+sorted and written out in turn, so memory stays at one country's history
+rather than the whole panel. Alongside forecasters.parquet goes its series
+index, forecasters.series.parquet (see consensus_economics.series_index),
+rebuilt on every run since appending months shifts row numbers.
+
+With --incremental, only the survey months whose source file is new or
+changed since the last consolidation are read and parsed; the other rows
+are streamed back from the existing Parquet file, one row group at a time,
+and the file is rewritten in full. It cannot be appended to: every survey
+month has rows in every country's row groups, so new row groups at the end
+would break the clustering readers rely on to skip data, and Parquet row
+groups cannot be copied into a new file without decoding them. The
+partitioned dataset (--format parquet of the extractors) is the layout
+that is updated one month at a time. The bookkeeping for --incremental
+lives in data/output/.consolidate/:
+
+    <kind>.json                 # source and (size, mtime) of each month consolidated
+    variable_counts.parquet     # rows per month/country/variable/unit, from
+                                # which variables.csv is rebuilt
+    fixed_horizon.json          # forecasters months each derived file was
+    revisions.json              # last built from, in the same form
+
+A derived file is brought up to date with every forecasters month that
+changed since it was built, including months consolidated by runs that
+did not ask for it, and rebuilt in full when that is unknown.
+
+With --metrics PATH, per-stage timings and counters (per-month reads, the
+write of each kind, the derived files) are appended to PATH and summarized
+at the end of the run (see consensus_economics.metrics). --profile DIR
+profiles the write of each kind and the derived files into DIR (see
+consensus_economics.profiling).
 """
 
 import argparse
+import itertools
+import json
+import os
+import tempfile
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime
+from functools import partial
+from pathlib import Path
+from typing import Deque, Dict, Iterable, Iterator, List, Optional, Tuple
 
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pacsv
+import pyarrow.parquet as pq
 from tqdm import tqdm
 
-from consensus_economics.mappings import load_variable_map
+from consensus_economics import (
+    cube,
+    dataset,
+    horizons,
+    metrics,
+    profiling,
+    revisions,
+    series_index,
+)
+from consensus_economics.mappings import load_variable_index
 from consensus_economics.paths import Paths
+from consensus_economics.schema import (
+    DATE,
+    categorical_columns,
+    consolidated_schema,
+    month_schema,
+)
+from consensus_economics.utils.atomic_write import AtomicWriteUtils
+from consensus_economics.utils.file_hash import FileHashUtils
 
 CATEGORICAL_COLUMNS = {
-    "forecasters": ["country", "variable", "source", "statistic", "unit"],
-    "forex": ["currency", "reference"],
+    "forecasters": categorical_columns("forecasters"),
+    "forex": categorical_columns("forex"),
+}
+
+SOURCES = ("csv", "dataset")
+
+# pandas' default NA markers, so CSV cells are nulled exactly as read_csv did
+NULL_VALUES = [
+    "", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan",
+    "1.#IND", "1.#QNAN", "<NA>", "N/A", "NA", "NULL", "NaN", "None", "n/a",
+    "nan", "null",
+]
+
+INVENTORY_KEYS = ["survey_date", "country", "variable", "unit"]
+
+# Clustering of the consolidated files; the first key also splits the spill
+SORT_KEYS = {
+    "forecasters": ["country", "variable", "survey_date"],
+    "forex": ["currency", "survey_date"],
 }
 
+# Rows per row group of the consolidated files. Small enough that one
+# country-variable series spans only a few groups, large enough to keep
+# per-group overhead (dictionaries, statistics) negligible.
+ROW_GROUP_ROWS = 32 * 1024
+
+# Stages --profile covers unless told otherwise; the per-month reads run on
+# worker threads and can be added with --profile-stages read
+PROFILE_STAGES = ("write", "inventory", "fixed_horizon", "revisions", "concepts", "cube")
+
+COMPRESSIONS = ("zstd", "snappy", "lz4", "gzip", "none")
+DEFAULT_COMPRESSION = "zstd"
+
+
+def state_dir() -> Path:
+    """Bookkeeping for incremental consolidation."""
+    return Paths().output / ".consolidate"
+
 
-def collect_kind(kind: str) -> pd.DataFrame:
-    """Read every <year>/<kind>/<YYYYMM>.csv under data/output into one frame."""
+def source_months(kind: str, source: str = "csv") -> Dict[str, Path]:
+    """Source file of every survey month (yyyymm) of a kind, in date order."""
+    if source == "dataset":
+        return {month_of(path, source): path for path in dataset.month_files(kind)}
+    return {path.stem: path for path in sorted(Paths().output.glob(f"*/{kind}/*.csv"))}
+
+
+def month_of(path: Path, source: str = "csv") -> str:
+    """Survey month (yyyymm) of a source file."""
+    if source == "dataset":
+        # .../survey_date=YYYY-MM-01/part-0.parquet
+        return path.parent.name.split("=")[1][:7].replace("-", "")
+    return path.stem
+
+
+def collect_kind(kind: str, source: str = "csv", workers: Optional[int] = None) -> pd.DataFrame:
+    """Read every month of a kind under data/output into one frame."""
+    if source == "dataset":
+        table = dataset.open_dataset(kind).to_table(columns=consolidated_schema(kind).names)
+    else:
+        table = collect_kind_csv(kind, workers)
+    return to_frame(table, kind)
+
+
+def to_frame(table: pa.Table, kind: str) -> pd.DataFrame:
+    """Consolidated table to pandas, with categories in sorted order.
+
+    Months arrive with their own dictionaries, so the categories otherwise
+    come out in order of first appearance.
+    """
+    combined = table.to_pandas()
+    for col in CATEGORICAL_COLUMNS[kind]:
+        combined[col] = combined[col].cat.set_categories(sorted(combined[col].cat.categories))
+    return combined
+
+
+def collect_kind_csv(kind: str, workers: Optional[int] = None) -> pa.Table:
+    """Read every <year>/<kind>/<YYYYMM>.csv under data/output into one table.
+
+    Files are parsed concurrently, each straight into the declared schema,
+    so no column types are inferred and strings are dictionary-encoded as
+    they are read rather than held as Python objects.
+    """
     output = Paths().output
-    files = sorted(output.glob(f"*/{kind}/*.csv"))
+    files = list(source_months(kind, "csv").values())
     if not files:
         raise FileNotFoundError(f"No {kind} CSVs found under {output}")
 
-    frames = []
-    for path in tqdm(files, desc=f"Reading {kind}", ncols=100):
-        df = pd.read_csv(path, dtype={"release_date": "string"})
-        # The survey month only lives in the filename; release_date can be
-        # empty when the workbook's date cell was unparseable
-        df["survey_date"] = path.stem
-        frames.append(df)
+    workers = workers or min(32, os.cpu_count() or 1)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        tables = list(
+            tqdm(
+                executor.map(partial(read_csv_table, kind=kind), files),
+                total=len(files),
+                desc=f"Reading {kind}",
+                ncols=100,
+            )
+        )
+    return pa.concat_tables(tables)
 
-    combined = pd.concat(frames, ignore_index=True)
 
-    combined["release_date"] = pd.to_datetime(
-        combined["release_date"], format="%Y%m%d", errors="coerce"
+def read_csv_table(path: Path, kind: str) -> pa.Table:
+    """Parse one <YYYYMM>.csv into the consolidated schema of its kind."""
+    schema = month_schema(kind)
+    # release_date is parsed below so malformed dates become nulls instead
+    # of failing the whole file
+    column_types = {
+        field.name: pa.string() if field.name == "release_date" else field.type
+        for field in schema
+    }
+    table = pacsv.read_csv(
+        path,
+        read_options=pacsv.ReadOptions(use_threads=False),
+        convert_options=pacsv.ConvertOptions(
+            column_types=column_types,
+            include_columns=schema.names,
+            null_values=NULL_VALUES,
+            strings_can_be_null=True,
+        ),
     )
-    combined["survey_date"] = pd.to_datetime(
-        combined["survey_date"], format="%Y%m", errors="raise"
+    release_date = pc.strptime(
+        table["release_date"], format="%Y%m%d", unit="us", error_is_null=True
     )
-    for col in CATEGORICAL_COLUMNS[kind]:
-        combined[col] = combined[col].astype("category")
+    table = table.set_column(
+        schema.get_field_index("release_date"), "release_date", release_date
+    )
+    # The survey month only lives in the filename; release_date can be
+    # empty when the workbook's date cell was unparseable
+    survey_date = pa.scalar(datetime.strptime(path.stem, "%Y%m"), type=DATE)
+    return table.append_column("survey_date", pa.repeat(survey_date, table.num_rows))
 
-    return combined
 
+def read_month_table(kind: str, source: str, path: Path) -> pa.Table:
+    """One survey month of a kind with the consolidated columns and types."""
+    with metrics.stage("read", date=month_of(path, source), kind=kind) as event:
+        if source == "dataset":
+            columns = consolidated_schema(kind).names
+            table = dataset.open_dataset(kind, [path]).to_table(columns=columns)
+        else:
+            table = read_csv_table(path, kind)
+        event["rows"] = table.num_rows
+        event["bytes"] = path.stat().st_size
+    return table
 
-def write_variable_inventory(combined: pd.DataFrame) -> None:
-    """Inventory of raw variable names — the input for any canonicalization map."""
-    inventory = (
-        combined.groupby(["country", "variable"], observed=True)
+
+def variable_counts(combined: pd.DataFrame) -> pd.DataFrame:
+    """Rows per survey month, country, variable and unit.
+
+    Additive across months, so the inventory can be updated by swapping
+    out the counts of the months that changed.
+    """
+    counts = (
+        combined.groupby(INVENTORY_KEYS, observed=True, dropna=False)
+        .size()
+        .rename("n_obs")
+        .reset_index()
+    )
+    for col in INVENTORY_KEYS[1:]:
+        counts[col] = counts[col].astype("string")
+    return counts
+
+
+def inventory_from_counts(counts: pd.DataFrame) -> pd.DataFrame:
+    """Inventory of raw variable names from per-month variable counts."""
+    return (
+        counts.dropna(subset=["country", "variable"])
+        .groupby(["country", "variable"])
         .agg(
-            n_obs=("value", "size"),
+            n_obs=("n_obs", "sum"),
             first_survey=("survey_date", "min"),
             last_survey=("survey_date", "max"),
             units=("unit", lambda u: " | ".join(sorted(set(u.dropna().astype(str))))),
@@ -61,18 +262,351 @@ def write_variable_inventory(combined: pd.DataFrame) -> None:
         .reset_index()
         .sort_values(["country", "variable"])
     )
-    target = Paths().output / "variables.csv"
-    inventory.to_csv(target, index=False)
+
+
+def write_variable_inventory(counts: pd.DataFrame) -> None:
+    """Inventory of raw variable names — the input for any canonicalization map."""
+    with metrics.stage("inventory") as event:
+        state_dir().mkdir(parents=True, exist_ok=True)
+        counts.to_parquet(state_dir() / "variable_counts.parquet", index=False)
+        inventory = inventory_from_counts(counts)
+        target = Paths().output / "variables.csv"
+        inventory.to_csv(target, index=False)
+        event["rows"] = len(inventory)
     print(f"variables: {len(inventory):,} country-variable pairs -> {target}")
 
 
-def consolidate(kind: str) -> None:
-    combined = collect_kind(kind)
+def load_state(kind: str) -> Dict:
+    """What the last consolidation of a kind was built from, or {} if unknown."""
+    try:
+        return json.loads((state_dir() / f"{kind}.json").read_text())
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def save_state(kind: str, source: str, signatures: Dict[str, List[int]]) -> None:
+    state_dir().mkdir(parents=True, exist_ok=True)
+    state = {"source": source, "months": signatures}
+    (state_dir() / f"{kind}.json").write_text(json.dumps(state, indent=1))
+
+
+def stale_months(name: str) -> Optional[set]:
+    """
+    Forecasters months added, replaced or removed since a derived file was built.
+
+    Args:
+        name: Derived file's state name ("fixed_horizon", "revisions")
+
+    Returns:
+        The YYYYMM months, or None if what it was built from is unknown
+    """
+    built, panel = load_state(name), load_state("forecasters")
+    if not built or not panel or built.get("source") != panel.get("source"):
+        return None
+    previous, current = built["months"], panel["months"]
+    changed = {date for date, signature in current.items() if previous.get(date) != signature}
+    return changed | (set(previous) - set(current))
+
+
+def month_signatures(months: Dict[str, Path]) -> Dict[str, List[int]]:
+    """(size, mtime_ns) of each month's source file."""
+    return {date: list(FileHashUtils.signature(path)) for date, path in months.items()}
+
+
+def iter_months(
+    kind: str, source: str, months: Dict[str, Path], workers: Optional[int] = None
+) -> Iterator[Tuple[str, pa.Table]]:
+    """Read months in date order, parsing a few ahead on a thread pool.
+
+    Only a bounded window of months is in flight, so memory stays at a
+    handful of months however long the history is.
+    """
+    workers = workers or min(32, os.cpu_count() or 1)
+    read = partial(read_month_table, kind, source)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        pending: Deque[Tuple[str, Future]] = deque()
+        for date, path in months.items():
+            pending.append((date, executor.submit(read, path)))
+            if len(pending) > 2 * workers:
+                date, future = pending.popleft()
+                yield date, future.result()
+        while pending:
+            date, future = pending.popleft()
+            yield date, future.result()
+
+
+def _counted(
+    months: Iterator[Tuple[str, pa.Table]], counts: List[pd.DataFrame]
+) -> Iterator[Tuple[str, pa.Table]]:
+    """Pass months through, collecting their variable counts on the way."""
+    for date, table in months:
+        counts.append(variable_counts(table.to_pandas()))
+        yield date, table
+
+
+def write_months(
+    target: Path,
+    kind: str,
+    tables: Iterable[pa.Table],
+    compression: str = DEFAULT_COMPRESSION,
+    compression_level: Optional[int] = None,
+) -> int:
+    """
+    Write rows into a Parquet file clustered by the kind's SORT_KEYS.
+
+    Rows are first spilled to one file per value of the leading sort key
+    (country, currency) beside target. Each spill file is then sorted on
+    the remaining keys and written out in row groups of ROW_GROUP_ROWS, so
+    a group never mixes two leading keys. The sort is stable: rows of one
+    series and survey month keep their extraction order. The file is moved
+    over target when complete.
+
+    For forecasters, the series index (consensus_economics.series_index) is
+    collected from each sorted spill file as it is written and saved next
+    to target, so it never needs a separate pass over the panel.
+
+    Args:
+        target: Consolidated Parquet file
+        kind: Output kind
+        tables: Rows with the kind's consolidated schema, whole months in any order
+        compression: Parquet codec
+        compression_level: Codec level (None for the codec's default)
+
+    Returns:
+        Number of rows written
+    """
+    schema = consolidated_schema(kind)
+    indexed = kind == "forecasters"
+    panel_id = series_index.new_consolidation_id()
+    if indexed:
+        schema = schema.with_metadata({series_index.CONSOLIDATION_ID: panel_id})
+    entries: List[pa.Table] = []
+    rows = 0
+    target.parent.mkdir(parents=True, exist_ok=True)
+    with tempfile.TemporaryDirectory(prefix=f".{kind}-spill-", dir=target.parent) as spill:
+        buckets = _spill_by_leading_key(tables, kind, Path(spill))
+        with AtomicWriteUtils.replacing(target) as tmp:
+            with pq.ParquetWriter(
+                tmp,
+                schema,
+                compression=compression,
+                compression_level=compression_level,
+                write_statistics=True,
+                write_page_index=True,
+            ) as writer:
+                for _, path in sorted(buckets.items(), key=_bucket_order):
+                    table = _sort_table(pq.read_table(path, schema=schema), kind)
+                    writer.write_table(table, row_group_size=ROW_GROUP_ROWS)
+                    if indexed:
+                        keys = table.select(series_index.SERIES_KEYS)
+                        entries.append(series_index.series_entries(keys, rows))
+                    rows += table.num_rows
+    if indexed:
+        # Written after the panel is in place; until then the old index is
+        # recognized as stale by its consolidation id
+        series_index.write_series_index(series_index.index_path(target), entries, panel_id)
+    return rows
+
+
+def _bucket_order(item: Tuple[Optional[str], Path]) -> Tuple[bool, str]:
+    """Leading-key values in ascending order, nulls last."""
+    return item[0] is None, item[0] or ""
+
+
+def _sort_keys(table: pa.Table, keys: List[str]) -> pa.Table:
+    """Sort key columns, with each dictionary column replaced by the rank of
+    its values (Arrow cannot sort dictionaries, and integers sort faster
+    than the decoded strings)."""
+    columns = []
+    for key in keys:
+        column = table[key]
+        if pa.types.is_dictionary(column.type):
+            array = column.combine_chunks()
+            ranks = pc.rank(array.dictionary, sort_keys="ascending", tiebreaker="dense")
+            column = ranks.take(array.indices)
+        columns.append(column)
+    return pa.table(columns, names=keys)
+
+
+def _sort_table(table: pa.Table, kind: str) -> pa.Table:
+    """Stable sort of a table on the kind's SORT_KEYS, as one chunk."""
+    keys = SORT_KEYS[kind]
+    order = pc.sort_indices(
+        _sort_keys(table, keys),
+        sort_keys=[(key, "ascending") for key in keys],
+    )
+    return table.take(order).unify_dictionaries().combine_chunks()
+
+
+def _spill_by_leading_key(
+    tables: Iterable[pa.Table], kind: str, spill: Path
+) -> Dict[Optional[str], Path]:
+    """
+    Distribute rows into one uncompressed Parquet file per leading-key value.
+
+    Rows are buffered per value and flushed in row groups of about
+    ROW_GROUP_ROWS, so memory stays at one buffer per value.
+
+    Returns:
+        Spill file of each leading-key value (None for nulls)
+    """
+    schema = consolidated_schema(kind)
+    key = SORT_KEYS[kind][0]
+    paths: Dict[Optional[str], Path] = {}
+    writers: Dict[Optional[str], pq.ParquetWriter] = {}
+    buffers: Dict[Optional[str], List[pa.Table]] = {}
+
+    def flush(value: Optional[str]) -> None:
+        if value not in writers:
+            paths[value] = spill / f"{len(paths)}.parquet"
+            writers[value] = pq.ParquetWriter(paths[value], schema, compression="none")
+        table = pa.concat_tables(buffers.pop(value)).unify_dictionaries().combine_chunks()
+        writers[value].write_table(table, row_group_size=table.num_rows)
+
+    try:
+        for table in tables:
+            if not table.num_rows:
+                continue
+            # Group the rows by leading key (nulls last), keeping their order
+            # within a group; value_counts lists the sorted runs in order
+            keys = _sort_keys(table, [key])
+            order = pc.sort_indices(keys, sort_keys=[(key, "ascending")])
+            table = table.take(order)
+            runs = pc.value_counts(keys[key].take(order).combine_chunks()).to_pylist()
+            start = 0
+            for run in runs:
+                value, length = table[key][start].as_py(), run["counts"]
+                buffers.setdefault(value, []).append(table.slice(start, length))
+                start += length
+                if sum(part.num_rows for part in buffers[value]) >= ROW_GROUP_ROWS:
+                    flush(value)
+        for value in list(buffers):
+            flush(value)
+    finally:
+        for writer in writers.values():
+            writer.close()
+    return paths
+
+
+def consolidate(
+    kind: str,
+    source: str = "csv",
+    workers: Optional[int] = None,
+    compression: str = DEFAULT_COMPRESSION,
+    compression_level: Optional[int] = None,
+) -> None:
+    """Rebuild the consolidated file of a kind from every month, streaming.
+
+    Peak memory is one leading-key bucket (a country's history) rather
+    than the whole panel. Returns None, meaning every month was rewritten
+    (see consolidate_incremental).
+    """
+    months = source_months(kind, source)
+    if not months:
+        raise FileNotFoundError(f"No {kind} months found under {Paths().output}")
+    signatures = month_signatures(months)
+
     target = Paths().output / f"{kind}.parquet"
-    combined.to_parquet(target, index=False)
-    print(f"{kind}: {len(combined):,} rows -> {target}")
+    counts: List[pd.DataFrame] = []
+    stream = tqdm(
+        iter_months(kind, source, months, workers),
+        total=len(months),
+        desc=f"Reading {kind}",
+        ncols=100,
+    )
+    if kind == "forecasters":
+        stream = _counted(stream, counts)
+    with metrics.stage("write", kind=kind) as event:
+        rows = write_months(
+            target, kind, (table for _, table in stream), compression, compression_level
+        )
+        event["rows"], event["bytes"] = rows, target.stat().st_size
+    print(f"{kind}: {rows:,} rows -> {target}")
+
+    save_state(kind, source, signatures)
     if kind == "forecasters":
-        write_variable_inventory(combined)
+        write_variable_inventory(pd.concat(counts, ignore_index=True))
+
+
+def _existing_rows(target: Path, kind: str, skip: set) -> Iterator[pa.Table]:
+    """Rows of the consolidated file, one row group at a time, minus skip months."""
+    schema = consolidated_schema(kind)
+    parquet = pq.ParquetFile(target)
+    skip_dates = pa.array([datetime.strptime(date, "%Y%m") for date in sorted(skip)], DATE)
+    for i in range(parquet.num_row_groups):
+        table = parquet.read_row_group(i, columns=schema.names).cast(schema)
+        yield table.filter(pc.invert(pc.is_in(table["survey_date"], value_set=skip_dates)))
+
+
+def consolidate_incremental(
+    kind: str,
+    source: str = "csv",
+    workers: Optional[int] = None,
+    compression: str = DEFAULT_COMPRESSION,
+    compression_level: Optional[int] = None,
+) -> Optional[set]:
+    """Update the consolidated file of a kind with only new or changed months.
+
+    Only those months are parsed; the file itself is rewritten with the
+    rows of the other months read back from it (see the module docstring
+    for why it is not appended to). Falls back to a full consolidation
+    when there is no record of the last one, or it was built from a
+    different source.
+
+    Returns:
+        The YYYYMM months added, replaced or removed, or None after a full
+        consolidation
+    """
+    target = Paths().output / f"{kind}.parquet"
+    state = load_state(kind)
+    if not target.exists() or state.get("source") != source:
+        print(f"{kind}: no previous consolidation from {source}, rebuilding in full")
+        consolidate(kind, source, workers, compression, compression_level)
+        return None
+
+    months = source_months(kind, source)
+    signatures = month_signatures(months)
+    previous = state["months"]
+    changed = {
+        date: path for date, path in months.items() if previous.get(date) != signatures[date]
+    }
+    removed = sorted(set(previous) - set(signatures))
+    if not changed and not removed:
+        print(f"{kind}: up to date ({len(signatures)} months)")
+        return set()
+
+    replaced = set(changed) | set(removed)
+    new_counts: List[pd.DataFrame] = []
+    stream = tqdm(
+        iter_months(kind, source, changed, workers),
+        total=len(changed),
+        desc=f"Reading {kind}",
+        ncols=100,
+    )
+    if kind == "forecasters":
+        stream = _counted(stream, new_counts)
+    tables = itertools.chain(
+        _existing_rows(target, kind, replaced), (table for _, table in stream)
+    )
+    with metrics.stage("write", kind=kind) as event:
+        rows = write_months(target, kind, tables, compression, compression_level)
+        event["rows"], event["bytes"] = rows, target.stat().st_size
+
+    print(
+        f"{kind}: {len(changed)} month(s) added or replaced, {len(removed)} removed; "
+        f"{rows:,} rows -> {target}"
+    )
+    save_state(kind, source, signatures)
+
+    if kind == "forecasters":
+        counts_file = state_dir() / "variable_counts.parquet"
+        if not counts_file.exists():
+            write_variable_inventory(variable_counts(pd.read_parquet(target)))
+        else:
+            counts = pd.read_parquet(counts_file)
+            kept = ~counts["survey_date"].dt.strftime("%Y%m").isin(replaced)
+            write_variable_inventory(pd.concat([counts[kept], *new_counts], ignore_index=True))
+    return replaced
 
 
 def build_concepts_layer() -> None:
@@ -83,65 +617,143 @@ def build_concepts_layer() -> None:
         raise FileNotFoundError(f"{source} not found — consolidate forecasters first")
     combined = pd.read_parquet(source)
 
-    mapping = load_variable_map()
-    mapping = mapping.assign(
-        valid_from=pd.to_datetime(mapping["valid_from"]),
-        valid_to=pd.to_datetime(mapping["valid_to"]),
-    )[
-        ["country", "raw_variable", "valid_from", "valid_to",
-         "concept_id", "concept_label", "mapping_status"]
-    ]
+    index = load_variable_index()
+    overlaps = index.overlaps()
+    if not overlaps.empty:
+        print(f"WARNING: {len(overlaps)} map entries overlap an earlier range of "
+              "the same label; the later entry wins from its valid_from:")
+        for _, row in overlaps.iterrows():
+            print(f"  {row['country']} / {row['raw_variable']} from "
+                  f"{str(row['valid_from'])[:10]}")
 
-    merged = combined.merge(
-        mapping,
-        how="left",
-        left_on=["country", "variable"],
-        right_on=["country", "raw_variable"],
-    )
-    # A raw label can map to different concepts over time — keep the row
-    # whose validity range covers the survey date
-    in_range = merged["valid_from"].notna() & merged["survey_date"].between(
-        merged["valid_from"], merged["valid_to"]
-    )
-    duplicated_key = merged.duplicated(
-        ["country", "variable", "source", "statistic", "year", "survey_date"],
-        keep=False,
-    )
-    merged = merged[in_range | ~duplicated_key].drop(
-        columns=["raw_variable", "valid_from", "valid_to"]
+    # A raw label can map to different concepts over time — resolve each row
+    # to the entry whose validity range is in force at its survey date
+    position, covered = index.lookup(
+        combined["country"], combined["variable"], combined["survey_date"]
     )
-    merged["mapping_status"] = merged["mapping_status"].fillna("unmapped")
+    mapped = position >= 0
+    for col in ["concept_id", "concept_label", "mapping_status"]:
+        combined[col] = pd.Series(index.column(col, position), index=combined.index, dtype="str")
+    combined["mapping_status"] = combined["mapping_status"].fillna("unmapped")
 
-    unmapped = (merged["mapping_status"] == "unmapped").sum()
+    unmapped = (~mapped).sum()
     if unmapped:
         print(f"WARNING: {unmapped:,} rows have no map entry")
+    gaps = (mapped & ~covered).sum()
+    if gaps:
+        print(f"WARNING: {gaps:,} rows fall outside every validity range of their "
+              "label and use the nearest earlier (or first) entry")
 
     target = Paths().output / "forecasters_concepts.parquet"
-    merged.to_parquet(target, index=False)
-    print(f"concepts: {len(merged):,} rows -> {target}")
+    combined.to_parquet(target, index=False)
+    print(f"concepts: {len(combined):,} rows -> {target}")
 
 
 def main() -> None:
     parser = argparse.ArgumentParser(
-        description="Consolidate output CSVs into Parquet files"
+        description="Consolidate per-month outputs into Parquet files"
     )
     parser.add_argument(
         "--kind",
         choices=["forecasters", "forex"],
         help="Consolidate only one kind (default: both)",
     )
+    parser.add_argument(
+        "--source",
+        choices=list(SOURCES),
+        default="csv",
+        help="Read the per-month CSVs or the Parquet dataset written by "
+        "extract-forecasts --format parquet (default: csv)",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Only read survey months that are new or changed since the last "
+        "consolidation and update the existing files",
+    )
+    parser.add_argument(
+        "--compression",
+        choices=list(COMPRESSIONS),
+        default=DEFAULT_COMPRESSION,
+        help=f"Parquet codec of the consolidated files (default: {DEFAULT_COMPRESSION})",
+    )
+    parser.add_argument(
+        "--compression-level",
+        type=int,
+        help="Codec level, e.g. 1-22 for zstd (default: the codec's default)",
+    )
     parser.add_argument(
         "--concepts",
         action="store_true",
         help="Also build forecasters_concepts.parquet from the variable map",
     )
+    parser.add_argument(
+        "--fixed-horizon",
+        action="store_true",
+        help="Also convert the forecasters panel to 12-month-ahead forecasts "
+        "(fixed_horizon.parquet); with --incremental only changed months are redone",
+    )
+    parser.add_argument(
+        "--revisions",
+        action="store_true",
+        help="Also compute month-on-month forecast revisions (revisions.parquet); "
+        "with --incremental only rows linked to changed months are redone",
+    )
+    parser.add_argument(
+        "--cube",
+        action="store_true",
+        help="Also materialize the consensus cube (data/output/cube) from "
+        "forecasters_concepts.parquet",
+    )
+    metrics.add_argument(parser)
+    profiling.add_arguments(parser, PROFILE_STAGES)
     args = parser.parse_args()
 
+    with metrics.collecting(args.metrics, "consolidate-output"), profiling.profiling(args):
+        run_steps(args)
+
+
+def run_steps(args: argparse.Namespace) -> None:
+    """Consolidate the requested kinds, then build the requested derived files."""
     kinds = [args.kind] if args.kind else ["forecasters", "forex"]
     for kind in kinds:
-        consolidate(kind)
+        run = consolidate_incremental if args.incremental else consolidate
+        run(
+            kind,
+            args.source,
+            compression=args.compression,
+            compression_level=args.compression_level,
+        )
+    derived = [
+        (args.fixed_horizon, "fixed_horizon", horizons.fixed_horizon_path,
+         horizons.update_fixed_horizon),
+        (args.revisions, "revisions", revisions.revisions_path, revisions.update_revisions),
+    ]
+    for wanted, name, path, update in derived:
+        if not wanted:
+            continue
+        target = path()
+        # Diffed against the panel months the file was built from, not this
+        # run's changes: earlier runs may have consolidated months without it
+        months = stale_months(name) if args.incremental else None
+        label = name.replace("_", " ")
+        if months == set() and target.exists():
+            print(f"{label}: up to date")
+            continue
+        with metrics.stage(name) as event:
+            rows = update(months)
+            event["rows"], event["bytes"] = rows, target.stat().st_size
+        print(f"{label}: {rows:,} rows -> {target}")
+        panel = load_state("forecasters")
+        if panel:
+            save_state(name, panel["source"], panel["months"])
     if args.concepts:
-        build_concepts_layer()
+        with metrics.stage("concepts"):
+            build_concepts_layer()
+    if args.cube:
+        with metrics.stage("cube"):
+            directory = cube.materialize()
+        print(f"cube: {directory}")
 
 
 if __name__ == "__main__":
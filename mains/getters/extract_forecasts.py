@@ -0,0 +1,491 @@
+"""Extract country and forex forecasts from each workbook in a single pass.
+
+Every month's workbook is opened once and shared by all CountryWorksheet
+parsers plus the ForexWorksheet, writing both <year>/forecasters/ and
+<year>/forex/ outputs. A month is re-extracted only when its workbook
+content or the parser changed since the last run, as recorded in
+data/output/manifest.json. get-country-forecasts and get-forex-forecasts are
+thin views over this module that select one kind.
+
+With --metrics PATH, per-stage timings and counters (workbook load, sheet to
+frame, parse, clean, write; see consensus_economics.metrics) are appended to
+PATH and summarized at the end of the run. With --profile DIR, selected
+stages (whole months by default) are profiled into DIR (see
+consensus_economics.profiling); months then run in this process.
+"""
+
+import argparse
+import contextlib
+import hashlib
+import io
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from pathlib import Path
+from typing import Iterable, Optional, Sequence
+
+import pandas as pd
+from tqdm import tqdm
+
+from consensus_economics import dataset, metrics, profiling
+from consensus_economics.config import COUNTRIES, END_YEAR, START_YEAR
+from consensus_economics.manifest import ExtractionManifest
+from consensus_economics.paths import Paths
+from consensus_economics.utils.date_format import DateFormatUtils
+from consensus_economics.worksheets.base_worksheet import (
+    clear_workbook_cache,
+    workbook_cache_stats,
+)
+from consensus_economics.worksheets.country_worksheet import CountryWorksheet
+from consensus_economics.worksheets.forex_worksheet import ForexWorksheet
+
+KINDS = ("forecasters", "forex")
+PARSERS = {"forecasters": CountryWorksheet, "forex": ForexWorksheet}
+
+# Output formats: per-month CSVs and/or the partitioned Parquet dataset
+FORMATS = ("csv", "parquet")
+
+# Stages --profile covers unless told otherwise
+PROFILE_STAGES = ("month",)
+
+
+def output_file(date: str, kind: str) -> Path:
+    """Per-month output CSV for one kind: <year>/<kind>/<YYYYMM>.csv."""
+    return Paths().output / date[:4] / kind / f"{date}.csv"
+
+
+def output_paths(date: str, kind: str, formats: Iterable[str] = ("csv",)) -> list[Path]:
+    """Every file one month of a kind is written to in the given formats."""
+    paths = []
+    if "csv" in formats:
+        paths.append(output_file(date, kind))
+    if "parquet" in formats:
+        paths.append(dataset.month_file(kind, date))
+    return paths
+
+
+def write_outputs(
+    df: pd.DataFrame, date: str, kind: str, formats: Iterable[str] = ("csv",)
+) -> None:
+    """Write one month of a kind in each requested format."""
+    with metrics.stage("write", date=date, kind=kind) as event:
+        if "csv" in formats:
+            filename = output_file(date, kind)
+            os.makedirs(filename.parent, exist_ok=True)
+            df.to_csv(filename, index=False)
+        if "parquet" in formats:
+            dataset.write_month(df, kind, date)
+        event["rows"] = len(df)
+        if metrics.enabled():
+            event["bytes"] = sum(path.stat().st_size for path in output_paths(date, kind, formats))
+
+
+def remove_outputs(date: str, kind: str, formats: Iterable[str] = ("csv",)) -> None:
+    """Delete one month of a kind, so no output from an older run lingers."""
+    if "csv" in formats:
+        output_file(date, kind).unlink(missing_ok=True)
+    if "parquet" in formats:
+        dataset.remove_month(kind, date)
+
+
+def xlsx_file(date: str) -> Path:
+    """Source workbook for one survey month."""
+    return Paths().xlsx / f"{date}.xlsx"
+
+
+def parser_version(kind: str) -> str:
+    """Version of the parser producing one output kind."""
+    return PARSERS[kind].PARSER_VERSION
+
+
+def options_fingerprint(kind: str, countries: Sequence[str] = COUNTRIES) -> str:
+    """Settings besides the workbook that shape one kind's output."""
+    if kind != "forecasters":
+        return ""
+    return hashlib.sha1("\n".join(sorted(countries)).encode()).hexdigest()[:12]
+
+
+def is_up_to_date(
+    date: str,
+    kind: str,
+    manifest: ExtractionManifest,
+    countries: Sequence[str] = COUNTRIES,
+    formats: Iterable[str] = ("csv",),
+) -> bool:
+    """Whether a month's output was extracted from the current workbook and parser."""
+    return manifest.is_current(
+        date,
+        kind,
+        xlsx_file(date),
+        parser_version(kind),
+        output_paths(date, kind, formats),
+        options_fingerprint(kind, countries),
+        tuple(formats),
+    )
+
+
+def process_country(date: str, country: str) -> tuple[str, pd.DataFrame]:
+    """Process a single country's data for a given date."""
+    try:
+        data_consensus = CountryWorksheet(date, country)
+    except KeyError:
+        # Sheet absent in this vintage (coverage varies by year) — not an error
+        return country, pd.DataFrame()
+
+    df = data_consensus.forecasters_data
+    if data_consensus.skipped_cells:
+        tqdm.write(
+            f"{date} {country}: skipped {data_consensus.skipped_cells} "
+            "non-numeric cells"
+        )
+    if df.empty:
+        # Sheet exists but yielded nothing — layout the parser can't read
+        tqdm.write(f"WARNING {date} {country}: sheet present but parsed to 0 rows")
+    return country, df
+
+
+def extract_forecasters(
+    date: str,
+    countries: Sequence[str],
+    manifest: Optional[ExtractionManifest] = None,
+    formats: Iterable[str] = ("csv",),
+) -> int:
+    """Parse every country sheet of one workbook and write the forecasters output.
+
+    The extraction is recorded in manifest if given, also when the workbook
+    holds no forecaster data, unless a country failed; such a month is left
+    pending so the next run retries it.
+
+    Returns:
+        Number of rows written
+    """
+    all_data = []
+    failed = []
+    for country in countries:
+        try:
+            country, df = process_country(date, country)
+            if not df.empty:
+                all_data.append(df)
+        except Exception as e:
+            failed.append(country)
+            tqdm.write(f"Error processing {country}: {str(e)}")
+
+    rows = 0
+    if not all_data and failed:
+        # Most likely the workbook itself is unreadable; keep what an earlier
+        # run extracted from it rather than deleting it
+        tqdm.write(f"No data to save for {date}, keeping any existing output")
+    elif not all_data:
+        tqdm.write(f"No data to save for {date}")
+        # Don't leave an output from an older workbook or parser behind
+        remove_outputs(date, "forecasters", formats)
+    else:
+        final_df = pd.concat(all_data, ignore_index=True, copy=False)
+        # Only a missing value invalidates a row; missing metadata (e.g.
+        # unit) must not silently drop observations
+        cleaned_df = final_df.dropna(subset=["value"])
+        dropped = len(final_df) - len(cleaned_df)
+        if dropped:
+            tqdm.write(f"{date}: dropped {dropped} rows with missing value")
+        write_outputs(cleaned_df, date, "forecasters", formats)
+        tqdm.write(f"Saved {len(all_data)} countries for {date} ({', '.join(formats)})")
+        rows = len(cleaned_df)
+
+    if failed:
+        tqdm.write(f"{date}: {len(failed)} countries failed, not recorded as extracted")
+    elif manifest is not None:
+        manifest.record(
+            date,
+            "forecasters",
+            xlsx_file(date),
+            parser_version("forecasters"),
+            rows,
+            options_fingerprint("forecasters", countries),
+            tuple(formats),
+        )
+    return rows
+
+
+def extract_forex(
+    date: str,
+    manifest: Optional[ExtractionManifest] = None,
+    formats: Iterable[str] = ("csv",),
+) -> pd.DataFrame:
+    """Parse the Forex sheet of one workbook and write the forex output.
+
+    A successful extraction is recorded in manifest if given, also when the
+    sheet holds no data; a failed one is reported and left unrecorded so
+    the next run retries it.
+    """
+    try:
+        result = ForexWorksheet(date).forecasters_data
+
+        written = result.drop_duplicates()
+        if not written.empty:
+            write_outputs(written, date, "forex", formats)
+            tqdm.write(f"Saved forex data for {date}")
+        else:
+            remove_outputs(date, "forex", formats)
+
+        if manifest is not None:
+            manifest.record(
+                date,
+                "forex",
+                xlsx_file(date),
+                parser_version("forex"),
+                len(written),
+                formats=tuple(formats),
+            )
+        return result
+    except Exception as e:
+        tqdm.write(f"Error processing forex data for {date}: {str(e)}")
+        return pd.DataFrame()
+
+
+def process_date(
+    date: str,
+    countries: Sequence[str] = COUNTRIES,
+    kinds: Iterable[str] = KINDS,
+    reload: bool = False,
+    manifest: Optional[ExtractionManifest] = None,
+    formats: Iterable[str] = ("csv",),
+) -> None:
+    """Extract the requested kinds for one survey month from a single workbook load.
+
+    A kind is skipped when the manifest shows its output was built from the
+    same workbook content by the current parser, unless reload is set.
+
+    Args:
+        date: Survey month (yyyymm)
+        countries: Country sheets to parse for the forecasters output
+        kinds: Output kinds to extract
+        reload: Re-extract even if the output is up to date
+        manifest: Manifest to check and update; if omitted it is loaded
+            from and saved back to data/output/manifest.json
+        formats: Output formats to write ("csv" and/or "parquet")
+    """
+    own_manifest = manifest is None
+    if own_manifest:
+        manifest = ExtractionManifest.load()
+
+    try:
+        if not xlsx_file(date).exists():
+            tqdm.write(f"No xlsx file for {date}, skipping...")
+            return
+
+        pending = []
+        for kind in kinds:
+            if not reload and is_up_to_date(date, kind, manifest, countries, formats):
+                tqdm.write(f"{kind} output for {date} is up to date, skipping...")
+            else:
+                pending.append(kind)
+
+        hits = workbook_cache_stats().hits
+        try:
+            with metrics.stage("month", date=date) as event:
+                # All parsers below share the cached workbook for this date
+                if "forecasters" in pending:
+                    extract_forecasters(date, countries, manifest, formats)
+                if "forex" in pending:
+                    extract_forex(date, manifest, formats)
+                event["workbook_cache_hits"] = workbook_cache_stats().hits - hits
+        finally:
+            # Clear cache for this date to free memory
+            clear_workbook_cache(date)
+
+    except Exception as e:
+        tqdm.write(f"Error processing date {date}: {str(e)}")
+        raise
+    finally:
+        if own_manifest:
+            manifest.save()
+
+
+def _process_date_captured(
+    date: str,
+    countries: Sequence[str],
+    kinds: tuple[str, ...],
+    reload: bool,
+    formats: tuple[str, ...],
+    collect_metrics: bool = False,
+) -> tuple[str, str, str, dict, list]:
+    """Pool task: run process_date, returning (date, log, error, entries, records).
+
+    Runs in a worker process, so the workbook cache it fills is that
+    worker's own. Output is captured so the parent can report months in
+    order, and the month's manifest entries are handed back for the parent
+    to save, so workers never write the manifest concurrently. Metrics
+    records, if collected, are handed back the same way.
+    """
+    log = io.StringIO()
+    error = ""
+    manifest = ExtractionManifest.load()
+    collected = metrics.RunMetrics() if collect_metrics else metrics.DISABLED
+    with contextlib.redirect_stdout(log), metrics.activated(collected):
+        try:
+            process_date(date, countries, kinds, reload, manifest, formats)
+        except Exception as e:
+            error = str(e) or type(e).__name__
+    records = collected.records if collect_metrics else []
+    return date, log.getvalue(), error, manifest.month(date), records
+
+
+def run_parallel(
+    dates: Sequence[str],
+    kinds: tuple[str, ...],
+    countries: Sequence[str],
+    reload: bool,
+    workers: int,
+    formats: tuple[str, ...] = ("csv",),
+) -> None:
+    """Spread months across a process pool, reporting results in date order.
+
+    A month that fails is reported and does not stop the others.
+    """
+    failed = []
+    manifest = ExtractionManifest.load()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        task = partial(
+            _process_date_captured,
+            countries=list(countries),
+            kinds=kinds,
+            reload=reload,
+            formats=formats,
+            collect_metrics=metrics.enabled(),
+        )
+        results = executor.map(task, dates)
+        for date, log, error, entries, records in tqdm(
+            results,
+            total=len(dates),
+            desc=f"Processing ({workers} workers)",
+            ncols=100,
+            bar_format="{l_bar}{bar}| {n_fmt}/{total_fmt} [{elapsed}<{remaining}]",
+        ):
+            if log:
+                tqdm.write(log.rstrip("\n"))
+            if error:
+                failed.append(date)
+            manifest.update_month(date, entries)
+            manifest.save()
+            metrics.active().extend(records)
+
+    if failed:
+        print(f"{len(failed)} month(s) failed: {', '.join(failed)}")
+
+
+def run(
+    years: Iterable[int],
+    kinds: Iterable[str] = KINDS,
+    countries: Sequence[str] = COUNTRIES,
+    reload: bool = False,
+    workers: int = 1,
+    formats: Iterable[str] = ("csv",),
+) -> None:
+    """Extract every month of the given years, on ``workers`` processes if > 1."""
+    kinds = tuple(kinds)
+    formats = tuple(formats)
+    if workers > 1:
+        dates = [
+            DateFormatUtils.get_date(year, month) for year in years for month in range(1, 13)
+        ]
+        run_parallel(dates, kinds, countries, reload, workers, formats)
+        return
+
+    manifest = ExtractionManifest.load()
+    for year in years:
+        dates = [DateFormatUtils.get_date(year, month) for month in range(1, 13)]
+
+        for date in tqdm(
+            dates,
+            desc=f"Processing {year}",
+            ncols=100,
+            bar_format="{l_bar}{bar}| {n_fmt}/{total_fmt} [{elapsed}<{remaining}]",
+        ):
+            try:
+                process_date(date, countries, kinds, reload, manifest, formats)
+            finally:
+                manifest.save()
+
+
+def add_common_arguments(parser: argparse.ArgumentParser) -> None:
+    """Arguments shared by every extraction CLI."""
+    parser.add_argument(
+        "--year",
+        type=int,
+        help="Year to process (e.g., 2024). If not provided, processes all years",
+    )
+    parser.add_argument(
+        "--reload",
+        action="store_true",
+        help="Re-extract every month, even those whose workbook and parser are unchanged",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of worker processes; months are spread across them (default: 1)",
+    )
+    parser.add_argument(
+        "--format",
+        choices=["csv", "parquet", "both"],
+        default="csv",
+        help="Write per-month CSVs, the partitioned Parquet dataset under "
+        "data/output/dataset, or both (default: csv)",
+    )
+    metrics.add_argument(parser)
+    profiling.add_arguments(parser, PROFILE_STAGES)
+
+
+def selected_workers(args: argparse.Namespace) -> int:
+    """Worker processes to use; profiled runs stay in this process."""
+    if args.profile is not None and args.workers > 1:
+        print("Profiling: running months in this process instead of on workers")
+        return 1
+    return args.workers
+
+
+def selected_formats(args: argparse.Namespace) -> tuple[str, ...]:
+    """Output formats requested on the command line."""
+    return FORMATS if args.format == "both" else (args.format,)
+
+
+def selected_years(args: argparse.Namespace, label: str) -> Iterable[int]:
+    """Years requested on the command line, announcing the run mode."""
+    if args.year:
+        print(f"Processing {label} for year {args.year}")
+        years = [args.year]
+    else:
+        print(f"Processing {label} for all years")
+        years = range(START_YEAR, END_YEAR)
+
+    print(f"Reload mode: {'ON' if args.reload else 'OFF'}")
+    return years
+
+
+def main() -> None:
+    """Main entry point for single-pass country and forex extraction."""
+    parser = argparse.ArgumentParser(
+        description="Process Consensus Economics country and forex data in one pass"
+    )
+    add_common_arguments(parser)
+    parser.add_argument(
+        "--kind",
+        choices=list(KINDS),
+        help="Extract only one kind (default: both)",
+    )
+    args = parser.parse_args()
+
+    kinds = [args.kind] if args.kind else list(KINDS)
+    years = selected_years(args, " and ".join(kinds) + " data")
+
+    countries = list(COUNTRIES)
+    if "forecasters" in kinds:
+        print(f"Processing {len(countries)} countries")
+
+    workers = selected_workers(args)
+    with metrics.collecting(args.metrics, "extract-forecasts"), profiling.profiling(args):
+        run(years, kinds, countries, args.reload, workers, selected_formats(args))
+
+
+if __name__ == "__main__":
+    main()
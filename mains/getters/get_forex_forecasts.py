@@ -1,64 +1,63 @@
-"""Extract forex forecast data from Consensus Economics Excel files."""
+"""Extract forex forecast data from Consensus Economics Excel files.
+
+Thin view over extract_forecasts restricted to the forex output.
+"""
 
 import argparse
-import os
+from typing import Iterable, List
 
 import pandas as pd
 from tqdm import tqdm
 
-from consensus_economics.config import END_YEAR, START_YEAR
-from consensus_economics.paths import Paths
+from consensus_economics import metrics, profiling
+from consensus_economics.config import COUNTRIES
+from consensus_economics.manifest import ExtractionManifest
 from consensus_economics.utils.date_format import DateFormatUtils
-from consensus_economics.worksheets.forex_worksheet import ForexWorksheet
+from mains.getters import extract_forecasts
 
 
-def process_forex(date: str, reload: bool = False) -> pd.DataFrame:
+def process_forex(
+    date: str, reload: bool = False, formats: Iterable[str] = ("csv",)
+) -> pd.DataFrame:
     """Process forex data for a given date."""
-    try:
-        folder = Paths().output / date[:4] / "forex"
-        filename = folder / f"{date}.csv"
-
-        if filename.exists() and not reload:
-            tqdm.write(f"File {filename} already exists, skipping...")
-            return pd.DataFrame()
-
-        forex_data = ForexWorksheet(date)
-        result = forex_data.forecasters_data
-
-        if not result.empty:
-            os.makedirs(folder, exist_ok=True)
-            result.drop_duplicates().to_csv(filename, index=False)
-            tqdm.write(f"Saved forex data for {date}")
-
-        return result
-    except Exception as e:
-        tqdm.write(f"Error processing forex data for {date}: {str(e)}")
+    manifest = ExtractionManifest.load()
+    if not reload and extract_forecasts.is_up_to_date(
+        date, "forex", manifest, formats=formats
+    ):
+        tqdm.write(f"forex output for {date} is up to date, skipping...")
         return pd.DataFrame()
+    result = extract_forecasts.extract_forex(date, manifest, formats)
+    manifest.save()
+    return result
 
 
-def process_year(year: int, reload: bool = False) -> None:
-    """Process all months for a given year."""
-    paths = Paths()
-    available_dates = []
-
-    for month in range(1, 13):
-        date = DateFormatUtils.get_date(year, month)
-        if (paths.xlsx / f"{date}.xlsx").exists():
-            available_dates.append(date)
-
-    if not available_dates:
+def available_dates(year: int) -> List[str]:
+    """Months of a year that have a workbook, announcing how many were found."""
+    dates = [DateFormatUtils.get_date(year, month) for month in range(1, 13)]
+    dates = [date for date in dates if extract_forecasts.xlsx_file(date).exists()]
+    if not dates:
         print(f"No xlsx files found for year {year}")
-        return
+    else:
+        print(f"Processing forex data for year {year} ({len(dates)} files found)")
+    return dates
 
-    print(f"Processing forex data for year {year} ({len(available_dates)} files found)")
 
+def process_year(year: int, reload: bool = False, formats: Iterable[str] = ("csv",)) -> None:
+    """Process all months of a year that have a workbook."""
+    dates = available_dates(year)
+    manifest = ExtractionManifest.load()
     for date in tqdm(
-        available_dates,
+        dates,
         desc=f"Processing {year}",
         ncols=100,
         bar_format="{l_bar}{bar}| {n_fmt}/{total_fmt} [{elapsed}<{remaining}]",
     ):
-        process_forex(date, reload)
+        try:
+            extract_forecasts.process_date(
+                date, kinds=["forex"], reload=reload, manifest=manifest, formats=formats
+            )
+        finally:
+            manifest.save()
 
 
 def main() -> None:
@@ -66,29 +65,22 @@ def main() -> None:
     parser = argparse.ArgumentParser(
         description="Process Consensus Economics forex data"
     )
-    parser.add_argument(
-        "--year",
-        type=int,
-        help="Year to process (e.g., 2024). If not provided, processes all years",
-    )
-    parser.add_argument(
-        "--reload",
-        action="store_true",
-        help="Reload existing files",
-    )
+    extract_forecasts.add_common_arguments(parser)
     args = parser.parse_args()
 
-    if args.year:
-        print(f"Processing forex data for year {args.year}")
-        years = [args.year]
-    else:
-        print("Processing forex data for all years")
-        years = range(START_YEAR, END_YEAR)
-
-    print(f"Reload mode: {'ON' if args.reload else 'OFF'}")
-
-    for year in years:
-        process_year(year, args.reload)
+    years = extract_forecasts.selected_years(args, "forex data")
+    workers = extract_forecasts.selected_workers(args)
+    formats = extract_forecasts.selected_formats(args)
+    with metrics.collecting(args.metrics, "get-forex-forecasts"), profiling.profiling(args):
+        if workers > 1:
+            dates = [date for year in years for date in available_dates(year)]
+            if dates:
+                extract_forecasts.run_parallel(
+                    dates, ("forex",), COUNTRIES, args.reload, workers, formats
+                )
+        else:
+            for year in years:
+                process_year(year, args.reload, formats)
 
 
 if __name__ == "__main__":
@@ -13,7 +13,12 @@ import re
 
 import pandas as pd
 
-from consensus_economics.mappings import MAP_COLUMNS, MAP_PATH
+from consensus_economics.mappings import (
+    MAP_COLUMNS,
+    MAP_PATH,
+    load_variable_index,
+    load_variable_map,
+)
 from consensus_economics.paths import Paths
 
 MAP_VERSION = "0.1"
@@ -66,11 +71,9 @@ def main() -> None:
     fresh = skeleton_rows(load_inventory())
 
     if MAP_PATH.exists() and not args.force:
-        existing = pd.read_csv(MAP_PATH, dtype=str).fillna("")
-        known = set(zip(existing["country"], existing["raw_variable"]))
-        additions = fresh[
-            ~fresh.apply(lambda r: (r["country"], r["raw_variable"]) in known, axis=1)
-        ]
+        existing = load_variable_map(MAP_PATH)
+        known = load_variable_index(MAP_PATH).contains(fresh["country"], fresh["raw_variable"])
+        additions = fresh[~known]
         combined = pd.concat([existing, additions], ignore_index=True)
         print(f"kept {len(existing)} existing rows, added {len(additions)} new")
     else:
@@ -0,0 +1,80 @@
+"""Prune the on-disk cache of raw sheet grids (data/cache/sheets)."""
+
+import argparse
+import re
+
+from tqdm import tqdm
+
+from consensus_economics.config import SHEET_CACHE_MAX_BYTES
+from consensus_economics.paths import Paths
+from consensus_economics.utils.check_format import CheckFormatUtils
+from consensus_economics.utils.file_hash import FileHashUtils
+from consensus_economics.worksheets.sheet_cache import SheetCache
+
+UNITS = {"": 1, "B": 1, "KB": 1024, "MB": 1024**2, "GB": 1024**3}
+
+
+def parse_size(text: str) -> int:
+    """Parse a size such as '500MB' or '2GB' into bytes."""
+    match = re.fullmatch(r"\s*(\d+(?:\.\d+)?)\s*([KMG]?B?)\s*", text.upper())
+    if not match:
+        raise argparse.ArgumentTypeError(f"invalid size: {text!r}")
+    number, unit = match.groups()
+    if unit and not unit.endswith("B"):
+        unit += "B"
+    return int(float(number) * UNITS[unit])
+
+
+def format_size(n_bytes: int) -> str:
+    return f"{n_bytes / 1024**2:,.1f} MB"
+
+
+def live_hashes() -> set[str]:
+    """Content hashes of the workbooks currently in data/xlsx."""
+    files = [p for p in Paths().xlsx.iterdir() if CheckFormatUtils.isxlsx(p.name)]
+    return {FileHashUtils.sha256(p) for p in tqdm(files, desc="Hashing xlsx", ncols=100)}
+
+
+def main() -> None:
+    """Main entry point for sheet cache pruning."""
+    parser = argparse.ArgumentParser(
+        description="Prune the cache of raw sheet grids read from xlsx files"
+    )
+    parser.add_argument(
+        "--max-size",
+        type=parse_size,
+        default=SHEET_CACHE_MAX_BYTES,
+        help="Evict least recently used entries down to this size, e.g. 500MB "
+        f"(default: {format_size(SHEET_CACHE_MAX_BYTES)})",
+    )
+    parser.add_argument(
+        "--stale",
+        action="store_true",
+        help="Also drop entries for workbooks no longer present in data/xlsx",
+    )
+    parser.add_argument(
+        "--clear",
+        action="store_true",
+        help="Remove the whole cache",
+    )
+    args = parser.parse_args()
+
+    cache = SheetCache(Paths().cache / "sheets", max_bytes=None)
+    before = cache.size()
+    print(f"Sheet cache: {format_size(before)} in {cache.root}")
+
+    if args.clear:
+        cache.clear()
+        print("Cleared")
+        return
+
+    if args.stale:
+        removed = cache.prune_stale(live_hashes())
+        print(f"Removed {format_size(removed)} of stale entries")
+
+    removed = cache.prune(args.max_size)
+    print(f"Evicted {format_size(removed)}; now {format_size(cache.size())}")
+
+
+if __name__ == "__main__":
+    main()
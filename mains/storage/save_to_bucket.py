@@ -1,130 +1,107 @@
 import argparse
-import concurrent.futures
 import os
-from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import partial
 
-from tqdm import tqdm
-
+from consensus_economics import metrics
+from consensus_economics.aws import cleanup, sync
 from consensus_economics.aws.bucket_manager import BucketManager
 from consensus_economics.paths import Paths
 
+BUCKET = "consensus-economics"
 
-def clean_bucket(bucket):
-    # Get all contents
-    contents = bucket.contents
-
-    # Iterate through all files in the bucket
-    for item in contents:
-        key = item['Key']
-        # Check if key contains " 2"
-        # Check if key contains any " N" where N is an integer
-        for i in range(1, 10):  # Checking numbers 1-9
-            if f" {i}" in key:
-                # Create new key by removing " N"
-                new_key = key.replace(f" {i}", "")
-
-                # If the target file already exists, remove it
-                if any(x['Key'] == new_key for x in contents):
-                    bucket.remove_file(new_key)
-
-                # Rename the file by removing and reuploading with new key
-                content = bucket.get_content(key)
-                metadata = bucket.get_metadata(key)
-                bucket.upload_file(content.read(), new_key, metadata)
-                bucket.remove_file(key)
-                break  # Break after first match since we've renamed the file
 
-def get_s3_key(file_path, output_dir):
-    return os.path.relpath(file_path, output_dir)
+def clean_bucket(bucket, dry_run=False, workers=cleanup.WORKERS):
+    """Rename duplicated keys ("202409 2.csv") over their originals, server-side."""
+    with metrics.stage("clean_bucket") as event:
+        plan = cleanup.plan_cleanup(item['Key'] for item in bucket.contents)
+        print(f"Bucket cleanup: {plan.summary()}")
+        event.update(keys=plan.keys, renames=len(plan.renames), removed=len(plan.removed))
+        if dry_run:
+            for line in plan.report():
+                print(f"  {line}")
+            return
+        failed = cleanup.run_cleanup(bucket, plan, workers)
+        for key in failed:
+            print(f"Failed to clean up {key}")
+        event["failed"] = len(failed)
 
 def set_metadata(file_path, output_dir):
     # Get just the filename without the full path
     filename = os.path.basename(file_path)
-    return {
+    metadata = {
         'source': 'consensus_economics',
-        'year': filename[:4],
-        'month': filename[4:6],
         'date_uploaded': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
         'file_type': os.path.splitext(file_path)[1][1:]
     }
-
-def read_file(file_path):
-    with open(file_path, 'rb') as f:
-        return f.read()
-
-def upload_file(args):
-    bucket, file_path, output_dir = args
-    s3_key = get_s3_key(file_path, output_dir)
-    file_content = read_file(file_path)
-    bucket.upload_file(
-        file_content=file_content,
-        file_path=s3_key,
-        metadata=set_metadata(file_path, output_dir)
-    )
-    return s3_key
-
-def get_files_for_year(output_dir: str, year: int) -> list:
-    """Get all files for a specific year."""
-    files_to_upload = []
-    year_dir = os.path.join(output_dir, str(year))
-
-    if not os.path.exists(year_dir):
-        print(f"No data found for year {year}")
-        return files_to_upload
-
-    for root, _, files in os.walk(year_dir):
-        for file in files:
-            file_path = os.path.join(root, file)
-            files_to_upload.append(file_path)
-
-    return files_to_upload
+    # Per-month files are named YYYYMM.*; consolidated ones are not
+    if filename[:6].isdigit():
+        metadata.update(year=filename[:4], month=filename[4:6])
+    return metadata
 
 def main():
     # Set up argument parser
     parser = argparse.ArgumentParser(description='Upload Consensus Economics data to S3 bucket')
-    parser.add_argument('--year', type=int, help='Year to process (e.g., 2024)')
+    scope = parser.add_mutually_exclusive_group()
+    scope.add_argument('--year', type=int, help='Year to process (e.g., 2024)')
+    scope.add_argument('--sync', action='store_true',
+                       help='Process the whole data/output tree, Parquet files included')
+    parser.add_argument('--dry-run', action='store_true',
+                        help='Only report what would be renamed, removed and uploaded')
+    parser.add_argument('--bucket', default=BUCKET, help=f'Bucket name (default: {BUCKET})')
+    parser.add_argument('--endpoint-url',
+                        help='S3-compatible endpoint, e.g. a local MinIO or moto server')
+    parser.add_argument('--workers', type=int, default=sync.WORKERS,
+                        help='Files uploaded, and cleanup requests sent, at once '
+                        f'(default: {sync.WORKERS})')
+    parser.add_argument('--part-size', type=int, default=sync.PART_SIZE // sync.MiB,
+                        metavar='MIB',
+                        help='Multipart part size; larger files are uploaded in parts '
+                        f'(default: {sync.PART_SIZE // sync.MiB})')
+    parser.add_argument('--part-concurrency', type=int, default=sync.PART_CONCURRENCY,
+                        help='Parts of one file uploaded at once '
+                        f'(default: {sync.PART_CONCURRENCY})')
+    metrics.add_argument(parser)
     parsed_args = parser.parse_args()
 
-    if not parsed_args.year:
-        print("Please specify a year using --year parameter")
+    if not parsed_args.year and not parsed_args.sync:
+        print("Please specify a year using --year parameter, or --sync for all of data/output")
         return
 
-    # Initialize bucket
-    bucket = BucketManager("consensus-economics")
-    paths = Paths()
+    with metrics.collecting(parsed_args.metrics, "save-to-bucket"):
+        save(parsed_args)
 
-    clean_bucket(bucket)
 
-    # Get files for the specified year
-    output_dir = paths.output
-    files_to_upload = get_files_for_year(output_dir, parsed_args.year)
+def save(args: argparse.Namespace) -> None:
+    """Tidy the bucket, then upload the new and changed output files (all or one year's)."""
+    bucket = BucketManager(args.bucket, endpoint_url=args.endpoint_url)
+    output_dir = Paths().output
+    prefix = "" if args.sync else f"{args.year}/"
 
-    if not files_to_upload:
+    if prefix and not (output_dir / str(args.year)).exists():
+        print(f"No data found for year {args.year}")
         return
 
-    print(f"Found {len(files_to_upload)} files to upload for year {parsed_args.year}")
-
-    # Prepare arguments for upload
-    upload_args = [(bucket, file_path, output_dir) for file_path in files_to_upload]
-
-    # Use ThreadPoolExecutor for parallel uploads
-    with ThreadPoolExecutor(max_workers=10) as executor:
-        futures = []
-        for args in upload_args:
-            future = executor.submit(upload_file, args)
-            futures.append(future)
-
-        # Show progress with tqdm
-        for future in tqdm(
-            concurrent.futures.as_completed(futures),
-            total=len(futures),
-            desc=f"Uploading files for {parsed_args.year}"
-        ):
-            try:
-                future.result()
-            except Exception as e:
-                print(f"Error uploading file: {e}")
+    clean_bucket(bucket, args.dry_run, args.workers)
+
+    part_size = args.part_size * sync.MiB
+    plan = sync.plan_sync(bucket, output_dir, prefix, part_size)
+    print(f"{prefix or 'data/output'}: {plan.summary()}")
+
+    if args.dry_run:
+        for transfer in plan.transfers:
+            print(f"  {transfer.reason:<8} {transfer.key} ({transfer.size:,} bytes)")
+        return
+
+    failed = sync.run_sync(
+        bucket,
+        plan,
+        partial(set_metadata, output_dir=output_dir),
+        workers=args.workers,
+        config=sync.transfer_config(part_size, args.part_concurrency),
+    )
+    for key in failed:
+        print(f"Failed to upload {key}")
 
 if __name__ == "__main__":
     main()
@@ -8,7 +8,9 @@ from consensus_economics.config import (
     START_YEAR,
 )
 from consensus_economics.constructor import FileProcessor
+from consensus_economics.cube import ConsensusCube
 from consensus_economics.paths import Paths
+from consensus_economics.store import ConsensusStore
 from consensus_economics.worksheets.country_worksheet import CountryWorksheet
 from consensus_economics.worksheets.forex_worksheet import ForexWorksheet
 
@@ -18,6 +20,8 @@ __all__ = [
     "END_YEAR",
     "EXTERNAL_STORAGE",
     "START_YEAR",
+    "ConsensusCube",
+    "ConsensusStore",
     "CountryWorksheet",
     "FileProcessor",
     "ForexWorksheet",
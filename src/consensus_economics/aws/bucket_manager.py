@@ -3,11 +3,16 @@ import boto3
 
 class BucketManager:
 
-    def __init__(self, bucket_name=None) -> None:
-
+    def __init__(self, bucket_name=None, client=None, endpoint_url=None) -> None:
+        """
+        :param bucket_name: Bucket to work on; asked for interactively if None
+        :param client: S3 client to use instead of a new boto3 one
+        :param endpoint_url: S3-compatible endpoint for a new client (e.g. a
+            local MinIO or moto server)
+        """
         self.__bucket_name = bucket_name
         self.__contents = None
-        self.s3_client = boto3.client('s3')  # Add this line
+        self.s3_client = client or boto3.client('s3', endpoint_url=endpoint_url)
 
     @property
     def bucket_name(self):
@@ -47,6 +52,31 @@ class BucketManager:
             return False
         return True
 
+    def upload_path(self, path, key, metadata=None, config=None):
+        """Upload a local file, streamed from disk
+
+        Files of at least config's multipart threshold are uploaded in parts,
+        several at a time.
+
+        :param path: Local file to upload
+        :param key: S3 object key
+        :param metadata: User metadata of the object
+        :param config: boto3.s3.transfer.TransferConfig (boto3's default if None)
+        :return: True if successful, False otherwise
+        """
+        try:
+            self.s3_client.upload_file(
+                Filename=str(path),
+                Bucket=self.bucket_name,
+                Key=key,
+                ExtraArgs={'Metadata': metadata if metadata else {}},
+                Config=config,
+            )
+        except Exception as e:
+            print(f"Error uploading {key} to S3: {e}")
+            return False
+        return True
+
     def remove_file(self, file_path):
         """Remove a file from the S3 bucket
 
@@ -64,9 +94,51 @@ class BucketManager:
             return False
 
 
-    def get_contents(self):
-        s3 = boto3.client('s3')
-        paginator = s3.get_paginator('list_objects_v2')
+    def copy_file(self, source, target):
+        """Copy an object to another key of the bucket, server-side
+
+        The metadata is copied along. Objects of up to 5 GB can be copied.
+
+        :param source: Key of the object to copy
+        :param target: Key of the copy; an object there is replaced
+        :return: True if successful, False otherwise
+        """
+        try:
+            self.s3_client.copy_object(
+                Bucket=self.bucket_name,
+                Key=target,
+                CopySource={'Bucket': self.bucket_name, 'Key': source},
+            )
+        except Exception as e:
+            print(f"Error copying {source} to {target} in S3: {e}")
+            return False
+        return True
+
+    def remove_files(self, file_paths):
+        """Remove up to 1000 files with one multi-object delete request
+
+        :param file_paths: Paths of the files in the bucket to remove
+        :return: Paths that could not be removed
+        """
+        try:
+            response = self.s3_client.delete_objects(
+                Bucket=self.bucket_name,
+                Delete={'Objects': [{'Key': key} for key in file_paths], 'Quiet': True},
+            )
+        except Exception as e:
+            print(f"Error removing {len(file_paths)} files from S3: {e}")
+            return list(file_paths)
+        errors = response.get('Errors', [])
+        for error in errors:
+            print(f"Error removing {error['Key']} from S3: {error.get('Message')}")
+        return [error['Key'] for error in errors]
+
+    def get_contents(self, prefix=''):
+        """List the objects of the bucket (Key, Size, ETag, ...), paginated
+
+        :param prefix: Only list keys starting with prefix (default: all)
+        """
+        paginator = self.s3_client.get_paginator('list_objects_v2')
         contents = []
 
         def list_objects(prefix=''):
@@ -74,8 +146,7 @@ class BucketManager:
                 if 'Contents' in page:
                     contents.extend(page['Contents'])
 
-        # Start with no prefix to get everything
-        list_objects()
+        list_objects(prefix)
 
         return contents
 
@@ -0,0 +1,122 @@
+"""Cleanup of duplicated keys in the S3 bucket.
+
+Copies of a file made next to it (by Finder, or by uploading twice) carry
+" 2" (" 1" to " 9") in their name, e.g. "2024/forex/202409 2.csv". The
+cleanup renames each such key to its name without the suffix, replacing
+the object already there:
+
+- One listing of the bucket is indexed by key, so whether a target exists
+  is a set lookup rather than a scan of the listing.
+- Renames are server-side copies (CopyObject, metadata kept), several at a
+  time; no object is downloaded or uploaded again.
+- The renamed keys are then removed with multi-object deletes of up to
+  1000 keys per request, also in parallel. A key is only removed once its
+  copy succeeded.
+
+When several duplicates map to one key (a copy of a copy, "a 2 3.csv",
+maps to "a.csv" too) the last in key order wins, as it did when the renames
+ran one after another, and the others are removed.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from itertools import chain
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from consensus_economics.aws.bucket_manager import BucketManager
+
+# Keys per multi-object delete request (the S3 maximum)
+DELETE_BATCH = 1000
+WORKERS = 8
+
+
+@dataclass
+class Rename:
+    """One duplicate to move over its original."""
+
+    source: str
+    target: str
+    replaces: bool  # an object exists at target
+    superseded: Tuple[str, ...] = ()  # other duplicates of target, removed
+
+
+@dataclass
+class CleanupPlan:
+    """Renames of a cleanup and the keys it removes."""
+
+    keys: int
+    renames: List[Rename]
+
+    @property
+    def removed(self) -> List[str]:
+        return [key for rename in self.renames for key in (rename.source, *rename.superseded)]
+
+    def summary(self) -> str:
+        replaced = sum(rename.replaces for rename in self.renames)
+        return (
+            f"{len(self.renames)} duplicate(s) to rename ({replaced} over an existing key), "
+            f"{len(self.removed)} key(s) to remove, out of {self.keys:,}"
+        )
+
+    def report(self) -> List[str]:
+        """One line per rename and per superseded duplicate."""
+        lines = []
+        for rename in self.renames:
+            lines.append(
+                f"{rename.source} -> {rename.target}" + (" (replaces)" if rename.replaces else "")
+            )
+            lines += [f"{key} (removed, superseded)" for key in rename.superseded]
+        return lines
+
+
+def deduplicated_key(key: str) -> Optional[str]:
+    """Key without its " N" duplicate suffixes, or None if it has none."""
+    target = key
+    while True:
+        suffix = next((f" {i}" for i in range(1, 10) if f" {i}" in target), None)
+        if suffix is None:
+            return target if target != key else None
+        # A copy of a copy ("a 2 3.csv") goes straight to the original's key
+        target = target.replace(suffix, "")
+
+
+def plan_cleanup(keys: Iterable[str]) -> CleanupPlan:
+    """Renames that clean up the given keys of a bucket listing."""
+    index = set(keys)
+    duplicates: Dict[str, List[str]] = {}
+    for key in sorted(index):
+        target = deduplicated_key(key)
+        if target is not None:
+            duplicates.setdefault(target, []).append(key)
+    renames = [
+        Rename(sources[-1], target, target in index, tuple(sources[:-1]))
+        for target, sources in sorted(duplicates.items())
+    ]
+    return CleanupPlan(len(index), renames)
+
+
+def run_cleanup(bucket: BucketManager, plan: CleanupPlan, workers: int = WORKERS) -> List[str]:
+    """
+    Copy each duplicate over its target, then remove the duplicates.
+
+    Args:
+        bucket: Bucket the plan was made for
+        plan: Result of plan_cleanup()
+        workers: Requests in flight at once
+
+    Returns:
+        Keys that could not be renamed or removed
+    """
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        copied = list(executor.map(
+            lambda rename: bucket.copy_file(rename.source, rename.target), plan.renames
+        ))
+        failed = [rename.source for rename, ok in zip(plan.renames, copied) if not ok]
+        removed = [
+            key
+            for rename, ok in zip(plan.renames, copied) if ok
+            for key in (rename.source, *rename.superseded)
+        ]
+        batches = [removed[i:i + DELETE_BATCH] for i in range(0, len(removed), DELETE_BATCH)]
+        failed += chain.from_iterable(executor.map(bucket.remove_files, batches))
+    return sorted(failed)
@@ -0,0 +1,232 @@
+"""Delta sync of a local directory tree to an S3 bucket.
+
+Remote state comes from one paginated listing of the bucket (key, size,
+ETag). A local file is uploaded only if its key is missing from the bucket,
+its size differs, or its content does:
+
+- S3's ETag of an object uploaded in one request is the MD5 of its
+  content; that of a multipart upload is the MD5 of the parts' MD5s
+  followed by "-<parts>". The local file's ETag is computed the same way,
+  for the part size uploads use, and compared to the listing.
+- Where that does not match while the sizes do (an object uploaded with
+  another part size, or encrypted with KMS), the MD5 stored in the
+  object's "md5" metadata at upload is compared instead, at the cost of one
+  HEAD request.
+
+Files are streamed from disk. Those of at least the part size go up as
+multipart uploads, several parts at a time, and several files are uploaded
+at once. Objects missing locally are left in the bucket, and hidden local
+files are not synced.
+
+A BucketManager on a local S3 stand-in (MinIO, moto) is synced the same
+way; pass its endpoint URL or client.
+"""
+
+import hashlib
+import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from boto3.s3.transfer import TransferConfig
+from tqdm import tqdm
+
+from consensus_economics import metrics
+from consensus_economics.aws.bucket_manager import BucketManager
+
+MiB = 1 << 20
+
+# Multipart part size, and the size from which files are uploaded in parts
+PART_SIZE = 16 * MiB
+# Files uploaded at once, and parts of one file uploaded at once
+WORKERS = 8
+PART_CONCURRENCY = 4
+
+# User metadata key of the MD5 of the whole file
+CHECKSUM_METADATA = "md5"
+
+
+@dataclass
+class Transfer:
+    """One file to upload."""
+
+    key: str
+    path: Path
+    size: int
+    reason: str  # "new" or "changed"
+    md5: Optional[str] = None  # hex MD5 of the content, if already computed
+
+
+@dataclass
+class SyncPlan:
+    """What a sync uploads and what it leaves alone."""
+
+    transfers: List[Transfer] = field(default_factory=list)
+    unchanged: List[str] = field(default_factory=list)
+    head_requests: int = 0
+
+    @property
+    def bytes(self) -> int:
+        return sum(transfer.size for transfer in self.transfers)
+
+    def summary(self) -> str:
+        new = sum(transfer.reason == "new" for transfer in self.transfers)
+        return (
+            f"{new} new, {len(self.transfers) - new} changed, {len(self.unchanged)} unchanged "
+            f"({self.bytes / MiB:,.1f} MiB to upload)"
+        )
+
+
+def transfer_config(
+    part_size: int = PART_SIZE, part_concurrency: int = PART_CONCURRENCY
+) -> TransferConfig:
+    """Transfer settings whose multipart ETags checksums() reproduces."""
+    return TransferConfig(
+        multipart_threshold=part_size,
+        multipart_chunksize=part_size,
+        max_concurrency=part_concurrency,
+    )
+
+
+def local_files(root: Path, prefix: str = "") -> Dict[str, Path]:
+    """
+    Files under root by S3 key (their path relative to root), limited to prefix.
+
+    Hidden files and directories (local state such as .consolidate/) are skipped.
+    """
+    root = Path(root)
+    files = {}
+    for directory, subdirectories, names in os.walk(root):
+        subdirectories[:] = [name for name in subdirectories if not name.startswith(".")]
+        for name in names:
+            if name.startswith("."):
+                continue
+            path = Path(directory) / name
+            key = path.relative_to(root).as_posix()
+            if key.startswith(prefix):
+                files[key] = path
+    return dict(sorted(files.items()))
+
+
+def checksums(path: Path, part_size: int = PART_SIZE) -> Tuple[str, str]:
+    """
+    MD5 of a file and the ETag S3 gives it when uploaded with part_size.
+
+    Args:
+        path: Local file
+        part_size: Multipart threshold and part size of the upload
+
+    Returns:
+        (hex MD5, ETag without quotes)
+    """
+    whole = hashlib.md5()
+    parts = []
+    size = 0
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(part_size), b""):
+            whole.update(chunk)
+            parts.append(hashlib.md5(chunk).digest())
+            size += len(chunk)
+    if size < part_size:
+        return whole.hexdigest(), whole.hexdigest()
+    etag = hashlib.md5(b"".join(parts)).hexdigest()
+    return whole.hexdigest(), f"{etag}-{len(parts)}"
+
+
+def plan_sync(
+    bucket: BucketManager, root: Path, prefix: str = "", part_size: int = PART_SIZE
+) -> SyncPlan:
+    """
+    Compare the files under root with the bucket's objects under prefix.
+
+    Args:
+        bucket: Bucket to sync to
+        root: Local directory; keys are paths relative to it
+        prefix: Only sync keys starting with prefix (e.g. "2024/")
+        part_size: Part size uploads will use (see transfer_config)
+    """
+    plan = SyncPlan()
+    with metrics.stage("sync_plan", key=prefix) as event:
+        remote = {item["Key"]: item for item in bucket.get_contents(prefix)}
+        hashed = 0
+        for key, path in local_files(root, prefix).items():
+            size = path.stat().st_size
+            item = remote.get(key)
+            if item is None:
+                plan.transfers.append(Transfer(key, path, size, "new"))
+                continue
+            if item["Size"] != size:
+                plan.transfers.append(Transfer(key, path, size, "changed"))
+                continue
+            md5, etag = checksums(path, part_size)
+            hashed += size
+            if item["ETag"].strip('"') != etag:
+                plan.head_requests += 1
+                metadata = bucket.get_metadata(key) or {}
+                if metadata.get(CHECKSUM_METADATA) != md5:
+                    plan.transfers.append(Transfer(key, path, size, "changed", md5))
+                    continue
+            plan.unchanged.append(key)
+        event.update(
+            remote=len(remote),
+            uploads=len(plan.transfers),
+            unchanged=len(plan.unchanged),
+            hashed_bytes=hashed,
+            head_requests=plan.head_requests,
+        )
+    return plan
+
+
+def upload(
+    bucket: BucketManager,
+    transfer: Transfer,
+    config: TransferConfig,
+    metadata: Callable[[Path], Dict[str, str]],
+) -> bool:
+    """Upload one file of a plan with its metadata and MD5; returns whether it succeeded."""
+    with metrics.stage("upload", key=transfer.key) as event:
+        md5 = transfer.md5 or checksums(transfer.path)[0]
+        uploaded = bucket.upload_path(
+            transfer.path,
+            transfer.key,
+            metadata={**metadata(transfer.path), CHECKSUM_METADATA: md5},
+            config=config,
+        )
+        event["bytes"] = transfer.size
+        event["reason"] = transfer.reason
+        event["failed"] = int(not uploaded)
+    return uploaded
+
+
+def run_sync(
+    bucket: BucketManager,
+    plan: SyncPlan,
+    metadata: Callable[[Path], Dict[str, str]],
+    workers: int = WORKERS,
+    config: Optional[TransferConfig] = None,
+) -> List[str]:
+    """
+    Upload the files of a plan, several at a time.
+
+    Args:
+        bucket: Bucket to upload to
+        plan: Result of plan_sync()
+        metadata: User metadata of an uploaded file, by its path
+        workers: Files uploaded at once
+        config: Transfer settings; must use the part size the plan was made with
+
+    Returns:
+        Keys whose upload failed
+    """
+    config = config or transfer_config()
+    failed = []
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            executor.submit(upload, bucket, transfer, config, metadata): transfer.key
+            for transfer in plan.transfers
+        }
+        for future in tqdm(as_completed(futures), total=len(futures), desc="Uploading"):
+            if not future.result():
+                failed.append(futures[future])
+    return sorted(failed)
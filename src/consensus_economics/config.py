@@ -86,3 +86,12 @@ SUMMARY_STATS: frozenset = frozenset({
     "Standard Deviation",
     "Number of Forecasts",
 })
+
+# On-disk cache of raw sheet grids (data/cache/sheets), keyed by xlsx content hash
+SHEET_CACHE_ENABLED: bool = True
+SHEET_CACHE_MAX_BYTES: int = 2 * 1024**3
+
+# In-memory LRU cache of loaded workbooks shared by the sheet parsers; the
+# byte budget applies to an estimate derived from the xlsx file sizes
+WORKBOOK_CACHE_MAX_ENTRIES: int = 8
+WORKBOOK_CACHE_MAX_BYTES: int = 512 * 1024**2
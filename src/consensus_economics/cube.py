@@ -0,0 +1,259 @@
+"""Dense consensus cube materialized from the concepts layer.
+
+Research code mostly wants the consensus statistics as dense arrays rather
+than the long panel: survey month x country x concept x target-year offset
+(0 = current year, 1 = next year). The cube is built from
+forecasters_concepts.parquet and stored as one NumPy file per statistic, so
+it can be memory-mapped by any number of processes at once:
+
+    data/output/cube/
+    ├── labels.json     # axis labels of every plane
+    ├── mean.npy        # float64, NaN where there is no observation
+    ├── std_dev.npy
+    ├── high.npy
+    ├── low.npy
+    └── count.npy
+
+The month axis runs over every month from the first to the last survey,
+including months without an issue. Rows with no concept_id or a target year
+outside the offsets are left out.
+"""
+
+import json
+import warnings
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+
+from consensus_economics.paths import Paths
+from consensus_economics.utils.atomic_write import AtomicWriteUtils
+
+STATISTICS = ("mean", "std_dev", "high", "low", "count")
+OFFSETS = (0, 1)
+AXES = ("month", "country", "concept", "offset")
+
+LABELS_FILE = "labels.json"
+FORMAT_VERSION = 1
+
+
+def cube_dir() -> Path:
+    """Default location of the cube."""
+    return Paths().output / "cube"
+
+
+def _codes(column: pd.Series) -> Tuple[np.ndarray, List[str]]:
+    """Integer codes of a column against its distinct values in sorted order."""
+    codes, uniques = pd.factorize(column)
+    labels = np.asarray(uniques, dtype=object).astype(str)
+    order = np.argsort(labels, kind="stable")
+    rank = np.empty(len(order), dtype=np.int64)
+    rank[order] = np.arange(len(order))
+    return rank[codes], labels[order].tolist()
+
+
+def build_cube(
+    panel: pd.DataFrame,
+    statistics: Sequence[str] = STATISTICS,
+    offsets: Sequence[int] = OFFSETS,
+) -> Tuple[Dict[str, np.ndarray], Dict[str, List]]:
+    """
+    Pivot Consensus rows of the concepts layer into dense planes.
+
+    Args:
+        panel: Rows with country, concept_id, source, statistic, year, value
+            and survey_date columns
+        statistics: Consensus statistics to materialize, one plane each
+        offsets: Target year minus survey year to keep
+
+    Returns:
+        Planes keyed by statistic and the labels of their axes
+    """
+    years = panel["survey_date"].dt.year.to_numpy()
+    keep = (
+        (panel["source"] == "Consensus").to_numpy()
+        & panel["statistic"].isin(statistics).to_numpy()
+        & panel["concept_id"].notna().to_numpy()
+        & np.isin(panel["year"].to_numpy() - years, offsets)
+    )
+    rows = panel.loc[keep]
+    dates = rows["survey_date"]
+    month = (dates.dt.year * 12 + dates.dt.month - 1).to_numpy()
+    first_month = month.min() if len(rows) else 0
+    months = pd.period_range(dates.min(), dates.max(), freq="M") if len(rows) else []
+    country, countries = _codes(rows["country"])
+    concept, concepts = _codes(rows["concept_id"])
+    statistic, names = _codes(rows["statistic"])
+    labels = {
+        "month": [str(period) for period in months],
+        "country": countries,
+        "concept": concepts,
+        "offset": list(offsets),
+    }
+    shape = tuple(len(labels[axis]) for axis in AXES)
+
+    offset = pd.Index(offsets).get_indexer(rows["year"].to_numpy() - years[keep])
+    codes = (month - first_month, country, concept, offset)
+    cells = np.ravel_multi_index(codes, shape) if len(rows) else np.empty(0, dtype=np.int64)
+    values = rows["value"].to_numpy(dtype=np.float64)
+
+    planes = {}
+    duplicates = 0
+    for name in statistics:
+        selected = statistic == (names.index(name) if name in names else -1)
+        # The first row of a cell wins, e.g. when two raw labels of one
+        # country resolve to the same concept in the same month
+        cell, firsts = np.unique(cells[selected], return_index=True)
+        duplicates += int(selected.sum()) - len(cell)
+        plane = np.full(shape, np.nan)
+        plane.reshape(-1)[cell] = values[selected][firsts]
+        planes[name] = plane
+    if duplicates:
+        warnings.warn(f"{duplicates:,} rows share a cell with an earlier row and were dropped")
+    return planes, labels
+
+
+def write_cube(
+    directory: Path, planes: Dict[str, np.ndarray], labels: Dict[str, List]
+) -> None:
+    """
+    Atomically write the planes and their labels, removing planes no longer built.
+
+    labels.json is written last and records the statistics present, so a
+    reader never picks up a plane the labels do not describe.
+    """
+    directory = Path(directory)
+    for name, plane in planes.items():
+        with AtomicWriteUtils.replacing(directory / f"{name}.npy") as tmp:
+            with open(tmp, "wb") as f:
+                np.save(f, plane)
+    document = {"format": FORMAT_VERSION, "statistics": list(planes), **labels}
+    AtomicWriteUtils.write_bytes(directory / LABELS_FILE, json.dumps(document).encode())
+    for path in directory.glob("*.npy"):
+        if path.stem not in planes:
+            path.unlink()
+
+
+def materialize(
+    source: Optional[Path] = None,
+    directory: Optional[Path] = None,
+    statistics: Sequence[str] = STATISTICS,
+) -> Path:
+    """
+    Build the cube from the concepts layer on disk.
+
+    Args:
+        source: Concepts layer (default: data/output/forecasters_concepts.parquet)
+        directory: Cube directory (default: data/output/cube)
+        statistics: Consensus statistics to materialize
+
+    Returns:
+        The cube directory
+
+    Raises:
+        FileNotFoundError: If the concepts layer has not been built
+    """
+    source = source or Paths().output / "forecasters_concepts.parquet"
+    directory = directory or cube_dir()
+    if not Path(source).exists():
+        raise FileNotFoundError(f"{source} not found — run consolidate-output --concepts first")
+    columns = ["country", "concept_id", "source", "statistic", "year", "value", "survey_date"]
+    table = pq.read_table(source, columns=columns, filters=[("source", "==", "Consensus")])
+    planes, labels = build_cube(table.to_pandas(), statistics)
+    write_cube(directory, planes, labels)
+    return directory
+
+
+class ConsensusCube:
+    """
+    Memory-mapped consensus cube with labelled, zero-copy access.
+
+    Args:
+        directory: Cube directory (default: data/output/cube)
+
+    Raises:
+        FileNotFoundError: If the cube has not been built
+        ValueError: If a plane does not match the labels (rebuild the cube)
+    """
+
+    def __init__(self, directory: Optional[Path] = None) -> None:
+        self.directory = Path(directory) if directory is not None else cube_dir()
+        labels_path = self.directory / LABELS_FILE
+        if not labels_path.exists():
+            raise FileNotFoundError(f"{labels_path} not found — build the cube first")
+        labels = json.loads(labels_path.read_text())
+        if labels.get("format") != FORMAT_VERSION:
+            raise ValueError(f"{labels_path} has an unsupported format; rebuild the cube")
+
+        self.statistics: List[str] = labels["statistics"]
+        self.months = pd.PeriodIndex(labels["month"], freq="M")
+        self.countries = pd.Index(labels["country"])
+        self.concepts = pd.Index(labels["concept"])
+        self.offsets = pd.Index(labels["offset"])
+        self.shape = (len(self.months), len(self.countries), len(self.concepts),
+                      len(self.offsets))
+        self._planes: Dict[str, np.ndarray] = {}
+
+    def plane(self, statistic: str = "mean") -> np.ndarray:
+        """Read-only memory map of one statistic (month, country, concept, offset)."""
+        if statistic not in self.statistics:
+            raise KeyError(f"Statistic {statistic!r} not in cube: {self.statistics}")
+        if statistic not in self._planes:
+            plane = np.load(self.directory / f"{statistic}.npy", mmap_mode="r")
+            if plane.shape != self.shape:
+                raise ValueError(
+                    f"{statistic}.npy has shape {plane.shape}, labels say {self.shape}; "
+                    "rebuild the cube"
+                )
+            self._planes[statistic] = plane
+        return self._planes[statistic]
+
+    def _position(self, axis: pd.Index, label, name: str):
+        """Index of a label on an axis, or a full slice for None."""
+        if label is None:
+            return slice(None)
+        position = axis.get_indexer([label])[0]
+        if position < 0:
+            raise KeyError(f"{name} {label!r} not in cube")
+        return int(position)
+
+    def sel(
+        self,
+        statistic: str = "mean",
+        country: Optional[str] = None,
+        concept: Optional[str] = None,
+        offset: Optional[int] = None,
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+    ) -> np.ndarray:
+        """
+        View of the cube for single labels; omitted axes are kept whole.
+
+        Args:
+            statistic: Plane to read
+            country: Country label
+            concept: Concept id
+            offset: Target-year offset (0 current year, 1 next year)
+            start: First survey month, e.g. "2020-01" (inclusive)
+            end: Last survey month (inclusive)
+
+        Returns:
+            A read-only view into the memory map; no data is copied
+        """
+        months = slice(
+            self.months.searchsorted(pd.Period(start, freq="M")) if start else None,
+            self.months.searchsorted(pd.Period(end, freq="M"), side="right") if end else None,
+        )
+        return self.plane(statistic)[
+            months,
+            self._position(self.countries, country, "Country"),
+            self._position(self.concepts, concept, "Concept"),
+            self._position(self.offsets, offset, "Offset"),
+        ]
+
+    def frame(self, country: str, concept: str, statistic: str = "mean") -> pd.DataFrame:
+        """One country and concept as a month x offset frame over the memory map."""
+        values = self.sel(statistic, country=country, concept=concept)
+        return pd.DataFrame(values, index=self.months, columns=self.offsets, copy=False)
@@ -0,0 +1,105 @@
+"""Hive-partitioned Parquet dataset of the per-month outputs.
+
+Each survey month of each kind is one Parquet file, written with the fixed
+schema from consensus_economics.schema:
+
+    data/output/dataset/kind=<kind>/survey_year=<YYYY>/survey_date=<YYYY-MM-01>/part-0.parquet
+
+survey_year and survey_date are partition keys (not stored in the files) and
+come back as columns when the dataset is read. The first level is named
+survey_year rather than year because forecasters rows already carry a year
+column holding the target year.
+"""
+
+from pathlib import Path
+from typing import List, Optional
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from consensus_economics.paths import Paths
+from consensus_economics.schema import DATE, month_schema
+from consensus_economics.utils.atomic_write import AtomicWriteUtils
+
+PARTITION_SCHEMA = pa.schema([("survey_year", pa.int32()), ("survey_date", DATE)])
+PARTITIONING = ds.partitioning(PARTITION_SCHEMA, flavor="hive")
+
+
+def kind_root(kind: str) -> Path:
+    """Root of one kind's partitions."""
+    return Paths().dataset / f"kind={kind}"
+
+
+def month_file(kind: str, date: str) -> Path:
+    """Parquet file holding one survey month (date as yyyymm) of a kind."""
+    return (
+        kind_root(kind)
+        / f"survey_year={date[:4]}"
+        / f"survey_date={date[:4]}-{date[4:]}-01"
+        / "part-0.parquet"
+    )
+
+
+def to_table(df: pd.DataFrame, kind: str) -> pa.Table:
+    """
+    Convert one month's extracted rows to the kind's Arrow schema.
+
+    Args:
+        df: Rows as produced by the worksheet parsers, with release_date
+            as a YYYYMMDD string (empty when unparseable)
+        kind: Output kind
+
+    Returns:
+        Table with exactly the schema's columns and types
+    """
+    schema = month_schema(kind)
+    df = df.assign(
+        release_date=pd.to_datetime(df["release_date"], format="%Y%m%d", errors="coerce")
+    )
+    table = pa.Table.from_pandas(df[schema.names], schema=schema, preserve_index=False)
+    return table.replace_schema_metadata(None)
+
+
+def write_month(df: pd.DataFrame, kind: str, date: str) -> Path:
+    """Atomically write (or replace) one month of a kind."""
+    path = month_file(kind, date)
+    with AtomicWriteUtils.replacing(path) as tmp:
+        pq.write_table(to_table(df, kind), tmp, compression="zstd")
+    return path
+
+
+def remove_month(kind: str, date: str) -> None:
+    """Delete one month of a kind, if present."""
+    path = month_file(kind, date)
+    path.unlink(missing_ok=True)
+    for directory in (path.parent, path.parent.parent):
+        try:
+            directory.rmdir()
+        except OSError:
+            break
+
+
+def month_files(kind: str) -> List[Path]:
+    """Every month file of a kind, in survey date order."""
+    return sorted(kind_root(kind).glob("survey_year=*/survey_date=*/*.parquet"))
+
+
+def open_dataset(kind: str, files: Optional[List[Path]] = None) -> ds.Dataset:
+    """
+    Arrow dataset over one kind, with survey_year and survey_date columns.
+
+    Raises:
+        FileNotFoundError: If no month of the kind has been written
+    """
+    files = month_files(kind) if files is None else files
+    if not files:
+        raise FileNotFoundError(f"No {kind} partitions found under {kind_root(kind)}")
+    return ds.dataset(
+        [str(path) for path in files],
+        schema=pa.unify_schemas([month_schema(kind), PARTITION_SCHEMA]),
+        format="parquet",
+        partitioning=PARTITIONING,
+        partition_base_dir=str(kind_root(kind)),
+    )
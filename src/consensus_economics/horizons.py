@@ -0,0 +1,134 @@
+"""Fixed-event to fixed-horizon conversion of the forecasters panel.
+
+Consensus Economics forecasts are fixed-event: each survey asks for the
+current and the next calendar year. Most uses want a fixed horizon instead,
+12 months ahead of the survey, approximated by the month-weighted average
+
+    fixed_horizon = (13 - m) / 12 * current_year + (m - 1) / 12 * next_year
+
+where m is the survey month (January puts all weight on the current year).
+The conversion applies to every (country, variable, source, statistic)
+series, Consensus statistics and individual forecasters alike; for the
+dispersion statistics (std_dev, high, low) the weighted average is the
+usual approximation.
+
+The result is written to data/output/fixed_horizon.parquet. Each survey
+month depends only on its own rows, so after an incremental consolidation
+only the replaced months are recomputed.
+"""
+
+from pathlib import Path
+from typing import Iterable, Optional
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+from consensus_economics.paths import Paths
+from consensus_economics.schema import DATE
+from consensus_economics.utils.atomic_write import AtomicWriteUtils
+
+SERIES_COLUMNS = ["country", "variable", "source", "statistic"]
+INPUT_COLUMNS = SERIES_COLUMNS + ["year", "value", "unit", "survey_date"]
+
+
+def fixed_horizon_path() -> Path:
+    """Default location of the fixed-horizon panel."""
+    return Paths().output / "fixed_horizon.parquet"
+
+
+def _first_per_group(group: np.ndarray, selected: np.ndarray, size: int) -> np.ndarray:
+    """Row of the first selected row of each group, -1 where a group has none."""
+    rows = np.flatnonzero(selected)
+    groups, first = np.unique(group[rows], return_index=True)
+    located = np.full(size, -1, dtype=np.int64)
+    located[groups] = rows[first]
+    return located
+
+
+def fixed_horizon(panel: pd.DataFrame) -> pd.DataFrame:
+    """
+    Convert current- and next-year forecasts into 12-month-ahead forecasts.
+
+    Args:
+        panel: Forecaster rows with INPUT_COLUMNS
+
+    Returns:
+        One row per series and survey month having both a current- and a
+        next-year value, with both inputs, the current-year weight and the
+        fixed-horizon value. Where a series repeats a target year within a
+        month, its first row is used.
+    """
+    group = panel.groupby(
+        SERIES_COLUMNS + ["survey_date"], observed=True, sort=False, dropna=False
+    ).ngroup().to_numpy()
+    size = int(group.max()) + 1 if len(group) else 0
+    offset = panel["year"].to_numpy() - panel["survey_date"].dt.year.to_numpy()
+
+    current = _first_per_group(group, offset == 0, size)
+    following = _first_per_group(group, offset == 1, size)
+    both = (current >= 0) & (following >= 0)
+    current, following = current[both], following[both]
+
+    values = panel["value"].to_numpy(dtype=np.float64)
+    month = panel["survey_date"].dt.month.to_numpy()[current]
+    weight = (13 - month) / 12
+
+    result = panel.iloc[current][SERIES_COLUMNS + ["survey_date", "unit"]].reset_index(drop=True)
+    result["current_year"] = values[current]
+    result["next_year"] = values[following]
+    result["weight"] = weight
+    result["value"] = (weight * values[current] + (1 - weight) * values[following]).round(6)
+    return result
+
+
+def _read_panel(panel: Path, months: Optional[Iterable[str]]) -> pd.DataFrame:
+    """Panel rows needed for the conversion, optionally of some survey months only."""
+    filters = None
+    if months is not None:
+        dates = pa.array([pd.Timestamp(f"{month}01") for month in sorted(months)], DATE)
+        filters = pc.is_in(pc.field("survey_date"), value_set=dates)
+    return pq.read_table(panel, columns=INPUT_COLUMNS, filters=filters).to_pandas()
+
+
+def update_fixed_horizon(
+    months: Optional[Iterable[str]] = None,
+    panel: Optional[Path] = None,
+    target: Optional[Path] = None,
+) -> int:
+    """
+    Rebuild the fixed-horizon panel, or only some survey months of it.
+
+    Args:
+        months: YYYYMM survey months to recompute (None = all); months no
+            longer in the panel are dropped from the output
+        panel: Consolidated forecasters (default: data/output/forecasters.parquet)
+        target: Output file (default: data/output/fixed_horizon.parquet)
+
+    Returns:
+        Rows in the fixed-horizon panel
+
+    Raises:
+        FileNotFoundError: If the forecasters panel has not been consolidated
+    """
+    panel = panel or Paths().output / "forecasters.parquet"
+    target = target or fixed_horizon_path()
+    if not Path(panel).exists():
+        raise FileNotFoundError(f"{panel} not found — consolidate forecasters first")
+    if months is not None:
+        months = set(months) if Path(target).exists() else None
+
+    parts = [fixed_horizon(_read_panel(panel, months))]
+    if months is not None:
+        kept = pd.read_parquet(target)
+        parts.insert(0, kept[~kept["survey_date"].dt.strftime("%Y%m").isin(months)])
+    result = pd.concat(parts, ignore_index=True)
+    for col in SERIES_COLUMNS + ["unit"]:
+        result[col] = result[col].astype("category")
+    result = result.sort_values(SERIES_COLUMNS + ["survey_date"], kind="stable")
+
+    with AtomicWriteUtils.replacing(target) as tmp:
+        result.to_parquet(tmp, index=False)
+    return len(result)
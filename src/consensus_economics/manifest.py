@@ -0,0 +1,164 @@
+"""Extraction manifest: what each per-month output was built from.
+
+For every survey month and output kind (forecasters, forex) the manifest
+records the content hash of the source workbook, the parser version, the
+output formats written (csv, parquet) and the number of rows written. An
+extraction run compares those against the current inputs and re-extracts
+only the months whose workbook or parser changed, or whose requested
+formats were not written from them: a csv file left behind by an older
+run does not count as current.
+
+Unchanged workbooks are recognized from their size and mtime without being
+read; a workbook whose mtime moved but whose content hash did not (e.g.
+copied again) is still treated as unchanged.
+
+Layout:
+    data/output/manifest.json
+"""
+
+import json
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Optional, Sequence
+
+from consensus_economics.paths import Paths
+from consensus_economics.utils.atomic_write import AtomicWriteUtils
+from consensus_economics.utils.file_hash import FileHashUtils
+
+MANIFEST_FORMAT = 1
+
+
+class ExtractionManifest:
+    """
+    Per-month record of extraction inputs and outputs.
+
+    Args:
+        path: Manifest file; defaults to data/output/manifest.json
+    """
+
+    def __init__(self, path: Optional[Path] = None) -> None:
+        self._path = Path(path) if path is not None else Paths().output / "manifest.json"
+        self._months: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        self._dirty = False
+
+    @classmethod
+    def load(cls, path: Optional[Path] = None) -> "ExtractionManifest":
+        """Read the manifest, starting empty if it does not exist yet."""
+        manifest = cls(path)
+        try:
+            data = json.loads(manifest.path.read_text())
+        except FileNotFoundError:
+            return manifest
+        if data.get("format") == MANIFEST_FORMAT:
+            manifest._months = data.get("months", {})
+        return manifest
+
+    @property
+    def path(self) -> Path:
+        """Location of the manifest file."""
+        return self._path
+
+    def entry(self, date: str, kind: str) -> Optional[Dict[str, Any]]:
+        """Recorded extraction of one kind for one month, if any."""
+        return self._months.get(date, {}).get(kind)
+
+    def month(self, date: str) -> Dict[str, Dict[str, Any]]:
+        """All recorded kinds for one month."""
+        return dict(self._months.get(date, {}))
+
+    def update_month(self, date: str, entries: Dict[str, Dict[str, Any]]) -> None:
+        """Merge entries produced elsewhere (e.g. by a worker process)."""
+        if entries:
+            self._months.setdefault(date, {}).update(entries)
+            self._dirty = True
+
+    def is_current(
+        self,
+        date: str,
+        kind: str,
+        xlsx_path: Path,
+        parser_version: str,
+        outputs: Sequence[Path],
+        options: str = "",
+        formats: Sequence[str] = ("csv",),
+    ) -> bool:
+        """
+        Whether the recorded output for a month is still valid.
+
+        Args:
+            date: Survey month (yyyymm)
+            kind: Output kind
+            xlsx_path: Source workbook
+            parser_version: Version of the parser that would run now
+            outputs: Output files the month is expected in
+            options: Fingerprint of other settings that shape the output
+            formats: Output formats the outputs are in
+
+        Returns:
+            True if the workbook content, parser version and options are
+            unchanged, every format was written by the recorded extraction
+            and every output (when rows were written) still exists
+        """
+        entry = self.entry(date, kind)
+        if entry is None:
+            return False
+        if entry["parser_version"] != parser_version or entry.get("options", "") != options:
+            return False
+        if not set(formats) <= set(entry.get("formats", ())):
+            return False
+        if entry["rows"] and not all(path.exists() for path in outputs):
+            return False
+
+        size, mtime_ns = FileHashUtils.signature(xlsx_path)
+        if (size, mtime_ns) == (entry["xlsx_size"], entry["xlsx_mtime_ns"]):
+            return True
+        if FileHashUtils.sha256(xlsx_path) != entry["xlsx_sha256"]:
+            return False
+        # Same content under a new mtime; remember it to skip hashing next time
+        entry["xlsx_size"], entry["xlsx_mtime_ns"] = size, mtime_ns
+        self._dirty = True
+        return True
+
+    def record(
+        self,
+        date: str,
+        kind: str,
+        xlsx_path: Path,
+        parser_version: str,
+        rows: int,
+        options: str = "",
+        formats: Sequence[str] = ("csv",),
+    ) -> None:
+        """
+        Record a completed extraction of one kind for one month.
+
+        Formats written earlier from the same workbook, parser and options
+        stay recorded alongside the ones written now.
+        """
+        size, mtime_ns = FileHashUtils.signature(xlsx_path)
+        sha256 = FileHashUtils.sha256(xlsx_path)
+        previous = self.entry(date, kind)
+        formats = set(formats)
+        if previous is not None and (
+            previous["xlsx_sha256"], previous["parser_version"], previous.get("options", "")
+        ) == (sha256, parser_version, options):
+            formats |= set(previous.get("formats", ()))
+        self._months.setdefault(date, {})[kind] = {
+            "xlsx_sha256": sha256,
+            "xlsx_size": size,
+            "xlsx_mtime_ns": mtime_ns,
+            "parser_version": parser_version,
+            "options": options,
+            "formats": sorted(formats),
+            "rows": int(rows),
+            "extracted_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        }
+        self._dirty = True
+
+    def save(self) -> None:
+        """Atomically write the manifest if anything changed."""
+        if not self._dirty:
+            return
+        data = {"format": MANIFEST_FORMAT, "months": dict(sorted(self._months.items()))}
+        AtomicWriteUtils.write_bytes(self._path, json.dumps(data, indent=1).encode())
+        self._dirty = False
@@ -6,9 +6,14 @@ ranges and review status. See SCHEMA.md.
 """
 
 from pathlib import Path
+from typing import Dict, Optional, Tuple
 
 import pandas as pd
 
+from consensus_economics.mappings.index import VariableMapIndex
+from consensus_economics.paths import Paths
+from consensus_economics.utils.file_hash import FileHashUtils
+
 MAP_PATH = Path(__file__).parent / "variable_map.csv"
 
 MAP_COLUMNS = [
@@ -27,14 +32,71 @@ MAP_COLUMNS = [
 ]
 
 
-def load_variable_map() -> pd.DataFrame:
+# (resolved path, size, mtime_ns) -> index, so repeated loads in one process
+# neither hash nor read the map again
+_index_memo: Dict[Tuple[str, int, int], VariableMapIndex] = {}
+
+
+def load_variable_map(path: Path = MAP_PATH) -> pd.DataFrame:
     """Load the variable map; raises if it has not been generated yet."""
-    if not MAP_PATH.exists():
+    if not path.exists():
         raise FileNotFoundError(
-            f"{MAP_PATH} not found — run `build-variable-map` first"
+            f"{path} not found — run `build-variable-map` first"
         )
-    df = pd.read_csv(MAP_PATH, dtype=str).fillna("")
+    df = pd.read_csv(path, dtype=str).fillna("")
     missing = set(MAP_COLUMNS) - set(df.columns)
     if missing:
         raise ValueError(f"variable_map.csv missing columns: {sorted(missing)}")
     return df
+
+
+def _index_cache_dir() -> Optional[Path]:
+    """Directory of compiled map indexes; None when there is no data directory."""
+    try:
+        return Paths().cache / "variable_map"
+    except FileNotFoundError:
+        return None
+
+
+def load_variable_index(path: Path = MAP_PATH) -> VariableMapIndex:
+    """
+    Compiled lookup index over the variable map.
+
+    The index is memoized per process and cached under data/cache, keyed by
+    the CSV's content hash; only a changed map is parsed and validated again.
+
+    Args:
+        path: Variable map CSV
+
+    Returns:
+        Index whose positions refer to rows of load_variable_map(path)
+
+    Raises:
+        FileNotFoundError: If the map has not been generated yet
+        ValueError: If the map is missing columns
+    """
+    path = Path(path)
+    if not path.exists():
+        raise FileNotFoundError(f"{path} not found — run `build-variable-map` first")
+    resolved = path.resolve()
+    key = (str(resolved), *FileHashUtils.signature(resolved))
+    if key in _index_memo:
+        return _index_memo[key]
+
+    cache_dir = _index_cache_dir()
+    cache_file = None
+    index = None
+    if cache_dir is not None:
+        cache_file = cache_dir / f"{FileHashUtils.sha256(resolved)}.arrow"
+        index = VariableMapIndex.load(cache_file)
+    if index is None:
+        index = VariableMapIndex(load_variable_map(path))
+        if cache_file is not None:
+            index.save(cache_file)
+            # Only the current map's index is worth keeping
+            for stale in cache_dir.glob("*.arrow"):
+                if stale != cache_file:
+                    stale.unlink(missing_ok=True)
+
+    _index_memo[key] = index
+    return index
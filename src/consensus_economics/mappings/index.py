@@ -0,0 +1,185 @@
+"""Compiled lookup index over the variable concept map.
+
+The map is a CSV of (country, raw_variable, validity range) entries. The
+index sorts those entries by label and valid_from and packs each label and
+day into one int64 key, so resolving a whole panel is a single searchsorted
+instead of a merge against every range of every label.
+
+The parsed and validated map is cached as an Arrow IPC (Feather) file named
+after the CSV's content hash, so editing the map invalidates it
+automatically and unchanged maps skip CSV parsing and validation:
+
+    data/cache/variable_map/<sha256>.arrow
+"""
+
+from pathlib import Path
+from typing import Iterable, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+from pyarrow import feather
+
+from consensus_economics.utils.atomic_write import AtomicWriteUtils
+
+# Bump when the stored arrays change meaning
+INDEX_FORMAT = "1"
+
+_MIN_DAY = np.iinfo(np.int64).min
+_MAX_DAY = np.iinfo(np.int64).max
+
+
+def _codes(values: Iterable, labels: pd.Index) -> np.ndarray:
+    """Position of each value in labels (-1 if absent), cheap for categoricals."""
+    values = pd.Series(values) if not isinstance(values, pd.Series) else values
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        lookup = np.append(labels.get_indexer(values.cat.categories), -1)
+        return lookup[values.cat.codes.to_numpy()]
+    return labels.get_indexer(values)
+
+
+def _days(dates) -> np.ndarray:
+    """Dates as int64 days since the epoch; NaT becomes the int64 minimum."""
+    values = pd.DatetimeIndex(dates).to_numpy().astype("datetime64[D]")
+    return values.view("int64")
+
+
+def _keys(pairs: np.ndarray, days: np.ndarray) -> np.ndarray:
+    """One sortable int64 per (label, day): label id in the high bits, day in the low."""
+    return (pairs << 32) + np.clip(days, -(2**31), 2**31 - 1) + 2**31
+
+
+class VariableMapIndex:
+    """
+    Sorted validity intervals per (country, raw_variable) label.
+
+    Positions returned by the lookups refer to rows of the map as given
+    (CSV order), so map columns can be gathered with column().
+
+    Args:
+        frame: Map rows with country, raw_variable, valid_from and valid_to
+            (datetimes or parseable strings; missing valid_from means open
+            start, missing valid_to open end)
+    """
+
+    def __init__(self, frame: pd.DataFrame) -> None:
+        frame = frame.reset_index(drop=True)
+        self.frame = frame.assign(
+            valid_from=pd.to_datetime(frame["valid_from"]),
+            valid_to=pd.to_datetime(frame["valid_to"]),
+        )
+        self.countries = pd.Index(self.frame["country"].unique())
+        self.variables = pd.Index(self.frame["raw_variable"].unique())
+
+        pairs = self._pairs(
+            self.countries.get_indexer(self.frame["country"]),
+            self.variables.get_indexer(self.frame["raw_variable"]),
+        )
+        valid_from = _days(self.frame["valid_from"])
+        valid_to = _days(self.frame["valid_to"])
+        valid_to[valid_to == _MIN_DAY] = _MAX_DAY
+
+        # Entries in (label, valid_from) order; order maps back to frame rows
+        self.order = np.lexsort((valid_from, pairs))
+        self.pairs = pairs[self.order]
+        self.valid_from = valid_from[self.order]
+        self.valid_to = valid_to[self.order]
+        self.keys = _keys(self.pairs, self.valid_from)
+
+    def __len__(self) -> int:
+        return len(self.frame)
+
+    def _pairs(self, country_codes: np.ndarray, variable_codes: np.ndarray) -> np.ndarray:
+        """Label id per row; -1 where the country or variable is unknown."""
+        known = (country_codes >= 0) & (variable_codes >= 0)
+        return np.where(known, country_codes * len(self.variables) + variable_codes, -1).astype(
+            np.int64
+        )
+
+    def label_ids(self, country: Iterable, variable: Iterable) -> np.ndarray:
+        """Label id of each (country, variable); -1 for pairs absent from the map."""
+        pairs = self._pairs(_codes(country, self.countries), _codes(variable, self.variables))
+        # A known country and a known variable need not form a mapped pair
+        hit = np.searchsorted(self.pairs, pairs)
+        present = (pairs >= 0) & (hit < len(self.pairs))
+        present[present] = self.pairs[hit[present]] == pairs[present]
+        return np.where(present, pairs, -1)
+
+    def contains(self, country: Iterable, variable: Iterable) -> np.ndarray:
+        """Whether each (country, variable) pair has at least one map entry."""
+        return self.label_ids(country, variable) >= 0
+
+    def lookup(
+        self, country: Iterable, variable: Iterable, dates: Iterable
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Resolve each observation to at most one map entry, as of its date.
+
+        The entry in force is the latest one of the label starting on or
+        before the date; dates before a label's first entry fall back to
+        that first entry.
+
+        Args:
+            country: Country of each observation
+            variable: Raw variable label of each observation
+            dates: Survey date of each observation
+
+        Returns:
+            (map row position or -1 for labels absent from the map,
+             whether the date lies within the resolved entry's validity range)
+        """
+        pairs = self.label_ids(country, variable)
+        known = pairs >= 0
+        if not len(self.pairs):
+            return np.full(len(pairs), -1), np.zeros(len(pairs), dtype=bool)
+        days = _days(dates)
+
+        # Latest entry of the label starting on or before the date, else the
+        # label's first entry (every known label has one)
+        candidate = np.searchsorted(self.keys, _keys(pairs, days), side="right") - 1
+        first = np.searchsorted(self.keys, _keys(pairs, np.full_like(days, _MIN_DAY)))
+        in_label = candidate >= 0
+        in_label[in_label] = self.pairs[candidate[in_label]] == pairs[in_label]
+        candidate = np.where(in_label, candidate, np.minimum(first, len(self.pairs) - 1))
+
+        safe = np.maximum(candidate, 0)
+        position = np.where(known, self.order[safe], -1)
+        covered = known & (days >= self.valid_from[safe]) & (days <= self.valid_to[safe])
+        return position, covered
+
+    def column(self, name: str, position: np.ndarray) -> np.ndarray:
+        """Values of a map column at the given positions; None where -1."""
+        position = np.asarray(position)
+        values = self.frame[name].to_numpy(dtype=object)[np.maximum(position, 0)]
+        values[position < 0] = None
+        return values
+
+    def overlaps(self) -> pd.DataFrame:
+        """Map rows whose validity range overlaps the previous range of the same label."""
+        same_label = np.zeros(len(self.pairs), dtype=bool)
+        same_label[1:] = self.pairs[1:] == self.pairs[:-1]
+        overlap = same_label.copy()
+        overlap[1:] &= self.valid_from[1:] <= self.valid_to[:-1]
+        return self.frame.iloc[self.order[overlap]]
+
+    # ------------------------------------------------------------------
+    # On-disk form
+    # ------------------------------------------------------------------
+
+    def save(self, path: Path) -> None:
+        """Atomically write the parsed map as an Arrow IPC file."""
+        table = pa.Table.from_pandas(self.frame, preserve_index=False)
+        table = table.replace_schema_metadata({"format": INDEX_FORMAT})
+        with AtomicWriteUtils.replacing(path) as tmp:
+            feather.write_feather(table, str(tmp), compression="lz4")
+
+    @classmethod
+    def load(cls, path: Path) -> Optional["VariableMapIndex"]:
+        """Read an index saved by save(); None if missing or of another format."""
+        try:
+            table = feather.read_table(str(path))
+        except (FileNotFoundError, pa.ArrowInvalid):
+            return None
+        if (table.schema.metadata or {}).get(b"format") != INDEX_FORMAT.encode():
+            return None
+        return cls(table.to_pandas())
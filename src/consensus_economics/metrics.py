@@ -0,0 +1,260 @@
+"""Per-stage timings and counters of a pipeline run, as JSON lines.
+
+The extraction, consolidation and upload CLIs take --metrics PATH. Each
+timed stage (workbook load, sheet to frame, parse, clean, write, ...) then
+appends one line to PATH, keyed by what it worked on and carrying its
+counters:
+
+    {"run": "20241009T101500-3f2a", "stage": "parse", "seconds": 0.0213,
+     "date": "202409", "sheet": "USA", "rows": 861, "skipped_cells": 3}
+
+A last line with stage "run" records the command and its total time, and a
+per-stage summary is printed when the run ends. Lines of several runs can
+share one file and are told apart by their run id.
+
+Code reports into whichever RunMetrics is active for the process:
+
+    with metrics.stage("write", date=date, kind=kind) as event:
+        ...
+        event["rows"] = len(df)
+
+Without --metrics nothing is active; stage() then hands out a shared no-op
+context whose counters are discarded, so instrumented code costs about a
+function call per stage.
+"""
+
+import argparse
+import json
+import sys
+import threading
+import time
+import uuid
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any, ContextManager, Dict, Iterable, Iterator, List, Optional, Union
+
+# Fields of a record that identify what a stage worked on, not counters
+KEYS = ("date", "sheet", "kind", "key")
+
+
+class _Discard(dict):
+    """Counters of a disabled stage: every assignment is dropped."""
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        pass
+
+    def update(self, *args: Any, **kwargs: Any) -> None:
+        pass
+
+
+class _NullStage:
+    """Reusable context of a disabled stage."""
+
+    _counters = _Discard()
+
+    def __enter__(self) -> Dict[str, Any]:
+        return self._counters
+
+    def __exit__(self, *exc) -> None:
+        return None
+
+
+class Disabled:
+    """Stand-in when no metrics are collected; every call is a no-op."""
+
+    enabled = False
+    _stage = _NullStage()
+
+    def stage(self, name: str, **keys: Any) -> ContextManager[Dict[str, Any]]:
+        return self._stage
+
+    def record(self, stage: str, seconds: Optional[float] = None, **fields: Any) -> None:
+        pass
+
+    def extend(self, records: Iterable[Dict[str, Any]]) -> None:
+        pass
+
+
+DISABLED = Disabled()
+
+
+class RunMetrics:
+    """
+    Records of one run, appended to a JSON-lines file as they happen.
+
+    Safe to use from several threads. Worker processes collect into their
+    own in-memory RunMetrics and hand the records back for the parent to
+    extend() its own with.
+
+    Args:
+        path: JSON-lines file to append to (None keeps the records in memory only)
+        command: Name of the CLI, stored on the closing "run" record
+    """
+
+    enabled = True
+
+    def __init__(self, path: Optional[Path] = None, command: str = "") -> None:
+        self.path = Path(path) if path is not None else None
+        self.command = command
+        self.run_id = f"{datetime.now():%Y%m%dT%H%M%S}-{uuid.uuid4().hex[:4]}"
+        self.records: List[Dict[str, Any]] = []
+        self._started = datetime.now()
+        self._start = time.perf_counter()
+        self._lock = threading.Lock()
+        self._file = None
+        if self.path is not None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = open(self.path, "a")
+
+    @contextmanager
+    def stage(self, name: str, **keys: Any) -> Iterator[Dict[str, Any]]:
+        """
+        Time a block as one record of stage name.
+
+        Counters are set on the yielded dict. If the block raises, the record
+        is kept with the exception's type under "error".
+        """
+        counters: Dict[str, Any] = {}
+        start = time.perf_counter()
+        try:
+            yield counters
+        except Exception as error:
+            counters["error"] = type(error).__name__
+            raise
+        finally:
+            self.record(name, time.perf_counter() - start, **keys, **counters)
+
+    def record(self, stage: str, seconds: Optional[float] = None, **fields: Any) -> None:
+        """Add one record; seconds may be omitted for counters without a timing."""
+        record: Dict[str, Any] = {"stage": stage}
+        if seconds is not None:
+            record["seconds"] = round(seconds, 6)
+        record.update(fields)
+        self.extend([record])
+
+    def extend(self, records: Iterable[Dict[str, Any]]) -> None:
+        """Add records collected elsewhere, e.g. by a worker process."""
+        with self._lock:
+            for record in records:
+                self.records.append(record)
+                if self._file is not None:
+                    self._file.write(json.dumps({"run": self.run_id, **record}) + "\n")
+
+    def close(self) -> None:
+        """Add the closing "run" record and close the file."""
+        self.record(
+            "run",
+            time.perf_counter() - self._start,
+            command=self.command,
+            argv=sys.argv[1:],
+            started=self._started.isoformat(timespec="seconds"),
+        )
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def summary(self) -> str:
+        """Per-stage totals: count, time, slowest record and summed counters."""
+        stages: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        for record in self.records:
+            if record["stage"] != "run":
+                stages[record["stage"]].append(record)
+        total = time.perf_counter() - self._start
+        lines = [f"Run {self.run_id}: {total:.1f} s"]
+        for name, records in stages.items():
+            timed = [record for record in records if "seconds" in record]
+            line = f"  {name:<16} {len(records):>6,}x"
+            if timed:
+                slowest = max(timed, key=lambda record: record["seconds"])
+                where = " ".join(str(slowest[key]) for key in KEYS if key in slowest)
+                line += (
+                    f" {sum(record['seconds'] for record in timed):9.2f} s"
+                    f"   max {slowest['seconds'] * 1000:8.1f} ms"
+                    + (f" ({where})" if where else "")
+                )
+            counters: Dict[str, float] = defaultdict(int)
+            for record in records:
+                for field, value in record.items():
+                    if field not in KEYS and field not in ("stage", "seconds") and (
+                        isinstance(value, (int, float)) and not isinstance(value, bool)
+                    ):
+                        counters[field] += value
+            errors = sum("error" in record for record in records)
+            if errors:
+                counters["errors"] = errors
+            if counters:
+                line += "   " + ", ".join(f"{k} {v:,}" for k, v in counters.items())
+            lines.append(line)
+        return "\n".join(lines)
+
+
+Metrics = Union[RunMetrics, Disabled]
+
+_active: Metrics = DISABLED
+
+
+def active() -> Metrics:
+    """The metrics this process reports into."""
+    return _active
+
+
+def enabled() -> bool:
+    """Whether metrics are being collected."""
+    return _active.enabled
+
+
+@contextmanager
+def activated(metrics: Metrics) -> Iterator[Metrics]:
+    """Report into metrics for the duration of the block."""
+    global _active
+    previous, _active = _active, metrics
+    try:
+        yield metrics
+    finally:
+        _active = previous
+
+
+def stage(name: str, **keys: Any) -> ContextManager[Dict[str, Any]]:
+    """Time a block as a record of the active metrics (see RunMetrics.stage)."""
+    return _active.stage(name, **keys)
+
+
+def record(stage: str, seconds: Optional[float] = None, **fields: Any) -> None:
+    """Add a record to the active metrics."""
+    _active.record(stage, seconds, **fields)
+
+
+def add_argument(parser: argparse.ArgumentParser) -> None:
+    """The --metrics option shared by the pipeline CLIs."""
+    parser.add_argument(
+        "--metrics",
+        type=Path,
+        metavar="PATH",
+        help="Append per-stage timings and counters of this run to PATH as JSON "
+        "lines and print a summary at the end",
+    )
+
+
+@contextmanager
+def collecting(path: Optional[Path], command: str) -> Iterator[Metrics]:
+    """
+    Collect metrics for a CLI run into path, printing the summary at the end.
+
+    Args:
+        path: JSON-lines file from --metrics; None collects nothing
+        command: Name of the CLI
+    """
+    if path is None:
+        yield DISABLED
+        return
+    run = RunMetrics(path, command)
+    try:
+        with activated(run):
+            yield run
+    finally:
+        run.close()
+        print(run.summary())
+        print(f"Metrics appended to {path}")
@@ -18,7 +18,8 @@ class Paths:
         Local (working files):
             <repo>/data/
             ├── xlsx/     # Renamed YYYYMM.xlsx files
-            └── output/   # Final CSVs
+            ├── cache/    # Disposable derived files (e.g. raw sheet grids)
+            └── output/   # Final CSVs (and dataset/ when Parquet is written)
                 ├── 2024/forecasters/
                 └── 2024/forex/
     """
@@ -66,6 +67,16 @@ class Paths:
         """Output directory for final CSVs."""
         return self.data / "output"
 
+    @property
+    def dataset(self) -> Path:
+        """Hive-partitioned Parquet dataset of the per-month outputs."""
+        return self.output / "dataset"
+
+    @property
+    def cache(self) -> Path:
+        """Cache directory for disposable derived files (safe to delete)."""
+        return self.data / "cache"
+
     # -------------------------------------------------------------------------
     # External paths (on mounted volume)
     # -------------------------------------------------------------------------
@@ -0,0 +1,372 @@
+"""Profiling of selected pipeline stages (the --profile option).
+
+The stages are the ones the pipeline reports to consensus_economics.metrics
+(month, parse, write, ...). While a selected stage runs it is profiled with
+cProfile and its thread's stack is sampled every few milliseconds. Each
+stage's profiles are accumulated over all its runs and written out when the
+run ends:
+
+    <directory>/
+    ├── <stage>.pstats        # cProfile stats (python -m pstats, snakeviz)
+    ├── <stage>.txt           # top functions by cumulative time
+    ├── <stage>.collapsed     # sampled stacks, one "frame;frame;... count"
+    │                         # per line (flamegraph.pl, speedscope)
+    └── <stage>.memory.txt    # with --profile-memory: peak memory allocated
+                              # during the stage and top allocation sites in
+                              # the worksheet parsers
+
+Only one stage is profiled at a time: a selected stage that starts inside
+another one, or on another thread while one is being profiled, runs
+unprofiled. With --profile-months, stages keyed by a survey month are only
+profiled for those months; stages without a month always are.
+
+With --profile-memory, allocations are traced while a stage is profiled.
+Allocation sites are the lines of CountryWorksheet and BaseWorksheet
+(including pandas and NumPy calls made from them) holding the most live
+memory when one of their stages (sheet_to_frame, parse, clean) ends inside
+the profiled stage, i.e. while the parsed grids and frames are still
+referenced. Tracing slows the profiled stage down several times over.
+"""
+
+import argparse
+import cProfile
+import io
+import linecache
+import pstats
+import sys
+import threading
+import tracemalloc
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from fnmatch import fnmatch
+from pathlib import Path
+from typing import Any, Dict, Hashable, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+
+from consensus_economics import metrics
+
+# Files whose allocation sites --profile-memory reports, and the stages of
+# theirs after which the live allocations are snapshotted
+ALLOCATION_FILES = ("*/worksheets/country_worksheet.py", "*/worksheets/base_worksheet.py")
+SNAPSHOT_STAGES = ("sheet_to_frame", "parse", "clean")
+# Files whose allocations are the profiling's own
+OWN_FILES = (__file__, metrics.__file__, tracemalloc.__file__)
+
+# CPython releases whose private tracemalloc._get_traces() is known to return
+# (domain, size, traceback, total_nframe) tuples; see _live_traces()
+RAW_TRACES = hasattr(tracemalloc, "_get_traces") and (3, 9) <= sys.version_info[:2] < (3, 15)
+
+SAMPLE_INTERVAL = 0.005
+TRACEBACK_FRAMES = 25
+TOP_FUNCTIONS = 40
+TOP_SITES = 25
+
+
+def _live_traces() -> Iterator[Tuple[Hashable, int, Tuple[Tuple[str, int], ...]]]:
+    """
+    (key, size, frames) of every traced memory block, innermost frame first.
+
+    Blocks allocated from the same traceback share its key. On the releases
+    in RAW_TRACES the raw traces take_snapshot() wraps are read directly:
+    they share one tuple per distinct traceback, so the key is its id() and
+    no Trace or Frame objects are built, several times faster than going
+    through the snapshot mid-extraction. Elsewhere the public Snapshot API
+    is used.
+    """
+    if RAW_TRACES:
+        for _, size, frames, _ in tracemalloc._get_traces():
+            yield id(frames), size, frames
+        return
+    for trace in tracemalloc.take_snapshot().traces:
+        traceback = trace.traceback
+        yield traceback, trace.size, tuple(
+            (frame.filename, frame.lineno) for frame in reversed(traceback)
+        )
+
+
+def _frame_label(frame) -> str:
+    """Frame name in collapsed stacks: <package/module.py>:<function>."""
+    path = Path(frame.f_code.co_filename)
+    return f"{path.parent.name}/{path.name}:{frame.f_code.co_name}"
+
+
+class StackSampler:
+    """
+    Samples the stack of one thread on a background thread.
+
+    Args:
+        thread_id: Thread to sample (threading.get_ident() of it)
+        interval: Seconds between samples
+    """
+
+    def __init__(self, thread_id: int, interval: float = SAMPLE_INTERVAL) -> None:
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self.paused = threading.Event()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            if self.paused.is_set():
+                continue
+            frame = sys._current_frames().get(self.thread_id)
+            labels = []
+            while frame is not None:
+                labels.append(_frame_label(frame))
+                frame = frame.f_back
+            if labels:
+                self.stacks[";".join(reversed(labels))] += 1
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+
+class StageProfiler:
+    """
+    Metrics that profile selected stages, passing every record on to inner.
+
+    Args:
+        directory: Where the profiles are written
+        stages: Stage names to profile
+        months: YYYYMM months to profile dated stages for (None = all)
+        memory: Also trace allocations (tracemalloc)
+        inner: Metrics the records are passed on to
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        stages: Iterable[str],
+        months: Optional[Iterable[str]] = None,
+        memory: bool = False,
+        inner: metrics.Metrics = metrics.DISABLED,
+    ) -> None:
+        self.directory = Path(directory)
+        self.stages: Set[str] = set(stages)
+        self.months = set(months) if months is not None else None
+        self.memory = memory
+        self.inner = inner
+        self._profiles: Dict[str, cProfile.Profile] = {}
+        self._stacks: Dict[str, Counter] = defaultdict(Counter)
+        self._runs: Counter = Counter()
+        self._peaks: Dict[str, Tuple[int, Dict[str, Any]]] = {}
+        self._sites: Dict[str, Dict[Tuple[str, int], Tuple[int, int]]] = defaultdict(dict)
+        self._busy = threading.Lock()
+        self._current: Optional[str] = None
+        self._owner: Optional[int] = None
+        self._sampler: Optional[StackSampler] = None
+        self._peak = 0
+        self._files: Dict[str, str] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return self.inner.enabled
+
+    @property
+    def unprofiled(self) -> Set[str]:
+        """Selected stages that have not been profiled (yet)."""
+        return self.stages - set(self._profiles)
+
+    def record(self, stage: str, seconds: Optional[float] = None, **fields: Any) -> None:
+        self.inner.record(stage, seconds, **fields)
+
+    def extend(self, records: Iterable[Dict[str, Any]]) -> None:
+        self.inner.extend(records)
+
+    def _selected(self, name: str, keys: Dict[str, Any]) -> bool:
+        if name not in self.stages:
+            return False
+        date = keys.get("date")
+        return self.months is None or date is None or date in self.months
+
+    @contextmanager
+    def stage(self, name: str, **keys: Any) -> Iterator[Dict[str, Any]]:
+        """Pass the stage on to inner, profiling it if selected and nothing else is."""
+        with self.inner.stage(name, **keys) as counters:
+            if self._selected(name, keys) and self._busy.acquire(blocking=False):
+                try:
+                    self._current, self._owner = name, threading.get_ident()
+                    with self._profiled(name, keys):
+                        yield counters
+                finally:
+                    self._current = self._owner = None
+                    self._busy.release()
+            else:
+                try:
+                    yield counters
+                finally:
+                    # A parser stage inside the profiled one: its results are still live
+                    current = self._current
+                    if (
+                        self.memory and current and name in SNAPSHOT_STAGES
+                        and self._owner == threading.get_ident()
+                    ):
+                        with self._paused(current):
+                            self._snapshot(current)
+
+    @contextmanager
+    def _profiled(self, name: str, keys: Dict[str, Any]) -> Iterator[None]:
+        profile = self._profiles.setdefault(name, cProfile.Profile())
+        sampler = self._sampler = StackSampler(threading.get_ident())
+        if self.memory:
+            # Traced only while profiling, so snapshots hold just this stage's memory
+            self._peak = 0
+            tracemalloc.start(TRACEBACK_FRAMES)
+        sampler.start()
+        profile.enable()
+        try:
+            yield
+        finally:
+            profile.disable()
+            sampler.stop()
+            self._stacks[name].update(sampler.stacks)
+            self._runs[name] += 1
+            if self.memory:
+                peak = max(self._peak, tracemalloc.get_traced_memory()[1])
+                if peak > self._peaks.get(name, (0, {}))[0]:
+                    self._peaks[name] = (peak, keys)
+                self._snapshot(name)
+                tracemalloc.stop()
+
+    @contextmanager
+    def _paused(self, name: str) -> Iterator[None]:
+        """Keep the profilers of stage name and its peak memory out of the block."""
+        profile, sampler = self._profiles[name], self._sampler
+        profile.disable()
+        sampler.paused.set()
+        self._peak = max(self._peak, tracemalloc.get_traced_memory()[1])
+        try:
+            yield
+        finally:
+            tracemalloc.reset_peak()
+            sampler.paused.clear()
+            profile.enable()
+
+    def _snapshot(self, name: str) -> None:
+        """Keep the live size of each allocation site if it is the largest seen."""
+        # Each distinct traceback is matched once; Snapshot.statistics()
+        # hashes all frames of every trace, which takes seconds per snapshot
+        # mid-extraction
+        site_of: Dict[Hashable, Optional[Tuple[str, int]]] = {}
+        sites: Dict[Tuple[str, int], List[int]] = defaultdict(lambda: [0, 0])
+        for key, size, frames in _live_traces():
+            if key not in site_of:
+                site_of[key] = self._site(frames)
+            site = site_of[key]
+            if site is not None:
+                sites[site][0] += size
+                sites[site][1] += 1
+        largest = self._sites[name]
+        for site, (size, count) in sites.items():
+            if size > largest.get(site, (0, 0))[0]:
+                largest[site] = (size, count)
+
+    def _site(self, traceback: Tuple[Tuple[str, int], ...]) -> Optional[Tuple[str, int]]:
+        """Innermost (file, line) of traceback in the parsers, if any."""
+        for filename, lineno in traceback:
+            matched = self._files.get(filename)
+            if matched is None:
+                matched = self._files[filename] = (
+                    "own" if filename in OWN_FILES
+                    else "parser" if any(fnmatch(filename, p) for p in ALLOCATION_FILES)
+                    else ""
+                )
+            if matched == "own":
+                # Allocated by the profiler or metrics, e.g. on leaving a stage
+                return None
+            if matched == "parser":
+                return filename, lineno
+        return None
+
+    def close(self) -> List[Path]:
+        """Write the profiles of every stage that ran; returns the files written."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        written = []
+        for name, profile in self._profiles.items():
+            stats_file = self.directory / f"{name}.pstats"
+            profile.dump_stats(stats_file)
+            report = io.StringIO()
+            stats = pstats.Stats(str(stats_file), stream=report)
+            stats.sort_stats("cumulative").print_stats(TOP_FUNCTIONS)
+            text_file = self.directory / f"{name}.txt"
+            text_file.write_text(f"{name}: {self._runs[name]} profiled run(s)\n{report.getvalue()}")
+            stacks_file = self.directory / f"{name}.collapsed"
+            stacks_file.write_text(
+                "".join(f"{stack} {count}\n" for stack, count in self._stacks[name].most_common())
+            )
+            written += [stats_file, text_file, stacks_file]
+            if self.memory:
+                written.append(self._write_memory(name))
+        return written
+
+    def _write_memory(self, name: str) -> Path:
+        peak, keys = self._peaks.get(name, (0, {}))
+        where = " ".join(str(value) for value in keys.values())
+        lines = [f"{name}: peak allocated {peak / 2**20:.1f} MiB ({where})", ""]
+        sites = sorted(self._sites[name].items(), key=lambda item: item[1][0], reverse=True)
+        for (filename, lineno), (size, count) in sites[:TOP_SITES]:
+            source = linecache.getline(filename, lineno).strip()
+            lines.append(
+                f"{size / 2**20:9.2f} MiB {count:>9,} blocks  "
+                f"{Path(filename).name}:{lineno}  {source}"
+            )
+        path = self.directory / f"{name}.memory.txt"
+        path.write_text("\n".join(lines) + "\n")
+        return path
+
+
+def add_arguments(parser: argparse.ArgumentParser, default_stages: Sequence[str]) -> None:
+    """The --profile options of a pipeline CLI."""
+    parser.add_argument(
+        "--profile",
+        type=Path,
+        metavar="DIR",
+        help="Profile selected stages and write pstats, top functions and collapsed "
+        "stacks per stage to DIR",
+    )
+    parser.add_argument(
+        "--profile-stages",
+        nargs="+",
+        default=list(default_stages),
+        metavar="STAGE",
+        help=f"Stages to profile (default: {' '.join(default_stages)})",
+    )
+    parser.add_argument(
+        "--profile-months",
+        nargs="+",
+        metavar="YYYYMM",
+        help="Profile month-keyed stages only for these survey months (default: all)",
+    )
+    parser.add_argument(
+        "--profile-memory",
+        action="store_true",
+        help="Also trace allocations and report the top sites in the worksheet parsers",
+    )
+
+
+@contextmanager
+def profiling(args: argparse.Namespace) -> Iterator[Optional[StageProfiler]]:
+    """Profile the block as requested by the --profile options, if at all."""
+    if args.profile is None:
+        yield None
+        return
+    profiler = StageProfiler(
+        args.profile,
+        args.profile_stages,
+        args.profile_months,
+        args.profile_memory,
+        inner=metrics.active(),
+    )
+    try:
+        with metrics.activated(profiler):
+            yield profiler
+    finally:
+        written = profiler.close()
+        if profiler.unprofiled:
+            print(f"No profiled run of stage(s): {', '.join(sorted(profiler.unprofiled))}")
+        print(f"Profiles: {len(written)} files in {args.profile}")
@@ -0,0 +1,342 @@
+"""Month-on-month forecast revisions of every series in the forecasters panel.
+
+A series is one (country, variable, source, statistic, target year). For each
+of its observations the revisions table records the previous observation and
+the revision since it:
+
+    data/output/revisions.parquet
+
+Consecutive means adjacent on the panel's survey calendar (the survey months
+present in forecasters.parquet), so a month with no issue at all does not
+break every series. Each row is flagged as
+
+    entry   first observation of the series
+    gap     the previous observation is not from the previous survey month
+            (previous_* is filled, revision is null)
+    exit    the series is missing from the next survey month (never set in
+            the latest month)
+
+Rows are in survey month order, and within a month in series order. The
+table is built with sorted-array shifts over the whole panel. After an
+incremental consolidation only the rows linked to a month replaced since
+the table was last built (by this run or by earlier ones without
+--revisions) are recomputed: the replaced months, the month after each (their previous
+observation changed), the month before each (its exit flag) and later gap
+rows whose previous observation moves.
+"""
+
+from pathlib import Path
+from typing import Iterable, List, Optional
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+from consensus_economics.paths import Paths
+from consensus_economics.schema import CATEGORY, DATE
+from consensus_economics.series_index import SERIES_KEYS, series_codes
+from consensus_economics.utils.atomic_write import AtomicWriteUtils
+
+OBSERVATION_COLUMNS = SERIES_KEYS + ["survey_date", "value"]
+
+REVISIONS_SCHEMA = pa.schema([
+    ("country", CATEGORY),
+    ("variable", CATEGORY),
+    ("source", CATEGORY),
+    ("statistic", CATEGORY),
+    ("year", pa.int64()),
+    ("survey_date", DATE),
+    ("value", pa.float64()),
+    ("previous_survey_date", DATE),
+    ("previous_value", pa.float64()),
+    ("revision", pa.float64()),
+    ("entry", pa.bool_()),
+    ("gap", pa.bool_()),
+    ("exit", pa.bool_()),
+])
+
+LINK_COLUMNS = ["previous_survey_date", "previous_value", "revision", "entry", "gap"]
+
+# Origin of the rows in an incremental recomputation: read from the panel
+# or retained from the existing table
+FRESH, RETAINED = 0, 1
+
+
+def revisions_path() -> Path:
+    """Default location of the revisions table."""
+    return Paths().output / "revisions.parquet"
+
+
+def survey_calendar(panel: Path) -> np.ndarray:
+    """Sorted survey months present in a panel file (datetime64[us])."""
+    dates = pq.read_table(panel, columns=["survey_date"])["survey_date"]
+    return np.sort(pc.unique(dates).to_numpy())
+
+
+def _dates(column: pa.ChunkedArray) -> np.ndarray:
+    """Timestamps as datetime64[us], NaT for nulls."""
+    return column.to_numpy().astype("datetime64[us]")
+
+
+def link_observations(observations: pa.Table, calendar: np.ndarray) -> pa.Table:
+    """
+    Link every observation to its series' previous and next survey months.
+
+    Args:
+        observations: OBSERVATION_COLUMNS, plus any columns to carry along
+        calendar: Sorted survey months of the panel
+
+    Returns:
+        One row per series and month (the first where a series repeats in a
+        month), in month then series order, with REVISIONS_SCHEMA columns
+        followed by the carried columns
+    """
+    if observations.num_rows == 0:
+        columns = [pa.array([], field.type) for field in REVISIONS_SCHEMA]
+        table = pa.table(columns, schema=REVISIONS_SCHEMA)
+        for name in observations.column_names:
+            if name not in OBSERVATION_COLUMNS:
+                table = table.append_column(name, observations[name])
+        return table
+    code = series_codes(observations.select(SERIES_KEYS))
+    position = np.searchsorted(calendar, _dates(observations["survey_date"]))
+
+    order = np.lexsort((position, code))
+    code, position = code[order], position[order]
+    first = np.r_[True, (code[1:] != code[:-1]) | (position[1:] != position[:-1])]
+    order, code, position = order[first], code[first], position[first]
+
+    same_previous = np.r_[False, code[1:] == code[:-1]]
+    same_next = np.r_[code[1:] == code[:-1], False]
+    previous = np.r_[-1, position[:-1]]
+    following = np.r_[position[1:], -1]
+    gap = same_previous & (position - previous > 1)
+    exit_ = (position < len(calendar) - 1) & (~same_next | (following - position > 1))
+
+    values = observations["value"].to_numpy()[order]
+    previous_value = np.r_[np.nan, values[:-1]]
+    revision = values - previous_value
+
+    # Month-major output
+    out = np.lexsort((code, position))
+    rows = observations.take(pa.array(order[out]))
+    linked = ~same_previous[out]
+    computed = {
+        "previous_survey_date": pa.array(
+            calendar[np.maximum(previous[out], 0)], DATE, mask=linked
+        ),
+        "previous_value": pa.array(previous_value[out], mask=linked),
+        "revision": pa.array(revision[out], mask=linked | gap[out]),
+        "entry": pa.array(linked),
+        "gap": pa.array(gap[out]),
+        "exit": pa.array(exit_[out]),
+    }
+    columns = {name: rows[name] for name in OBSERVATION_COLUMNS}
+    columns.update(computed)
+    table = pa.table(columns).cast(REVISIONS_SCHEMA)
+    for name in rows.column_names:
+        if name not in OBSERVATION_COLUMNS:
+            table = table.append_column(name, rows[name])
+    return table
+
+
+def _read_observations(panel: Path, months: Optional[np.ndarray] = None) -> pa.Table:
+    """Panel observations, optionally of some survey months only."""
+    filters = None
+    if months is not None:
+        filters = pc.is_in(pc.field("survey_date"), value_set=pa.array(months, DATE))
+    return pq.read_table(panel, columns=OBSERVATION_COLUMNS, filters=filters)
+
+
+def _origin(table: pa.Table, origin: int) -> pa.Table:
+    """Observations tagged with where they come from and their row there."""
+    return table.select(OBSERVATION_COLUMNS).append_column(
+        "_origin", pa.array(np.full(table.num_rows, origin, dtype=np.int8))
+    ).append_column("_row", pa.array(np.arange(table.num_rows)))
+
+
+def _isin_dictionary(column: pa.ChunkedArray, values: pa.ChunkedArray) -> pa.ChunkedArray:
+    """Mask of a dictionary column taking one of values (null included), compared by index."""
+    wanted = pc.unique(values.combine_chunks().dictionary_decode())
+    # A null key is a series of its own (see series_codes), so it matches null
+    match_null = wanted.null_count > 0
+    masks = []
+    for chunk in column.chunks:
+        indices = pa.array(np.flatnonzero(
+            pc.is_in(chunk.dictionary, value_set=wanted, skip_nulls=False)
+        ))
+        mask = pc.is_in(chunk.indices, value_set=indices)
+        if match_null:
+            mask = pc.or_(mask, pc.is_null(chunk.indices))
+        masks.append(mask)
+    return pa.chunked_array(masks, pa.bool_())
+
+
+def _retained(origin: np.ndarray, rows: np.ndarray, mask: np.ndarray) -> np.ndarray:
+    """Linked rows retained from the existing table whose row there is in mask."""
+    selected = np.zeros(len(origin), dtype=bool)
+    retained = np.flatnonzero(origin == RETAINED)
+    selected[retained] = mask[rows[retained]]
+    return selected
+
+
+def _patch(table: pa.Table, mask: np.ndarray, updated: pa.Table, names: List[str]) -> pa.Table:
+    """
+    Overwrite some columns of the masked rows of a table.
+
+    Only the slice spanning the masked rows is rebuilt; updated holds their
+    new values with a _row column giving their position in table.
+    """
+    positions = np.flatnonzero(mask)
+    if not len(positions):
+        return table
+    low, high = int(positions[0]), int(positions[-1]) + 1
+    updated = updated.take(pa.array(np.argsort(updated["_row"].to_numpy())))
+    patched = table.slice(low, high - low)
+    for name in names:
+        column = pc.replace_with_mask(
+            patched[name].combine_chunks(),
+            pa.array(mask[low:high]),
+            updated[name].combine_chunks().cast(patched.schema.field(name).type),
+        )
+        patched = patched.set_column(patched.schema.get_field_index(name), name, column)
+    return pa.concat_tables([table.slice(0, low), patched, table.slice(high)])
+
+
+def _concat(tables: List[pa.Table]) -> pa.Table:
+    """Stack tables whose dictionary columns may differ."""
+    return pa.concat_tables(tables, promote_options="permissive").unify_dictionaries()
+
+
+def splice_revisions(
+    existing: pa.Table, panel: Path, calendar: np.ndarray, replaced: Iterable[str]
+) -> pa.Table:
+    """
+    Update a revisions table for replaced survey months.
+
+    Args:
+        existing: Revisions table before the months were replaced
+        panel: Consolidated forecasters with the months in place
+        calendar: Survey months of the updated panel
+        replaced: YYYYMM months added, replaced or removed
+
+    Returns:
+        The revisions table of the updated panel
+    """
+    replaced = np.array(
+        [np.datetime64(f"{month[:4]}-{month[4:]}-01", "us") for month in replaced],
+        dtype="datetime64[us]",
+    )
+    before = np.searchsorted(calendar, replaced, side="left") - 1
+    after = np.searchsorted(calendar, replaced, side="right")
+    # Months recomputed from the panel, months whose exit flags change, and
+    # months needed to tell whether the recomputed rows exit
+    fresh_months = np.union1d(
+        replaced[np.isin(replaced, calendar)], calendar[after[after < len(calendar)]]
+    )
+    before_months = np.setdiff1d(calendar[before[before >= 0]], fresh_months)
+    following = np.searchsorted(calendar, fresh_months, side="right")
+    next_months = calendar[following[following < len(calendar)]]
+
+    dates = _dates(existing["survey_date"])
+    retained = existing.filter(pa.array(~np.isin(dates, np.union1d(replaced, fresh_months))))
+    dates = _dates(retained["survey_date"])
+    exiting = np.isin(dates, before_months)
+
+    # Rows whose link crosses a replaced month: their previous observation
+    # may be in it (or no longer be), or they may stop being entries
+    linked_from = _dates(retained["previous_survey_date"])
+    linked_from[np.isnat(linked_from)] = np.datetime64(0, "us")
+    dependent = np.zeros(retained.num_rows, dtype=bool)
+    for month in replaced:
+        dependent |= (linked_from <= month) & (dates > month)
+
+    in_context = exiting | dependent | np.isin(dates, next_months)
+    context = [
+        _origin(_read_observations(panel, fresh_months), FRESH),
+        _origin(retained, RETAINED).filter(pa.array(in_context)),
+    ]
+    linked = link_observations(_concat(context), calendar)
+    origin, rows = linked["_origin"].to_numpy(), linked["_row"].to_numpy()
+    relinked = (origin == FRESH) | _retained(origin, rows, dependent)
+
+    # Rows whose previous observation lies outside the context look it up
+    # among the rows that were last before a gap (old exit flag): any other
+    # retained row is followed by a later one of its series
+    open_link = relinked & (linked["entry"].to_numpy() | linked["gap"].to_numpy())
+    if open_link.any():
+        wanted = linked.filter(pa.array(open_link)).select(SERIES_KEYS)
+        last = ~in_context & retained["exit"].to_numpy(zero_copy_only=False)
+        history = _origin(retained, RETAINED).filter(pa.array(last))
+        for name in ["country", "variable", "source"]:
+            history = history.filter(_isin_dictionary(history[name], wanted[name]))
+        codes = series_codes(_concat([wanted, history.select(SERIES_KEYS)]))
+        history = history.filter(pa.array(np.isin(codes[len(wanted):], codes[:len(wanted)])))
+        linked = link_observations(_concat(context + [history]), calendar)
+        origin, rows = linked["_origin"].to_numpy(), linked["_row"].to_numpy()
+
+    fresh_block = linked.filter(pa.array(origin == FRESH)).select(REVISIONS_SCHEMA.names)
+
+    for mask, names in [(dependent, LINK_COLUMNS), (exiting, ["exit"])]:
+        updated = linked.filter(pa.array(_retained(origin, rows, mask)))
+        retained = _patch(retained, mask, updated, names)
+
+    # Both are in month order and the fresh months are whole: interleave
+    # slices rather than sorting the table
+    retained_dates = _dates(retained["survey_date"])
+    fresh_dates = _dates(fresh_block["survey_date"])
+    cuts = np.searchsorted(retained_dates, fresh_months)
+    starts = np.searchsorted(fresh_dates, fresh_months)
+    ends = np.searchsorted(fresh_dates, fresh_months, side="right")
+    pieces, done = [], 0
+    for cut, start, end in zip(cuts, starts, ends):
+        pieces += [retained.slice(done, cut - done), fresh_block.slice(start, end - start)]
+        done = cut
+    pieces.append(retained.slice(done))
+    return _concat([piece.cast(REVISIONS_SCHEMA) for piece in pieces])
+
+
+def update_revisions(
+    months: Optional[Iterable[str]] = None,
+    panel: Optional[Path] = None,
+    target: Optional[Path] = None,
+) -> int:
+    """
+    Rebuild the revisions table, or only the rows linked to some survey months.
+
+    Args:
+        months: YYYYMM survey months added, replaced or removed since the
+            table was built (None = rebuild from the whole panel)
+        panel: Consolidated forecasters (default: data/output/forecasters.parquet)
+        target: Output file (default: data/output/revisions.parquet)
+
+    Returns:
+        Rows in the revisions table
+
+    Raises:
+        FileNotFoundError: If the forecasters panel has not been consolidated
+    """
+    panel = panel or Paths().output / "forecasters.parquet"
+    target = target or revisions_path()
+    if not Path(panel).exists():
+        raise FileNotFoundError(f"{panel} not found — consolidate forecasters first")
+
+    calendar = survey_calendar(panel)
+    if months is None or not Path(target).exists():
+        table = link_observations(_read_observations(panel), calendar)
+    else:
+        table = splice_revisions(pq.read_table(target), panel, calendar, months)
+
+    with AtomicWriteUtils.replacing(target) as tmp:
+        pq.write_table(
+            table.cast(REVISIONS_SCHEMA),
+            tmp,
+            compression="zstd",
+            use_dictionary=SERIES_KEYS[:4],
+            column_encoding={
+                name: "DELTA_BINARY_PACKED"
+                for name in ["year", "survey_date", "previous_survey_date"]
+            },
+        )
+    return table.num_rows
@@ -0,0 +1,58 @@
+"""Arrow schemas for the output data (see SCHEMA.md).
+
+The per-month columns are declared once here, so every writer and reader of
+the Parquet outputs agrees on types up front instead of inferring them file
+by file: repeated strings are dictionary-encoded (pandas categoricals),
+target years are integers, values are floats and dates are timestamps.
+"""
+
+from typing import Dict, List
+
+import pyarrow as pa
+
+# Dictionary-encoded string; read back by pandas as a categorical
+CATEGORY = pa.dictionary(pa.int32(), pa.string())
+
+# Day precision in practice; microsecond unit matches pandas' datetime64[us]
+DATE = pa.timestamp("us")
+
+FORECASTERS_SCHEMA = pa.schema([
+    ("country", CATEGORY),
+    ("variable", CATEGORY),
+    ("source", CATEGORY),
+    ("statistic", CATEGORY),
+    ("year", pa.int64()),
+    ("value", pa.float64()),
+    ("unit", CATEGORY),
+    ("release_date", DATE),
+])
+
+FOREX_SCHEMA = pa.schema([
+    ("currency", CATEGORY),
+    ("reference", CATEGORY),
+    ("year", pa.int64()),
+    ("horizon", pa.int64()),
+    ("current_value", pa.float64()),
+    ("forecasted_value", pa.float64()),
+    ("release_date", DATE),
+])
+
+SCHEMAS: Dict[str, pa.Schema] = {
+    "forecasters": FORECASTERS_SCHEMA,
+    "forex": FOREX_SCHEMA,
+}
+
+
+def month_schema(kind: str) -> pa.Schema:
+    """Columns of one survey month's output for a kind."""
+    return SCHEMAS[kind]
+
+
+def consolidated_schema(kind: str) -> pa.Schema:
+    """Columns of the consolidated panel: the month columns plus survey_date."""
+    return SCHEMAS[kind].append(pa.field("survey_date", DATE))
+
+
+def categorical_columns(kind: str) -> List[str]:
+    """Names of the dictionary-encoded columns of a kind."""
+    return [field.name for field in SCHEMAS[kind] if pa.types.is_dictionary(field.type)]
@@ -0,0 +1,202 @@
+"""Series-level sidecar index of the consolidated forecasters panel.
+
+Dashboards pull the same single series (one country, variable, source,
+statistic and target year across all survey months) over and over. The
+index maps each such series to the rows of forecasters.parquet holding it,
+so a read decodes only the row groups involved and only the columns asked
+for, without evaluating filters over the string columns:
+
+    data/output/forecasters.series.parquet
+
+One row per series: the five key columns and a sorted list of the series'
+row numbers in the panel. Row numbers convert to (row group, row in group)
+with the panel footer's row-group sizes.
+
+consolidate-output writes the index as a by-product of laying out the panel,
+one country at a time, and stamps both files with the same consolidation
+id; an index whose id does not match its panel is ignored.
+"""
+
+import uuid
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+from consensus_economics.schema import CATEGORY
+from consensus_economics.utils.atomic_write import AtomicWriteUtils
+
+SERIES_KEYS = ["country", "variable", "source", "statistic", "year"]
+
+# Schema metadata key shared by the panel and its index
+CONSOLIDATION_ID = b"consolidation_id"
+
+INDEX_SCHEMA = pa.schema([
+    ("country", CATEGORY),
+    ("variable", CATEGORY),
+    ("source", CATEGORY),
+    ("statistic", CATEGORY),
+    ("year", pa.int64()),
+    ("rows", pa.list_(pa.int64())),
+])
+
+
+def index_path(panel: Path) -> Path:
+    """Sidecar index file of a consolidated panel."""
+    return panel.with_name(f"{panel.stem}.series.parquet")
+
+
+def new_consolidation_id() -> str:
+    """Identifier stamped on a panel and its index when they are written."""
+    return uuid.uuid4().hex
+
+
+def consolidation_id(schema: pa.Schema) -> Optional[str]:
+    """Consolidation id recorded in a file's schema metadata, if any."""
+    value = (schema.metadata or {}).get(CONSOLIDATION_ID)
+    return value.decode() if value is not None else None
+
+
+def _ranks(column: pa.ChunkedArray) -> np.ndarray:
+    """Integer sort key of a column: value rank for dictionaries, nulls as -1."""
+    if pa.types.is_dictionary(column.type):
+        array = column.combine_chunks()
+        ranks = pc.rank(array.dictionary, sort_keys="ascending", tiebreaker="dense")
+        column = ranks.cast(pa.int64()).take(array.indices)
+    values = pc.fill_null(column, -1) if column.null_count else column
+    return np.asarray(values).astype(np.int64)
+
+
+def series_codes(keys: pa.Table) -> np.ndarray:
+    """
+    One integer per row identifying its series.
+
+    The key ranks are packed into one integer (mixed radix), so codes sort
+    in the order of (country, variable, source, statistic, year) values,
+    nulls first. Codes are only comparable within one table.
+    """
+    packed = np.zeros(keys.num_rows, dtype=np.int64)
+    for name in SERIES_KEYS:
+        rank = _ranks(keys[name])
+        low = rank.min() if len(rank) else 0
+        packed = packed * (int(rank.max(initial=low)) - int(low) + 1) + (rank - low)
+    return packed
+
+
+def series_entries(keys: pa.Table, first_row: int = 0) -> pa.Table:
+    """
+    Group rows into series.
+
+    Args:
+        keys: SERIES_KEYS columns of consecutive panel rows
+        first_row: Panel row number of the first row of keys
+
+    Returns:
+        One row per series with INDEX_SCHEMA; a series' rows are ascending
+    """
+    if not keys.num_rows:
+        return INDEX_SCHEMA.empty_table()
+    packed = series_codes(keys)
+    # Stable, so each series' rows stay in ascending order
+    order = np.argsort(packed, kind="stable")
+    packed = packed[order]
+    starts = np.flatnonzero(np.r_[True, packed[1:] != packed[:-1]])
+    offsets = np.r_[starts, len(order)].astype(np.int32)
+
+    firsts = pa.array(order[starts])
+    columns = [keys[name].take(firsts) for name in SERIES_KEYS]
+    rows = pa.ListArray.from_arrays(pa.array(offsets), pa.array(order + first_row))
+    table = pa.table(columns + [rows], names=SERIES_KEYS + ["rows"])
+    return table.cast(INDEX_SCHEMA)
+
+
+def build_series_index(panel: Path) -> pa.Table:
+    """Series entries for an existing panel file, read from its key columns."""
+    keys = pq.read_table(panel, columns=SERIES_KEYS)
+    return series_entries(keys)
+
+
+def write_series_index(path: Path, entries: Sequence[pa.Table], panel_id: str) -> None:
+    """Atomically write an index, stamped with its panel's consolidation id."""
+    schema = INDEX_SCHEMA.with_metadata({CONSOLIDATION_ID: panel_id})
+    table = pa.concat_tables([INDEX_SCHEMA.empty_table(), *entries])
+    table = table.unify_dictionaries().combine_chunks().replace_schema_metadata(schema.metadata)
+    with AtomicWriteUtils.replacing(path) as tmp:
+        pq.write_table(
+            table,
+            tmp,
+            compression="zstd",
+            use_dictionary=SERIES_KEYS,
+            column_encoding={"rows.list.element": "DELTA_BINARY_PACKED"},
+        )
+
+
+class SeriesIndex:
+    """
+    In-memory series index of one panel file.
+
+    Args:
+        entries: Index rows (INDEX_SCHEMA)
+        row_group_starts: Panel row number at which each row group starts,
+            followed by the panel's row count
+    """
+
+    def __init__(self, entries: pa.Table, row_group_starts: np.ndarray) -> None:
+        rows = entries["rows"].combine_chunks()
+        self.keys = entries.drop_columns(["rows"]).to_pandas()
+        self.offsets = rows.offsets.to_numpy()
+        self.rows = rows.values.to_numpy()
+        self.row_group_starts = row_group_starts
+
+    @classmethod
+    def load(cls, panel: Path) -> Optional["SeriesIndex"]:
+        """
+        Index of a panel, if one exists and was written with it.
+
+        Returns:
+            None when the index is missing or stale (its consolidation id
+            differs from the panel's)
+        """
+        path = index_path(panel)
+        if not path.exists():
+            return None
+        metadata = pq.read_metadata(panel)
+        entries = pq.read_table(path)
+        panel_id = consolidation_id(metadata.schema.to_arrow_schema())
+        if panel_id is None or consolidation_id(entries.schema) != panel_id:
+            return None
+        sizes = [metadata.row_group(i).num_rows for i in range(metadata.num_row_groups)]
+        return cls(entries, np.cumsum([0, *sizes]))
+
+    @property
+    def num_rows(self) -> int:
+        """Rows of the panel covered by the index."""
+        return int(self.row_group_starts[-1])
+
+    def lookup(self, allowed: Dict[str, List[Any]]) -> np.ndarray:
+        """
+        Panel row numbers of every series matching the filters, ascending.
+
+        Args:
+            allowed: Accepted values per key column; absent keys do not restrict
+        """
+        mask = np.ones(len(self.keys), dtype=bool)
+        for name, values in allowed.items():
+            mask &= self.keys[name].isin(values).to_numpy()
+        selected = np.flatnonzero(mask)
+        if not len(selected):
+            return np.empty(0, dtype=np.int64)
+        parts = [self.rows[self.offsets[i]:self.offsets[i + 1]] for i in selected]
+        return np.sort(np.concatenate(parts))
+
+    def locate(self, rows: np.ndarray) -> Dict[int, np.ndarray]:
+        """Group panel row numbers by row group, as offsets within the group."""
+        groups = np.searchsorted(self.row_group_starts, rows, side="right") - 1
+        located: Dict[int, np.ndarray] = {}
+        for group in np.unique(groups):
+            in_group = rows[groups == group]
+            located[int(group)] = in_group - self.row_group_starts[group]
+        return located
@@ -0,0 +1,412 @@
+"""Lazy, filtered reads of the consolidated forecasters panel.
+
+Loading data/output/forecasters.parquet whole to pick one series reads
+millions of rows. ConsensusStore instead builds a query whose filters and
+column selection are handed to the Parquet reader. Row groups whose min/max
+statistics rule out the filters are skipped before anything is decoded (the
+Arrow scanner does not prune on dictionary-encoded columns by itself), and
+only the requested columns are read:
+
+    store = ConsensusStore()
+    gdp = store.query(country="Germany", variable="Gross Domestic Product",
+                      source="Consensus", statistic="mean", start="2020-01").to_pandas()
+
+Filters take a single value or a collection of values. A concept_id filter
+is resolved through the variable map to the raw labels denoting the concept
+and then checked against each label's validity range at the survey date.
+
+When forecasters.parquet has a current series index (see
+consensus_economics.series_index) and the filters pick out a small share of
+it, the matching rows are looked up in the index and read directly from
+their row groups instead of being found by a filtered scan.
+"""
+
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from consensus_economics import dataset
+from consensus_economics.mappings import load_variable_index
+from consensus_economics.paths import Paths
+from consensus_economics.schema import DATE
+from consensus_economics.series_index import SERIES_KEYS, SeriesIndex
+
+Values = Union[Any, Iterable[Any]]
+
+# Use the series index when the selected rows are at most this share of the
+# panel; beyond that a pruned scan reads about as much and filters faster
+INDEX_MAX_SHARE = 1 / 8
+
+
+def _as_list(values: Values) -> List[Any]:
+    """A filter value as a list; strings and scalars become one-element lists."""
+    if isinstance(values, (str, bytes, int, np.integer)) or not isinstance(values, Iterable):
+        return [values]
+    return list(values)
+
+
+def _timestamp(value: Any) -> datetime:
+    """Survey date bound as a naive datetime, as Parquet statistics report it."""
+    return pd.Timestamp(value).to_pydatetime()
+
+
+def _may_match(
+    statistics: Dict[str, Dict[str, Any]],
+    allowed: Dict[str, List[Any]],
+    start: Optional[datetime],
+    end: Optional[datetime],
+) -> bool:
+    """Whether a row group's min/max statistics leave room for matching rows."""
+    try:
+        for name, values in allowed.items():
+            stats = statistics.get(name)
+            if not stats or "min" not in stats or None in values:
+                continue
+            if not any(stats["min"] <= value <= stats["max"] for value in values):
+                return False
+        stats = statistics.get("survey_date")
+        if stats and "min" in stats:
+            if start is not None and stats["max"] < start:
+                return False
+            if end is not None and stats["min"] > end:
+                return False
+    except TypeError:
+        # A filter value not comparable with the column; let the scan decide
+        return True
+    return True
+
+
+class StoreQuery:
+    """
+    A filtered, projected read of the panel; nothing is read until asked.
+
+    Args:
+        store: Store the query reads from
+        filter: Row predicate pushed down to the reader (None for all rows)
+        columns: Columns to return (None for all)
+        allowed: Accepted values per column, used to skip row groups
+        start: Earliest survey date, inclusive
+        end: Latest survey date, inclusive
+        concept_ids: If given, keep only rows whose label resolves to one of
+            these concepts at the survey date, and add a concept_id column
+    """
+
+    def __init__(
+        self,
+        store: "ConsensusStore",
+        filter: Optional[ds.Expression],
+        columns: Optional[List[str]],
+        allowed: Optional[Dict[str, List[Any]]] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        concept_ids: Optional[List[str]] = None,
+    ) -> None:
+        self.store = store
+        self.filter = filter
+        self.columns = columns
+        self.allowed = allowed or {}
+        self.start = start
+        self.end = end
+        self.concept_ids = concept_ids
+        self._source: Optional[ds.Dataset] = None
+        self._rows: Optional[np.ndarray] = None
+        self._rows_resolved = False
+
+    @property
+    def source(self) -> ds.Dataset:
+        """The panel restricted to the row groups that may hold matching rows."""
+        if self._source is None:
+            self._source = self.store.prune(self.filter, self.allowed, self.start, self.end)
+        return self._source
+
+    @property
+    def rows(self) -> Optional[np.ndarray]:
+        """Panel row numbers from the series index, or None to scan instead."""
+        if not self._rows_resolved:
+            self._rows = self.store.series_rows(self.allowed)
+            self._rows_resolved = True
+        return self._rows
+
+    def _read_columns(self) -> Optional[List[str]]:
+        """Columns to read: the requested ones plus what concept resolution needs."""
+        if self.columns is None or self.concept_ids is None:
+            return self.columns
+        needed = ["country", "variable", "survey_date"]
+        return self.columns + [col for col in needed if col not in self.columns]
+
+    def _date_filter(self) -> Optional[ds.Expression]:
+        """The survey_date bounds alone, for rows already selected by the index."""
+        bounds = []
+        if self.start is not None:
+            bounds.append(ds.field("survey_date") >= pa.scalar(self.start, type=DATE))
+        if self.end is not None:
+            bounds.append(ds.field("survey_date") <= pa.scalar(self.end, type=DATE))
+        return bounds[0] & bounds[1] if len(bounds) == 2 else (bounds[0] if bounds else None)
+
+    def _indexed_batches(self, batch_size: int) -> Iterator[pa.RecordBatch]:
+        """Rows picked by the series index, one row group at a time."""
+        columns = self._read_columns() or self.store.columns
+        date_filter = self._date_filter()
+        read = columns
+        if date_filter is not None and "survey_date" not in columns:
+            read = columns + ["survey_date"]
+        parquet = self.store.parquet
+        for group, offsets in self.store.series_index.locate(self.rows).items():
+            table = parquet.read_row_group(group, columns=read).take(offsets)
+            if date_filter is not None:
+                table = table.filter(date_filter).select(columns)
+            yield from table.to_batches(max_chunksize=batch_size)
+
+    def _resolve_concepts(self, batch: pa.RecordBatch) -> pa.RecordBatch:
+        """Keep rows mapped to the requested concepts; append concept_id."""
+        index = load_variable_index()
+        frame = batch.select(["country", "variable", "survey_date"]).to_pandas()
+        position, _ = index.lookup(frame["country"], frame["variable"], frame["survey_date"])
+        concept = pa.array(index.column("concept_id", position), pa.string())
+        keep = pc.fill_null(pc.is_in(concept, pa.array(self.concept_ids, pa.string())), False)
+        batch = batch.append_column("concept_id", concept).filter(keep)
+        if self.columns is not None:
+            batch = batch.select(self.columns + ["concept_id"])
+        return batch
+
+    def to_batches(self, batch_size: int = 128 * 1024) -> Iterator[pa.RecordBatch]:
+        """Stream the matching rows as Arrow record batches."""
+        if self.rows is not None:
+            batches = self._indexed_batches(batch_size)
+        else:
+            batches = self.source.to_batches(
+                columns=self._read_columns(), filter=self.filter, batch_size=batch_size
+            )
+        for batch in batches:
+            if self.concept_ids is not None:
+                batch = self._resolve_concepts(batch)
+            if batch.num_rows:
+                yield batch
+
+    def to_table(self) -> pa.Table:
+        """All matching rows as one Arrow table."""
+        if self.concept_ids is None and self.rows is None:
+            return self.source.to_table(columns=self.columns, filter=self.filter)
+        batches = list(self.to_batches())
+        if not batches:
+            schema = self.store.source.schema
+            names = self.columns if self.columns is not None else schema.names
+            fields = [schema.field(name) for name in names]
+            if self.concept_ids is not None:
+                fields.append(pa.field("concept_id", pa.string()))
+            return pa.schema(fields).empty_table()
+        return pa.Table.from_batches(batches)
+
+    def to_pandas(self) -> pd.DataFrame:
+        """All matching rows as a DataFrame, with categoricals as in the panel."""
+        return self.to_table().to_pandas()
+
+    def count_rows(self) -> int:
+        """Number of matching rows."""
+        if self.concept_ids is None and self.rows is not None and self._date_filter() is None:
+            return len(self.rows)
+        if self.concept_ids is None and self.rows is None:
+            return self.source.count_rows(filter=self.filter)
+        return sum(batch.num_rows for batch in self.to_batches())
+
+
+class ConsensusStore:
+    """
+    Query interface over the consolidated forecasters panel.
+
+    Args:
+        path: Consolidated Parquet file; defaults to
+            data/output/forecasters.parquet. Ignored when partitioned is set.
+        partitioned: Read the per-month partitioned dataset
+            (data/output/dataset) instead, pruning whole months by survey_date
+
+    Raises:
+        FileNotFoundError: If the panel has not been consolidated yet
+    """
+
+    def __init__(self, path: Optional[Path] = None, partitioned: bool = False) -> None:
+        self._row_groups: Dict[str, List[Tuple[int, Dict[str, Any]]]] = {}
+        self._series_index: Optional[SeriesIndex] = None
+        self._parquet: Optional[pq.ParquetFile] = None
+        if partitioned:
+            self.path = None
+            self.source = dataset.open_dataset("forecasters")
+            return
+        self.path = Path(path) if path is not None else Paths().output / "forecasters.parquet"
+        if not self.path.exists():
+            raise FileNotFoundError(
+                f"{self.path} not found — run `consolidate-output` first"
+            )
+        self.source = ds.dataset(str(self.path), format="parquet")
+
+    def _statistics(self, fragment: ds.ParquetFileFragment) -> List[Tuple[int, Dict[str, Any]]]:
+        """(row group id, column statistics) of a file, read once per store."""
+        if fragment.path not in self._row_groups:
+            self._row_groups[fragment.path] = [
+                (row_group.id, row_group.statistics) for row_group in fragment.row_groups
+            ]
+        return self._row_groups[fragment.path]
+
+    def prune(
+        self,
+        filter: Optional[ds.Expression],
+        allowed: Dict[str, List[Any]],
+        start: Optional[datetime],
+        end: Optional[datetime],
+    ) -> ds.Dataset:
+        """
+        The panel restricted to row groups whose statistics admit the filters.
+
+        Args:
+            filter: Row predicate, used to skip whole partitions
+            allowed: Accepted values per column
+            start: Earliest survey date, inclusive
+            end: Latest survey date, inclusive
+
+        Returns:
+            Dataset over the surviving row groups, with the panel's schema
+        """
+        fragments = []
+        for fragment in self.source.get_fragments(filter=filter):
+            keep = [
+                row_group
+                for row_group, statistics in self._statistics(fragment)
+                if _may_match(statistics, allowed, start, end)
+            ]
+            if keep:
+                fragments.append(fragment.subset(row_group_ids=keep))
+        return ds.FileSystemDataset(
+            fragments,
+            schema=self.source.schema,
+            format=self.source.format,
+            filesystem=self.source.filesystem,
+        )
+
+    @property
+    def columns(self) -> List[str]:
+        """Columns available for projection."""
+        return self.source.schema.names
+
+    @property
+    def series_index(self) -> Optional[SeriesIndex]:
+        """Series index of the panel file, loaded on first use (None if absent or stale)."""
+        if self.path is not None and self._series_index is None:
+            self._series_index = SeriesIndex.load(self.path)
+        return self._series_index
+
+    @property
+    def parquet(self) -> pq.ParquetFile:
+        """The panel file, for reads by row group."""
+        if self._parquet is None:
+            self._parquet = pq.ParquetFile(self.path)
+        return self._parquet
+
+    def series_rows(self, allowed: Dict[str, List[Any]]) -> Optional[np.ndarray]:
+        """
+        Panel rows of the series matching the filters, if the index is worth using.
+
+        Returns:
+            Ascending row numbers, or None when there is no usable index, no
+            filter on a series key, or the selection is too large a share
+            of the panel for row lookups to beat a pruned scan
+        """
+        keys = {name: values for name, values in allowed.items() if name in SERIES_KEYS}
+        if not keys or self.series_index is None:
+            return None
+        rows = self.series_index.lookup(keys)
+        if len(rows) > self.series_index.num_rows * INDEX_MAX_SHARE:
+            return None
+        return rows
+
+    def _isin(self, name: str, values: List[Any]) -> ds.Expression:
+        """Membership predicate with the value set typed like the column."""
+        value_type = self.source.schema.field(name).type
+        if pa.types.is_dictionary(value_type):
+            value_type = value_type.value_type
+        return ds.field(name).isin(pa.array(values, type=value_type))
+
+    def query(
+        self,
+        country: Optional[Values] = None,
+        variable: Optional[Values] = None,
+        concept_id: Optional[Values] = None,
+        source: Optional[Values] = None,
+        statistic: Optional[Values] = None,
+        year: Optional[Values] = None,
+        start: Optional[Any] = None,
+        end: Optional[Any] = None,
+        columns: Optional[Sequence[str]] = None,
+    ) -> StoreQuery:
+        """
+        Build a lazy query; filters left as None do not restrict.
+
+        Args:
+            country: Country name(s)
+            variable: Raw variable label(s)
+            concept_id: Concept id(s) from the variable map
+            source: Forecaster name(s), or "Consensus" for the summary rows
+            statistic: Statistic label(s): "forecast" for individual forecasts;
+                "mean", "std_dev", "high", "low" or "count" for the Consensus rows
+            year: Target year(s)
+            start: Earliest survey date, inclusive (anything pd.Timestamp parses)
+            end: Latest survey date, inclusive
+            columns: Columns to return (None for all)
+
+        Returns:
+            Query to materialize with to_pandas(), to_table() or to_batches()
+
+        Raises:
+            ValueError: If a requested column does not exist
+        """
+        if columns is not None:
+            unknown = sorted(set(columns) - set(self.columns))
+            if unknown:
+                raise ValueError(f"Unknown columns: {unknown}")
+            columns = list(columns)
+
+        values = {
+            "country": country,
+            "variable": variable,
+            "source": source,
+            "statistic": statistic,
+            "year": year,
+        }
+        allowed = {name: _as_list(value) for name, value in values.items() if value is not None}
+        predicates = [self._isin(name, value) for name, value in allowed.items()]
+        start = _timestamp(start) if start is not None else None
+        end = _timestamp(end) if end is not None else None
+        if start is not None:
+            predicates.append(ds.field("survey_date") >= pa.scalar(start, type=DATE))
+        if end is not None:
+            predicates.append(ds.field("survey_date") <= pa.scalar(end, type=DATE))
+
+        concept_ids = None
+        if concept_id is not None:
+            concept_ids = [str(value) for value in _as_list(concept_id)]
+            # Push down the labels that can denote the concepts; the validity
+            # ranges are checked on the rows that come back
+            frame = load_variable_index().frame
+            labels = frame[frame["concept_id"].isin(concept_ids)]
+            for name, column in (("country", "country"), ("variable", "raw_variable")):
+                labels_allowed = labels[column].unique().tolist()
+                if name in allowed:
+                    labels_allowed = [v for v in labels_allowed if v in allowed[name]]
+                allowed[name] = labels_allowed
+                predicates.append(self._isin(name, labels_allowed))
+
+        filter = None
+        for predicate in predicates:
+            filter = predicate if filter is None else filter & predicate
+        return StoreQuery(self, filter, columns, allowed, start, end, concept_ids)
+
+    def read(self, **filters: Any) -> pd.DataFrame:
+        """Shorthand for query(**filters).to_pandas()."""
+        return self.query(**filters).to_pandas()
+
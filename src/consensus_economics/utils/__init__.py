@@ -1,11 +1,15 @@
 """Utility modules for Consensus Economics data processing."""
 
+from consensus_economics.utils.atomic_write import AtomicWriteUtils
 from consensus_economics.utils.check_format import CheckFormatUtils
 from consensus_economics.utils.countries import CountriesUtils
 from consensus_economics.utils.date_format import DateFormatUtils
+from consensus_economics.utils.file_hash import FileHashUtils
 
 __all__ = [
+    "AtomicWriteUtils",
     "CheckFormatUtils",
     "CountriesUtils",
     "DateFormatUtils",
+    "FileHashUtils",
 ]
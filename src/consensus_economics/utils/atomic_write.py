@@ -0,0 +1,43 @@
+"""Atomic file replacement for outputs that readers may open at any time."""
+
+import os
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator
+
+
+class AtomicWriteUtils:
+    """Utility class for writing files so readers never see a partial one."""
+
+    @staticmethod
+    @contextmanager
+    def replacing(path: Path) -> Iterator[Path]:
+        """
+        Write to a temporary sibling of path, moved over path on success.
+
+        The temporary file is created by the writer with the usual
+        permissions (unlike tempfile.mkstemp, which forces 0600) and is
+        removed if the block raises.
+
+        Args:
+            path: File to create or replace
+
+        Yields:
+            Temporary path to write to
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f".{path.name}.{uuid.uuid4().hex}.tmp")
+        try:
+            yield tmp
+            os.replace(tmp, path)
+        except BaseException:
+            tmp.unlink(missing_ok=True)
+            raise
+
+    @classmethod
+    def write_bytes(cls, path: Path, data: bytes) -> None:
+        """Atomically replace path with data."""
+        with cls.replacing(path) as tmp:
+            tmp.write_bytes(data)
@@ -0,0 +1,48 @@
+"""Content hashing utilities for input files."""
+
+import hashlib
+from pathlib import Path
+from typing import Dict, Tuple
+
+
+class FileHashUtils:
+    """Utility class for hashing file contents."""
+
+    # (resolved path, size, mtime_ns) -> hex digest; a workbook is hashed once
+    # per process no matter how many sheets are read from it
+    _memo: Dict[Tuple[str, int, int], str] = {}
+
+    @staticmethod
+    def signature(path: Path) -> Tuple[int, int]:
+        """
+        Cheap change detector for a file.
+
+        Args:
+            path: File to stat
+
+        Returns:
+            (size in bytes, modification time in nanoseconds)
+        """
+        stat = Path(path).stat()
+        return stat.st_size, stat.st_mtime_ns
+
+    @classmethod
+    def sha256(cls, path: Path) -> str:
+        """
+        SHA-256 of a file's contents, memoized by size and mtime.
+
+        Args:
+            path: File to hash
+
+        Returns:
+            Hex digest
+        """
+        path = Path(path).resolve()
+        key = (str(path), *cls.signature(path))
+        if key not in cls._memo:
+            digest = hashlib.sha256()
+            with open(path, "rb") as f:
+                for chunk in iter(lambda: f.read(1 << 20), b""):
+                    digest.update(chunk)
+            cls._memo[key] = digest.hexdigest()
+        return cls._memo[key]
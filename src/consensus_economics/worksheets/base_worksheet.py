@@ -1,31 +1,73 @@
 """Base worksheet class for Consensus Economics Excel files."""
 
-from typing import Dict, List, Optional
+from pathlib import Path
+from typing import Iterable, List, Optional, Tuple
 
-from openpyxl import load_workbook
 from openpyxl.workbook import Workbook
 from pandas import DataFrame
 
+from consensus_economics import metrics
 from consensus_economics.paths import Paths
+from consensus_economics.worksheets.sheet_cache import get_sheet_cache
+from consensus_economics.worksheets.workbook_cache import (
+    CacheStats,
+    WorkbookCache,
+    open_workbook,
+)
 
-# Module-level workbook cache to avoid reloading the same file
-_workbook_cache: Dict[str, Workbook] = {}
 
+def _load_workbook(path: Path, read_only: bool) -> Workbook:
+    """Load a workbook on a cache miss, timed as the workbook_load stage."""
+    with metrics.stage("workbook_load", date=path.stem) as event:
+        workbook = open_workbook(path, read_only)
+        event["bytes"] = path.stat().st_size
+    return workbook
 
-def get_cached_workbook(date: str) -> Workbook:
-    """Get a workbook from cache or load it."""
-    if date not in _workbook_cache:
-        filepath = Paths().xlsx / f"{date}.xlsx"
-        _workbook_cache[date] = load_workbook(filepath, data_only=True)
-    return _workbook_cache[date]
+
+# Module-level workbook cache shared by all parsers, so the sheets of one
+# month are read from a single load; bounded by WORKBOOK_CACHE_MAX_ENTRIES
+# and WORKBOOK_CACHE_MAX_BYTES
+_workbook_cache = WorkbookCache(loader=_load_workbook)
+
+
+def get_cached_workbook(date: str, read_only: bool = True) -> Workbook:
+    """Get a workbook from cache or load it.
+
+    Read-only workbooks stream sheet XML on demand instead of building the
+    cell/style object model for all ~26 sheets up front; pass
+    ``read_only=False`` for the full model.
+    """
+    return _workbook_cache.get(date, Paths().xlsx / f"{date}.xlsx", read_only=read_only)
 
 
 def clear_workbook_cache(date: Optional[str] = None) -> None:
     """Clear workbook cache. If date provided, clear only that entry."""
-    if date:
-        _workbook_cache.pop(date, None)
-    else:
-        _workbook_cache.clear()
+    _workbook_cache.clear(date)
+
+
+def workbook_cache_stats() -> CacheStats:
+    """Hit/miss/eviction counters and current usage of the workbook cache."""
+    return _workbook_cache.stats
+
+
+def read_sheet_values(worksheet) -> List[Tuple]:
+    """Materialize a read-only worksheet as rows of values.
+
+    Matches ``Worksheet.values`` on the full model: the dimension tag written
+    in the file is ignored (some writers leave it stale), rows are padded to
+    the widest row, and trailing rows without any cells are dropped.
+    """
+    worksheet.reset_dimensions()
+    rows: List[Tuple] = list(worksheet.iter_rows(values_only=True))
+    while rows and not rows[-1]:
+        rows.pop()
+    width = max((len(row) for row in rows), default=0)
+    return [_pad(row, width) for row in rows]
+
+
+def _pad(row: Iterable, width: int) -> Tuple:
+    row = tuple(row)
+    return row + (None,) * (width - len(row))
 
 
 class BaseWorksheet:
@@ -36,10 +78,16 @@ class BaseWorksheet:
         date: Date in format 'yyyymm'
         sheet_name: Sheet name in the workbook
         workbook: Optional pre-loaded workbook (for batch processing)
+        read_only: Load the workbook in streaming read-only mode (default);
+            falls back to the full model if the sheet cannot be streamed
     """
 
     def __init__(
-        self, date: str, sheet_name: str, workbook: Optional[Workbook] = None
+        self,
+        date: str,
+        sheet_name: str,
+        workbook: Optional[Workbook] = None,
+        read_only: bool = True,
     ) -> None:
         if not isinstance(date, str):
             raise ValueError("Date must be a string")
@@ -53,6 +101,7 @@ class BaseWorksheet:
         self._year = int(date[:4])
         self._month = int(date[4:])
         self._sheet_name = sheet_name.strip()
+        self._read_only = read_only
 
         # Use provided workbook or get from cache
         self._workbook: Optional[Workbook] = workbook
@@ -84,7 +133,7 @@ class BaseWorksheet:
     def workbook(self) -> Workbook:
         """The loaded Excel workbook."""
         if self._workbook is None:
-            self._workbook = get_cached_workbook(self._date)
+            self._workbook = get_cached_workbook(self._date, read_only=self._read_only)
         return self._workbook
 
     @property
@@ -107,6 +156,34 @@ class BaseWorksheet:
         return DataFrame(sheet_names, columns=["Sheet Names"])
 
     def _get_worksheet(self) -> DataFrame:
-        """Return DataFrame of the worksheet's data."""
+        """Return DataFrame of the worksheet's data.
+
+        Unless a workbook was passed in, the raw grid is served from the
+        on-disk sheet cache when this workbook's content was read before.
+        """
+        with metrics.stage("sheet_to_frame", date=self._date, sheet=self.sheet_name) as event:
+            cache = get_sheet_cache() if self._workbook is None else None
+            if cache is None:
+                rows = self._read_rows()
+            else:
+                xlsx_path = Paths().xlsx / f"{self._date}.xlsx"
+                rows = cache.get(xlsx_path, self.sheet_name)
+                event["sheet_cache_hits"] = int(rows is not None)
+                if rows is None:
+                    cache.put_sheet_names(xlsx_path, self.workbook.sheetnames)
+                    rows = self._read_rows()
+                    cache.put(xlsx_path, self.sheet_name, rows)
+            event["rows"] = len(rows)
+            return DataFrame(rows)
+
+    def _read_rows(self) -> List[Tuple]:
+        """Read the worksheet's rows of values from the workbook."""
         worksheet = self.workbook[self.sheet_name]
-        return DataFrame(worksheet.values)
+        if self.workbook.read_only:
+            try:
+                return read_sheet_values(worksheet)
+            except Exception:
+                # Streaming parse failed — retry on the full object model
+                self._workbook = get_cached_workbook(self._date, read_only=False)
+                worksheet = self.workbook[self.sheet_name]
+        return list(worksheet.values)
@@ -1,10 +1,12 @@
 """Country worksheet parser for Consensus Economics data."""
 
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 
+import numpy as np
 import pandas as pd
 from pandas import DataFrame
 
+from consensus_economics import metrics
 from consensus_economics.config import SUMMARY_STATS
 from consensus_economics.utils.date_format import DateFormatUtils
 from consensus_economics.worksheets.base_worksheet import BaseWorksheet
@@ -23,6 +25,10 @@ class CountryWorksheet(BaseWorksheet):
         >>> df = worksheet.forecasters_data
     """
 
+    # Bump whenever a change alters the extracted rows; the extraction
+    # manifest re-extracts every month recorded under an older version
+    PARSER_VERSION = "1"
+
     def __init__(self, date: str, country: str) -> None:
         super().__init__(date, sheet_name=country)
         self._initialize_properties()
@@ -58,8 +64,14 @@ class CountryWorksheet(BaseWorksheet):
     def forecasters_data(self) -> DataFrame:
         """DataFrame containing processed forecaster data."""
         if self._forecasters_data is None:
-            self._forecasters_data = self.get_forecasters_data()
-            self._clean_forecasters_dataframe()
+            keys = {"date": self.date, "sheet": self.sheet_name}
+            with metrics.stage("parse", **keys) as event:
+                self._forecasters_data = self.get_forecasters_data()
+                event["rows"] = len(self._forecasters_data)
+                event["skipped_cells"] = self._skipped_cells
+            with metrics.stage("clean", **keys) as event:
+                self._clean_forecasters_dataframe()
+                event["rows"] = len(self._forecasters_data)
         return self._forecasters_data
 
     @property
@@ -81,6 +93,11 @@ class CountryWorksheet(BaseWorksheet):
         """
         Process and extract forecasters data from the worksheet.
 
+        The summary block (rows 6-13) and the forecaster block (row 25 on) are
+        reshaped to long format with array operations: every variable
+        contributes a current-year and a next-year cell per row, gathered for
+        all variables at once, then NA cells are masked out.
+
         Returns:
             Processed forecaster data
         """
@@ -88,20 +105,9 @@ class CountryWorksheet(BaseWorksheet):
         summary_data = self._worksheet.iloc[6:13].reset_index(drop=True)
         forecasters_data = self._worksheet.iloc[25:].reset_index(drop=True)
 
-        # Find non-empty columns
+        # Keep columns whose first forecaster cell is not blank
         first_row_empty = forecasters_data.iloc[0].astype(str).str.strip() == ""
-        empty_cols = first_row_empty.values
-
-        cols_to_keep = []
-        col_idx = 0
-        while col_idx < len(empty_cols):
-            if not empty_cols[col_idx]:
-                start_idx = col_idx
-                while col_idx < len(empty_cols) and not empty_cols[col_idx]:
-                    col_idx += 1
-                cols_to_keep.extend(range(start_idx, col_idx))
-            else:
-                col_idx += 1
+        cols_to_keep = np.flatnonzero(~np.asarray(first_row_empty, dtype=bool))
 
         summary_data = summary_data.iloc[:, cols_to_keep]
         forecasters_data = forecasters_data.iloc[:, cols_to_keep]
@@ -122,154 +128,197 @@ class CountryWorksheet(BaseWorksheet):
             summary_data.iloc[:, 0].str.strip().isin(SUMMARY_STATS)
         ]
 
-        final_data = []
+        blocks = self._variable_blocks(summary_data)
+        if not blocks:
+            return pd.DataFrame()
+        variables = np.array([current for current, _, _ in blocks], dtype=object)
+        has_next = np.array([nxt is not None for _, nxt, _ in blocks])
+        is_triple = np.array([triple for _, _, triple in blocks])
+
+        # Summary statistics: (variable, row, current/next) cells
+        summary_positions = self._label_positions(summary_data.columns)
+        summary_cells = self._gather_cells(summary_rows, summary_positions, blocks)
+        summary_keep = np.broadcast_to(
+            np.stack([np.ones_like(has_next), has_next & ~is_triple], axis=-1)[:, None, :],
+            summary_cells.shape,
+        )
+        summary_types = np.broadcast_to(
+            summary_rows.iloc[:, 0].str.strip().to_numpy(dtype=object)[None, :, None],
+            summary_cells.shape,
+        ).copy()
+        # Monetary-policy triples only ever yield their "Increase" leg: reading
+        # the other two legs hits an ambiguous duplicate-label selection that
+        # is counted as one skipped cell per non-empty row
+        summary_types[is_triple, :, 0] = "Increase"
+        summary_triple = np.broadcast_to(is_triple[:, None, None], summary_cells.shape)
+
+        # Individual forecasters, for pairs present in the forecaster block
+        forecaster_positions = self._label_positions(forecasters_data.columns)
+        in_forecasters = np.array([
+            not triple
+            and current in forecaster_positions
+            and not forecasters_data.iloc[:, forecaster_positions[current][0]].isna().all()
+            for current, _, triple in blocks
+        ])
+        if in_forecasters.any():
+            valid_forecasters = forecasters_data[
+                forecasters_data.iloc[:, 0].astype(str).str.strip() != ""
+            ]
+        else:
+            valid_forecasters = forecasters_data.iloc[:0]
+        if len(valid_forecasters):
+            for (_, next_col, _), used in zip(blocks, in_forecasters):
+                if used and next_col is not None and next_col not in forecaster_positions:
+                    raise KeyError(next_col)
+        forecaster_cells = self._gather_cells(
+            valid_forecasters, forecaster_positions, blocks, in_forecasters
+        )
+        forecaster_keep = np.broadcast_to(
+            np.stack([in_forecasters, in_forecasters & has_next], axis=-1)[:, None, :],
+            forecaster_cells.shape,
+        )
+        forecaster_names = (
+            valid_forecasters.iloc[:, 0].to_numpy(dtype=object)
+            if len(valid_forecasters) else np.empty(0, dtype=object)
+        )
+        forecaster_types = np.broadcast_to(
+            forecaster_names[None, :, None], forecaster_cells.shape
+        )
+
+        # Variable-major order: each variable's summary rows, then its forecasters
+        n_blocks = len(blocks)
+        years = np.array([self.year, self.year + 1])
+
+        def flat(summary_part, forecaster_part):
+            return np.concatenate(
+                [summary_part.reshape(n_blocks, -1), forecaster_part.reshape(n_blocks, -1)],
+                axis=1,
+            ).ravel()
+
+        cells = flat(summary_cells, forecaster_cells)
+        keep = flat(summary_keep, forecaster_keep)
+        types = flat(summary_types, forecaster_types)
+        triple = flat(summary_triple, np.zeros(forecaster_cells.shape, dtype=bool))
+        cell_variables = flat(
+            np.broadcast_to(variables[:, None, None], summary_cells.shape),
+            np.broadcast_to(variables[:, None, None], forecaster_cells.shape),
+        )
+        cell_years = flat(
+            np.broadcast_to(years, summary_cells.shape),
+            np.broadcast_to(years, forecaster_cells.shape),
+        )
+
+        present = keep.copy()
+        present[keep] = ~self._is_na_array(cells[keep])
+        values, converted = self._to_float_array(cells[present])
+        # A failed conversion is one skipped cell; a triple row is one skipped
+        # cell whether or not its "Increase" leg converted
+        self._skipped_cells += int((~converted | triple[present]).sum())
+
+        rows = np.flatnonzero(present)[converted]
+        if not len(rows):
+            return pd.DataFrame()
+
+        records = zip(
+            types[rows], cell_variables[rows], values[converted], cell_years[rows].tolist()
+        )
+        return pd.DataFrame(list(records), columns=["type", "variable", "value", "year"])
+
+    def _variable_blocks(self, summary_data: DataFrame) -> List[Tuple[str, Optional[str], bool]]:
+        """Walk the header labels into (variable, next label, is_triple) blocks.
 
+        Variables normally span a current-year/next-year column pair; monetary
+        policy probabilities span three columns. Variables whose summary cells
+        are all empty are skipped one column at a time.
+        """
+        columns = list(summary_data.columns)
+        first_position = {}
+        for position, label in enumerate(columns):
+            first_position.setdefault(label, position)
+        empty = summary_data.isna().all(axis=0).to_numpy()
+
+        blocks = []
         i = 1
-        while i < len(summary_data.columns):
-            if self._first_column(summary_data[summary_data.columns[i]]).isna().all():
+        while i < len(columns):
+            current_col = columns[i]
+            if empty[first_position[current_col]]:
                 i += 1
                 continue
 
-            columns = summary_data.columns
-            current_col = columns[i]
             next_col = columns[i + 1] if i + 1 < len(columns) else None
             next_next_col = columns[i + 2] if i + 2 < len(columns) else None
 
             is_triple = current_col == next_col and (
                 (next_col == next_next_col) or (next_next_col == "")
             )
-
-            # Process summary statistics
-            for _, row in summary_rows.iterrows():
-                stat_type = row.iloc[0].strip()
-                current_value = row[current_col]
-                if isinstance(current_value, pd.Series):
-                    current_value = current_value.iloc[0]
-
-                try:
-                    if not is_triple:
-                        if not self._is_na_value(current_value):
-                            value_float = self._to_float(current_value)
-                            final_data.append({
-                                "type": stat_type,
-                                "variable": current_col,
-                                "value": value_float,
-                                "year": self.year,
-                            })
-                    else:
-                        # Process triple case (monetary policy)
-                        if not self._is_na_value(current_value):
-                            next_value = row[next_col]
-                            next_next_value = row[next_next_col] if next_next_col else None
-
-                            values = [
-                                (current_value, "Increase"),
-                                (next_value, "No Change"),
-                                (next_next_value, "Decrease"),
-                            ]
-
-                            for val, type_name in values:
-                                if pd.notna(val) and str(val).strip().lower() != "na":
-                                    value_float = self._to_float(val)
-                                    final_data.append({
-                                        "type": type_name,
-                                        "variable": current_col,
-                                        "value": value_float,
-                                        "year": self.year,
-                                    })
-                except (ValueError, TypeError):
-                    self._skipped_cells += 1
-
-                # Process next year value if exists and not triple
-                if next_col is not None and not is_triple:
-                    next_value = row[next_col]
-                    if isinstance(next_value, pd.Series):
-                        next_value = next_value.iloc[1]
-
-                    try:
-                        if not self._is_na_value(next_value):
-                            value_float = self._to_float(next_value)
-                            final_data.append({
-                                "type": stat_type,
-                                "variable": current_col,
-                                "value": value_float,
-                                "year": self.year + 1,
-                            })
-                    except (ValueError, TypeError):
-                        self._skipped_cells += 1
-
-            # Process forecasters
-            if current_col in forecasters_data.columns and not is_triple:
-                if not self._first_column(forecasters_data[current_col]).isna().all():
-                    valid_forecasters = forecasters_data[
-                        forecasters_data.iloc[:, 0].astype(str).str.strip() != ""
-                    ]
-
-                    for _, row in valid_forecasters.iterrows():
-                        forecaster = row.iloc[0]
-                        current_value = row[current_col]
-                        if isinstance(current_value, pd.Series):
-                            current_value = current_value.iloc[0]
-
-                        try:
-                            if not self._is_na_value(current_value):
-                                value_float = self._to_float(current_value)
-                                final_data.append({
-                                    "type": forecaster,
-                                    "variable": current_col,
-                                    "value": value_float,
-                                    "year": self.year,
-                                })
-                        except (ValueError, TypeError):
-                            self._skipped_cells += 1
-
-                        if next_col is not None:
-                            next_value = row[next_col]
-                            if isinstance(next_value, pd.Series):
-                                next_value = next_value.iloc[1]
-
-                            try:
-                                if not self._is_na_value(next_value):
-                                    value_float = self._to_float(next_value)
-                                    final_data.append({
-                                        "type": forecaster,
-                                        "variable": current_col,
-                                        "value": value_float,
-                                        "year": self.year + 1,
-                                    })
-                            except (ValueError, TypeError):
-                                self._skipped_cells += 1
-
+            blocks.append((current_col, next_col, is_triple))
             i += 3 if is_triple else 2
+        return blocks
 
-        if not final_data:
-            return pd.DataFrame()
+    @staticmethod
+    def _label_positions(columns) -> Dict[str, List[int]]:
+        """Positions of every occurrence of each (possibly duplicated) label."""
+        positions: Dict[str, List[int]] = {}
+        for position, label in enumerate(columns):
+            positions.setdefault(label, []).append(position)
+        return positions
+
+    @staticmethod
+    def _gather_cells(
+        data: DataFrame,
+        positions: Dict[str, List[int]],
+        blocks: List[Tuple[str, Optional[str], bool]],
+        used: Optional[np.ndarray] = None,
+    ) -> np.ndarray:
+        """Cells as a (variable, row, current/next) object array.
+
+        The current-year cell is the first column carrying the variable's
+        label, the next-year cell the second column carrying the next label
+        (its only column when that label is unique).
+        """
+        current, following = [], []
+        for b, (current_col, next_col, _) in enumerate(blocks):
+            if used is not None and not used[b]:
+                current.append(0)
+                following.append(0)
+                continue
+            current.append(positions[current_col][0])
+            next_positions = positions.get(next_col, [0])
+            following.append(next_positions[1] if len(next_positions) > 1 else next_positions[0])
 
-        return pd.DataFrame(final_data)
+        values = data.to_numpy(dtype=object)
+        if not values.shape[1]:
+            return np.empty((len(blocks), len(data), 2), dtype=object)
+        return np.stack([values[:, current], values[:, following]], axis=-1).transpose(1, 0, 2)
 
     @staticmethod
-    def _to_float(value) -> float:
-        return float(value) if isinstance(value, str) else value
+    def _is_na_array(values: np.ndarray) -> np.ndarray:
+        """Cells that are missing, empty or "NA" (any case, surrounding spaces ignored)."""
+        na = pd.isna(values)
+        strings = np.fromiter(
+            (isinstance(v, str) for v in values), dtype=bool, count=len(values)
+        )
+        if strings.any():
+            stripped = np.char.lower(np.char.strip(values[strings].astype(str)))
+            na[strings] = (stripped == "na") | (stripped == "")
+        return na
 
     @staticmethod
-    def _first_column(data):
-        """First column of a duplicate-label selection; identity for a Series.
+    def _to_float_array(values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Convert string cells to float, leaving other cells as they are.
 
-        df[col] returns a DataFrame when the label is duplicated (the usual
-        current-year/next-year column pairs) but a Series when a sheet has a
-        variable with a single year column.
+        Returns:
+            (values, mask of cells that are numeric after conversion)
         """
-        return data.iloc[:, 0] if isinstance(data, pd.DataFrame) else data
-
-    @staticmethod
-    def _is_na_value(value) -> bool:
-        """Check if a value represents NA/empty."""
-        if pd.isna(value):
-            return True
-        if isinstance(value, str):
-            stripped = value.strip().lower()
-            return stripped == "na" or stripped == ""
-        return False
+        values = values.copy()
+        converted = np.ones(len(values), dtype=bool)
+        for i, value in enumerate(values):
+            if isinstance(value, str):
+                try:
+                    values[i] = float(value)
+                except ValueError:
+                    converted[i] = False
+        return values, converted
 
     def _clean_forecasters_dataframe(self) -> None:
         """Clean and transform the forecasters dataframe with additional metadata."""
@@ -2,9 +2,11 @@
 
 from typing import Optional
 
+import numpy as np
 import pandas as pd
 from pandas import DataFrame
 
+from consensus_economics import metrics
 from consensus_economics.config import CURRENCY_CODES
 from consensus_economics.utils.date_format import DateFormatUtils
 from consensus_economics.worksheets.base_worksheet import BaseWorksheet
@@ -13,6 +15,9 @@ from consensus_economics.worksheets.base_worksheet import BaseWorksheet
 class ForexWorksheet(BaseWorksheet):
     """Handles the processing of forex worksheet data."""
 
+    # Bump whenever a change alters the extracted rows (see CountryWorksheet)
+    PARSER_VERSION = "1"
+
     def __init__(self, date: str) -> None:
         super().__init__(date, sheet_name="Forex")
         self._initialize_properties()
@@ -35,7 +40,9 @@ class ForexWorksheet(BaseWorksheet):
     def forecasters_data(self) -> DataFrame:
         """DataFrame containing processed forecaster data."""
         if self._forecasters_data is None:
-            self._forecasters_data = self.get_forecasters_data()
+            with metrics.stage("parse", date=self.date, sheet=self.sheet_name) as event:
+                self._forecasters_data = self.get_forecasters_data()
+                event["rows"] = len(self._forecasters_data)
         return self._forecasters_data
 
     @property
@@ -77,40 +84,55 @@ class ForexWorksheet(BaseWorksheet):
         return result
 
     def _process_section(self, df: DataFrame, reference: str) -> DataFrame:
-        """Process a section (USD or EUR) of the forex data."""
-        # Skip the header rows for data processing
-        data = df.iloc[2:].copy()
+        """Process a section (USD or EUR) of the forex data.
+
+        The section is converted to numbers once and the three horizon
+        columns are melted to one row per (currency, horizon).
+        """
+        # Skip the header rows and rows without a currency name
+        data = df.iloc[2:]
+        data = data[data[0].notna().to_numpy()]
 
         # Clean currency names and map to codes
-        data = data.dropna(subset=[0])
-        currencies = data[0].str.strip()
-        currency_codes = currencies.map(CURRENCY_CODES)
-
-        records = []
-
-        # Current values are in column index 3
-        current_values = pd.to_numeric(data[3], errors="coerce")
-
-        # Process each currency
-        for idx, (currency, current_value) in enumerate(zip(currency_codes, current_values)):
-            if pd.isna(currency):
-                continue
-
-            # Process each forecast horizon
-            # Columns are: [currency, ..., current(3), 3m(4), ..., 12m(6), ..., 24m(8)]
-            for col_idx, horizon in [(3, 3), (5, 12), (7, 24)]:
-                try:
-                    forecasted_value = pd.to_numeric(data.iloc[idx, col_idx])
-
-                    if not pd.isna(forecasted_value) and not pd.isna(current_value):
-                        records.append({
-                            "currency": currency,
-                            "reference": reference,
-                            "current_value": current_value,
-                            "forecasted_value": forecasted_value,
-                            "horizon": horizon,
-                        })
-                except (ValueError, IndexError):
-                    pass
-
-        return pd.DataFrame(records)
+        currencies = data[0].str.strip().to_numpy(dtype=object)
+        currency_codes = np.array(
+            [CURRENCY_CODES.get(name) if isinstance(name, str) else None for name in currencies],
+            dtype=object,
+        )
+
+        # Columns are: [currency, ..., current(3), 3m(4), ..., 12m(6), ..., 24m(8)];
+        # current values sit under label 3, horizons at positions 3, 5 and 7
+        values = data.to_numpy(dtype=object)
+        current_values = pd.to_numeric(data[3], errors="coerce").to_numpy()
+        forecasts = values[:, [3, 5, 7]]
+        numeric = pd.to_numeric(
+            pd.Series(forecasts.ravel()), errors="coerce"
+        ).to_numpy(dtype=float).reshape(forecasts.shape)
+
+        keep = (
+            pd.notna(currency_codes)[:, None]
+            & ~np.isnan(current_values.astype(float))[:, None]
+            & ~np.isnan(numeric)
+        )
+        if not keep.any():
+            return pd.DataFrame()
+
+        # Kept cells keep their stored type so integer cells stay integers;
+        # only numeric strings need parsing
+        rows, cols = np.nonzero(keep)
+        forecasted = [
+            pd.to_numeric(value) if isinstance(value, str) else value
+            for value in forecasts[rows, cols]
+        ]
+        horizons = np.array([3, 12, 24])
+        records = zip(
+            currency_codes[rows],
+            [reference] * len(rows),
+            current_values[rows].tolist(),
+            forecasted,
+            horizons[cols].tolist(),
+        )
+        return pd.DataFrame(
+            list(records),
+            columns=["currency", "reference", "current_value", "forecasted_value", "horizon"],
+        )
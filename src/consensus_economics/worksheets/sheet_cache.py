@@ -0,0 +1,281 @@
+"""Persistent on-disk cache of raw sheet values.
+
+Each sheet's cell grid is stored as an Arrow IPC (Feather) file keyed by the
+workbook's content hash and the sheet name, so re-running a parser over an
+unchanged corpus never re-reads the xlsx files. Entries are immutable: a
+re-downloaded workbook hashes differently and simply gets new entries; the
+old ones age out through the size budget or `prune-sheet-cache --stale`.
+
+Layout:
+    data/cache/sheets/v1/<sha256>/sheets.json        # sheet names in the workbook
+    data/cache/sheets/v1/<sha256>/<sheet>.arrow      # sparse cell grid
+"""
+
+import json
+import os
+import shutil
+from datetime import date, datetime, time, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+from urllib.parse import quote
+
+import numpy as np
+import openpyxl
+import pyarrow as pa
+from pyarrow import feather
+
+from consensus_economics.config import SHEET_CACHE_ENABLED, SHEET_CACHE_MAX_BYTES
+from consensus_economics.paths import Paths
+from consensus_economics.utils.atomic_write import AtomicWriteUtils
+from consensus_economics.utils.file_hash import FileHashUtils
+
+# Bump when the stored grid or the values it holds change meaning
+CACHE_FORMAT = "v1"
+
+# One nullable column per Python cell type; each stored cell fills exactly one.
+# bool precedes int and datetime precedes date because of subclassing.
+VALUE_COLUMNS: List[Tuple[str, type, pa.DataType]] = [
+    ("boolean", bool, pa.bool_()),
+    ("integer", int, pa.int64()),
+    ("number", float, pa.float64()),
+    ("text", str, pa.string()),
+    ("timestamp", datetime, pa.timestamp("us")),
+    ("date", date, pa.date32()),
+    ("time", time, pa.time64("us")),
+    ("duration", timedelta, pa.duration("us")),
+]
+
+
+def encode_grid(rows: Sequence[Tuple]) -> pa.Table:
+    """Encode rows of cell values as a sparse table of non-empty cells.
+
+    Raises:
+        TypeError: If a cell holds a type the cache cannot store
+    """
+    positions: List[Tuple[int, int]] = []
+    columns: Dict[str, list] = {name: [] for name, _, _ in VALUE_COLUMNS}
+    n_cols = 0
+    for r, row in enumerate(rows):
+        n_cols = max(n_cols, len(row))
+        for c, value in enumerate(row):
+            if value is None:
+                continue
+            for name, kind, _ in VALUE_COLUMNS:
+                if isinstance(value, kind):
+                    break
+            else:
+                raise TypeError(f"Cannot cache cell of type {type(value).__name__}")
+            positions.append((r, c))
+            for other in columns:
+                columns[other].append(value if other == name else None)
+
+    coords = np.array(positions, dtype=np.int32).reshape(-1, 2)
+    arrays = {
+        "row": pa.array(coords[:, 0]),
+        "col": pa.array(coords[:, 1]),
+        **{name: pa.array(columns[name], type=arrow_type) for name, _, arrow_type in VALUE_COLUMNS},
+    }
+    metadata = {
+        "n_rows": str(len(rows)),
+        "n_cols": str(n_cols),
+        "openpyxl": openpyxl.__version__,
+    }
+    return pa.table(arrays).replace_schema_metadata(metadata)
+
+
+def decode_grid(table: pa.Table) -> List[List]:
+    """Rebuild the rows encoded by encode_grid (empty cells become None)."""
+    metadata = table.schema.metadata
+    n_rows, n_cols = int(metadata[b"n_rows"]), int(metadata[b"n_cols"])
+    grid = np.full((n_rows, n_cols), None, dtype=object)
+
+    rows = table["row"].to_numpy()
+    cols = table["col"].to_numpy()
+    for name, _, _ in VALUE_COLUMNS:
+        column = table[name]
+        if column.null_count == len(column):
+            continue
+        valid = column.is_valid().to_numpy(zero_copy_only=False)
+        values = np.empty(int(valid.sum()), dtype=object)
+        values[:] = column.drop_null().to_pylist()
+        grid[rows[valid], cols[valid]] = values
+    return grid.tolist()
+
+
+class SheetCache:
+    """
+    Content-addressed cache of raw sheet grids under a size budget.
+
+    Reads touch an entry's mtime, which serves as the LRU clock when the
+    budget is enforced.
+
+    Args:
+        root: Cache directory (e.g. data/cache/sheets)
+        max_bytes: Size budget; least recently used entries are evicted
+            once it is exceeded. None disables the limit.
+    """
+
+    def __init__(self, root: Path, max_bytes: Optional[int] = SHEET_CACHE_MAX_BYTES) -> None:
+        self._root = Path(root)
+        self._max_bytes = max_bytes
+        self._size: Optional[int] = None
+
+    @property
+    def root(self) -> Path:
+        """Directory holding this cache format's entries."""
+        return self._root / CACHE_FORMAT
+
+    def _entry_dir(self, xlsx_path: Path) -> Path:
+        return self.root / FileHashUtils.sha256(xlsx_path)
+
+    @staticmethod
+    def _sheet_file(entry_dir: Path, sheet_name: str) -> Path:
+        return entry_dir / f"{quote(sheet_name, safe='')}.arrow"
+
+    def sheet_names(self, xlsx_path: Path) -> Optional[List[str]]:
+        """Sheet names recorded for a workbook, or None if never recorded."""
+        path = self._entry_dir(xlsx_path) / "sheets.json"
+        try:
+            return json.loads(path.read_text())
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def put_sheet_names(self, xlsx_path: Path, sheet_names: Sequence[str]) -> None:
+        """Record the sheet names of a workbook."""
+        entry_dir = self._entry_dir(xlsx_path)
+        if not (entry_dir / "sheets.json").exists():
+            self._write(entry_dir / "sheets.json", json.dumps(list(sheet_names)).encode())
+
+    def get(self, xlsx_path: Path, sheet_name: str) -> Optional[List[List]]:
+        """
+        Cached rows of a sheet.
+
+        Returns:
+            Rows of cell values, or None on a miss
+
+        Raises:
+            KeyError: If the workbook is known not to contain the sheet
+        """
+        names = self.sheet_names(xlsx_path)
+        if names is not None and sheet_name not in names:
+            raise KeyError(f"Worksheet {sheet_name} does not exist.")
+
+        path = self._sheet_file(self._entry_dir(xlsx_path), sheet_name)
+        try:
+            table = feather.read_table(path, memory_map=False)
+        except (FileNotFoundError, pa.ArrowInvalid):
+            return None
+        if table.schema.metadata.get(b"openpyxl") != openpyxl.__version__.encode():
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return decode_grid(table)
+
+    def put(self, xlsx_path: Path, sheet_name: str, rows: Sequence[Tuple]) -> None:
+        """Store a sheet's rows; cells of unsupported types leave it uncached."""
+        try:
+            table = encode_grid(rows)
+        except (TypeError, pa.ArrowException):
+            return
+        sink = pa.BufferOutputStream()
+        feather.write_feather(table, sink, compression="lz4")
+        path = self._sheet_file(self._entry_dir(xlsx_path), sheet_name)
+        self._write(path, sink.getvalue().to_pybytes())
+
+    def _write(self, path: Path, data: bytes) -> None:
+        """Atomically write a file, then enforce the size budget."""
+        AtomicWriteUtils.write_bytes(path, data)
+
+        if self._max_bytes is None:
+            return
+        if self._size is None:
+            self._size = self.size()
+        else:
+            self._size += len(data)
+        if self._size > self._max_bytes:
+            self.prune(self._max_bytes)
+
+    def _files(self) -> List[Path]:
+        if not self.root.exists():
+            return []
+        return [p for p in self.root.glob("*/*") if p.is_file()]
+
+    def size(self) -> int:
+        """Total bytes currently stored."""
+        total = 0
+        for path in self._files():
+            try:
+                total += path.stat().st_size
+            except FileNotFoundError:
+                pass
+        return total
+
+    def prune(self, max_bytes: int) -> int:
+        """
+        Evict least recently used sheet files until the cache fits max_bytes.
+
+        Returns:
+            Number of bytes removed
+        """
+        entries = []
+        for path in self._files():
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime_ns, stat.st_size, path))
+        entries.sort()
+
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, path in entries:
+            if total - removed <= max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            removed += size
+        self._remove_empty_entries()
+        self._size = total - removed
+        return removed
+
+    def prune_stale(self, live_hashes: Set[str]) -> int:
+        """
+        Remove entries for workbooks whose content hash is not in live_hashes.
+
+        Returns:
+            Number of bytes removed
+        """
+        removed = 0
+        if self.root.exists():
+            for entry_dir in self.root.iterdir():
+                if entry_dir.is_dir() and entry_dir.name not in live_hashes:
+                    removed += sum(p.stat().st_size for p in entry_dir.iterdir())
+                    shutil.rmtree(entry_dir, ignore_errors=True)
+        self._size = None
+        return removed
+
+    def clear(self) -> None:
+        """Remove every entry, including other cache formats."""
+        shutil.rmtree(self._root, ignore_errors=True)
+        self._size = None
+
+    def _remove_empty_entries(self) -> None:
+        if not self.root.exists():
+            return
+        for entry_dir in self.root.iterdir():
+            if entry_dir.is_dir() and not any(entry_dir.iterdir()):
+                shutil.rmtree(entry_dir, ignore_errors=True)
+
+
+_caches: Dict[Path, SheetCache] = {}
+
+
+def get_sheet_cache() -> Optional[SheetCache]:
+    """The sheet cache under the current data directory, or None if disabled."""
+    if not SHEET_CACHE_ENABLED:
+        return None
+    root = Paths().cache / "sheets"
+    if root not in _caches:
+        _caches[root] = SheetCache(root)
+    return _caches[root]
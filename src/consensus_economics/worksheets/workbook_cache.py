@@ -0,0 +1,175 @@
+"""Bounded, thread-safe LRU cache of loaded openpyxl workbooks.
+
+Workbooks are expensive to load and are shared by every sheet parser for
+the same survey month, but holding one per month indefinitely exhausts
+memory when many dates are read in one session. The cache keeps the most
+recently used workbooks within an entry count and an estimated byte budget.
+"""
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Hashable, List, Optional, Tuple
+
+from openpyxl import load_workbook
+from openpyxl.workbook import Workbook
+
+from consensus_economics.config import (
+    WORKBOOK_CACHE_MAX_BYTES,
+    WORKBOOK_CACHE_MAX_ENTRIES,
+)
+
+# Approximate resident size of a loaded workbook per byte of xlsx file
+# (measured with tracemalloc on country workbooks); streaming read-only
+# workbooks hold little more than the shared strings table
+READ_ONLY_SIZE_FACTOR = 10
+FULL_MODEL_SIZE_FACTOR = 50
+
+
+def estimate_workbook_bytes(path: Path, read_only: bool) -> int:
+    """Estimated memory held by a workbook loaded from path."""
+    factor = READ_ONLY_SIZE_FACTOR if read_only else FULL_MODEL_SIZE_FACTOR
+    return path.stat().st_size * factor
+
+
+def open_workbook(path: Path, read_only: bool) -> Workbook:
+    """Load a workbook with cached formula values rather than formulas."""
+    return load_workbook(path, read_only=read_only, data_only=True)
+
+
+@dataclass
+class CacheStats:
+    """Counters for a WorkbookCache."""
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    entries: int = 0
+    bytes: int = 0
+
+
+class WorkbookCache:
+    """
+    LRU cache of workbooks keyed by (date, read_only).
+
+    Loading happens outside the lock, so threads opening different months do
+    not serialize on each other. Workbooks leaving the cache, evicted or
+    cleared, are closed, which releases a read-only workbook's open zip
+    archive; the workbook just loaded is never evicted.
+
+    Args:
+        max_entries: Maximum number of workbooks held; None for no limit
+        max_bytes: Budget for the estimated size of the held workbooks;
+            None for no limit. The most recent workbook is always kept,
+            even if it alone exceeds the budget.
+        loader: Function (path, read_only) -> Workbook
+    """
+
+    def __init__(
+        self,
+        max_entries: Optional[int] = WORKBOOK_CACHE_MAX_ENTRIES,
+        max_bytes: Optional[int] = WORKBOOK_CACHE_MAX_BYTES,
+        loader: Callable[[Path, bool], Workbook] = open_workbook,
+    ) -> None:
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._loader = loader
+        self._entries: "OrderedDict[Tuple[Hashable, bool], Tuple[Workbook, int]]" = OrderedDict()
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._lock = threading.RLock()
+
+    def get(self, key: Hashable, path: Path, read_only: bool = True) -> Workbook:
+        """
+        Workbook cached under (key, read_only), loading it from path on a miss.
+
+        Args:
+            key: Identifier of the workbook (e.g. the yyyymm date)
+            path: xlsx file to load on a miss
+            read_only: Load in streaming read-only mode
+
+        Returns:
+            The cached or newly loaded workbook
+        """
+        cache_key = (key, read_only)
+        with self._lock:
+            entry = self._entries.get(cache_key)
+            if entry is not None:
+                self._entries.move_to_end(cache_key)
+                self._hits += 1
+                return entry[0]
+            self._misses += 1
+
+        workbook = self._loader(path, read_only)
+        size = estimate_workbook_bytes(path, read_only)
+
+        with self._lock:
+            entry = self._entries.get(cache_key)
+            if entry is not None:
+                # Another thread loaded it meanwhile; share its copy
+                self._entries.move_to_end(cache_key)
+                evicted = [workbook]
+                workbook = entry[0]
+            else:
+                self._entries[cache_key] = (workbook, size)
+                self._bytes += size
+                evicted = self._evict()
+
+        for stale in evicted:
+            stale.close()
+        return workbook
+
+    def _evict(self) -> List[Workbook]:
+        """Drop least recently used entries until within both limits.
+
+        Returns:
+            The dropped workbooks, for the caller to close outside the lock
+        """
+        evicted = []
+        while len(self._entries) > 1 and (
+            (self.max_entries is not None and len(self._entries) > self.max_entries)
+            or (self.max_bytes is not None and self._bytes > self.max_bytes)
+        ):
+            _, (workbook, size) = self._entries.popitem(last=False)
+            self._bytes -= size
+            self._evictions += 1
+            evicted.append(workbook)
+        return evicted
+
+    def clear(self, key: Optional[Hashable] = None) -> None:
+        """Remove and close cached workbooks; only those for key if given."""
+        with self._lock:
+            keys = [k for k in self._entries if key is None or k[0] == key]
+            removed = [self._entries.pop(k) for k in keys]
+            self._bytes -= sum(size for _, size in removed)
+
+        for workbook, _ in removed:
+            workbook.close()
+
+    def __contains__(self, key: Tuple[Hashable, bool]) -> bool:
+        with self._lock:
+            return key in self._entries
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    @property
+    def stats(self) -> CacheStats:
+        """Snapshot of the hit/miss/eviction counters and current usage."""
+        with self._lock:
+            return CacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                entries=len(self._entries),
+                bytes=self._bytes,
+            )
+
+    def reset_stats(self) -> None:
+        """Zero the hit/miss/eviction counters."""
+        with self._lock:
+            self._hits = self._misses = self._evictions = 0
@@ -0,0 +1,85 @@
+"""Tests for the workbook loader behind BaseWorksheet."""
+
+import re
+import zipfile
+
+import pytest
+from openpyxl import Workbook
+
+from consensus_economics.worksheets import sheet_cache
+from consensus_economics.worksheets.base_worksheet import (
+    BaseWorksheet,
+    clear_workbook_cache,
+    get_cached_workbook,
+)
+
+DATE = "202409"
+
+
+@pytest.fixture
+def xlsx_dir(tmp_path, monkeypatch):
+    """A data/xlsx folder that Paths() resolves to, with one small workbook.
+
+    The sheet cache is off so every read goes through the loader under test.
+    """
+    folder = tmp_path / "data" / "xlsx"
+    folder.mkdir(parents=True)
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(sheet_cache, "SHEET_CACHE_ENABLED", False)
+
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "USA"
+    ws.cell(1, 1, "USA")
+    ws.cell(4, 1, "September 9, 2024")
+    ws.cell(7, 1, "Consensus (Mean)")
+    ws.cell(7, 2, 2.5)
+    ws.cell(7, 3, "na")
+    ws.cell(12, 6, 1.25)  # leaves a gap of empty rows and a ragged width
+    ws.merge_cells("B2:C2")
+    wb.create_sheet("Forex").cell(1, 1, "Forex")
+    wb.save(folder / f"{DATE}.xlsx")
+
+    yield folder
+    clear_workbook_cache()
+
+
+def _sheet(read_only: bool):
+    return BaseWorksheet(DATE, "USA", read_only=read_only).worksheet
+
+
+def test_read_only_matches_full_model(xlsx_dir):
+    streamed = _sheet(read_only=True)
+    full = _sheet(read_only=False)
+    assert streamed.shape == full.shape
+    assert streamed.equals(full)
+
+
+def test_read_only_ignores_stale_dimension(xlsx_dir):
+    """A wrong <dimension> tag must not truncate the streamed sheet."""
+    path = xlsx_dir / f"{DATE}.xlsx"
+    patched = xlsx_dir / "patched.xlsx"
+    with zipfile.ZipFile(path) as src, zipfile.ZipFile(patched, "w") as dst:
+        for item in src.infolist():
+            data = src.read(item.filename)
+            if item.filename == "xl/worksheets/sheet1.xml":
+                data, n = re.subn(rb'<dimension ref="[^"]*"', b'<dimension ref="A1"', data)
+                assert n == 1
+            dst.writestr(item, data)
+    patched.replace(path)
+
+    assert _sheet(read_only=True).equals(_sheet(read_only=False))
+
+
+def test_missing_sheet_raises_key_error(xlsx_dir):
+    with pytest.raises(KeyError):
+        BaseWorksheet(DATE, "Atlantis").worksheet
+
+
+def test_clear_cache_closes_both_modes(xlsx_dir):
+    streamed = get_cached_workbook(DATE)
+    full = get_cached_workbook(DATE, read_only=False)
+    assert streamed.read_only and not full.read_only
+
+    clear_workbook_cache(DATE)
+    assert get_cached_workbook(DATE) is not streamed
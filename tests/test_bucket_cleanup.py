@@ -0,0 +1,51 @@
+"""Cleanup of duplicated bucket keys, against moto's in-process S3."""
+
+import pytest
+
+pytest.importorskip("moto")
+
+from consensus_economics.aws import cleanup  # noqa: E402
+from mains.storage import save_to_bucket  # noqa: E402
+from tests.test_bucket_sync import BUCKET, bucket  # noqa: E402, F401
+
+
+def test_plan_indexes_keys():
+    plan = cleanup.plan_cleanup([
+        "pdf/202409.pdf",
+        "2024/forex/202409.csv",
+        "2024/forex/202409 2.csv",
+        "2024/forex/202409 3.csv",
+        "2024/forex/202410 2.csv",
+        "2024/forex/202411 2 3.csv",
+    ])
+
+    assert [(r.source, r.target, r.replaces, r.superseded) for r in plan.renames] == [
+        ("2024/forex/202409 3.csv", "2024/forex/202409.csv", True, ("2024/forex/202409 2.csv",)),
+        ("2024/forex/202410 2.csv", "2024/forex/202410.csv", False, ()),
+        ("2024/forex/202411 2 3.csv", "2024/forex/202411.csv", False, ()),
+    ]
+    assert len(plan.removed) == 4 and plan.keys == 6
+    assert "2024/forex/202409 2.csv (removed, superseded)" in plan.report()
+
+
+def test_duplicates_are_copied_server_side_and_removed_in_batches(
+    bucket, monkeypatch, capsys  # noqa: F811
+):
+    put = bucket.s3_client.put_object
+    put(Bucket=BUCKET, Key="2024/forex/202409.csv", Body=b"old")
+    put(Bucket=BUCKET, Key="2024/forex/202409 2.csv", Body=b"new", Metadata={"year": "2024"})
+    for month in range(1, 6):
+        put(Bucket=BUCKET, Key=f"pdf/20240{month} 2.pdf", Body=b"%PDF")
+    monkeypatch.setattr(cleanup, "DELETE_BATCH", 2)
+
+    save_to_bucket.clean_bucket(bucket, dry_run=True)
+    assert "2024/forex/202409 2.csv -> 2024/forex/202409.csv (replaces)" in capsys.readouterr().out
+    assert len(bucket.get_contents()) == 7
+
+    save_to_bucket.clean_bucket(bucket, workers=3)
+
+    assert sorted(item["Key"] for item in bucket.get_contents()) == [
+        "2024/forex/202409.csv", *(f"pdf/20240{month}.pdf" for month in range(1, 6)),
+    ]
+    assert bucket.get_content("2024/forex/202409.csv").read() == b"new"
+    assert bucket.get_metadata("2024/forex/202409.csv") == {"year": "2024"}
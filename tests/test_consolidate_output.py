@@ -0,0 +1,112 @@
+"""Tests for incremental consolidation of the per-month outputs."""
+
+import argparse
+import os
+
+import pandas as pd
+import pyarrow.parquet as pq
+import pytest
+
+from mains.getters import consolidate_output
+
+
+def write_month(output, date, values, unit="%"):
+    path = output / date[:4] / "forecasters" / f"{date}.csv"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    pd.DataFrame({
+        "country": ["USA"] * len(values),
+        "variable": ["GDP"] * len(values),
+        "source": [f"Bank {i}" for i in range(len(values))],
+        "statistic": ["forecast"] * len(values),
+        "year": [int(date[:4])] * len(values),
+        "value": values,
+        "unit": [unit] * len(values),
+        "release_date": [f"{date}09"] * len(values),
+    }).to_csv(path, index=False)
+    return path
+
+
+def run_steps(**flags):
+    """consolidate-output --kind forecasters --incremental, plus flags."""
+    args = argparse.Namespace(
+        kind="forecasters", source="csv", incremental=True,
+        compression=consolidate_output.DEFAULT_COMPRESSION, compression_level=None,
+        fixed_horizon=False, revisions=False, concepts=False, cube=False,
+    )
+    vars(args).update(flags)
+    consolidate_output.run_steps(args)
+
+
+def read_outputs(output):
+    df = pd.read_parquet(output / "forecasters.parquet")
+    for col in consolidate_output.CATEGORICAL_COLUMNS["forecasters"]:
+        df[col] = df[col].astype(str)
+    return df, (output / "variables.csv").read_text()
+
+
+@pytest.fixture
+def output(tmp_path, monkeypatch):
+    output = tmp_path / "data" / "output"
+    output.mkdir(parents=True)
+    monkeypatch.chdir(tmp_path)
+    write_month(output, "202401", [1.0, 2.0])
+    write_month(output, "202402", [3.0])
+    write_month(output, "202403", [4.0, 5.0])
+    consolidate_output.consolidate("forecasters")
+    return output
+
+
+def test_incremental_matches_full_rebuild(output):
+    write_month(output, "202404", [6.0])  # new month
+    changed = write_month(output, "202402", [3.5, 3.6], unit="real, %")
+    os.utime(changed, ns=(0, 10**18))
+    (output / "2024" / "forecasters" / "202403.csv").unlink()
+
+    consolidate_output.consolidate_incremental("forecasters")
+    incremental = read_outputs(output)
+    consolidate_output.consolidate("forecasters")
+    full = read_outputs(output)
+
+    pd.testing.assert_frame_equal(incremental[0], full[0])
+    assert incremental[1] == full[1]
+    assert incremental[0]["survey_date"].dt.strftime("%Y%m").unique().tolist() == [
+        "202401", "202402", "202404",
+    ]
+
+
+def test_incremental_without_changes_leaves_file(output):
+    target = output / "forecasters.parquet"
+    before = target.stat().st_mtime_ns
+    consolidate_output.consolidate_incremental("forecasters")
+    assert target.stat().st_mtime_ns == before
+
+
+def test_csv_read_into_declared_schema(tmp_path):
+    path = write_month(tmp_path, "202405", [1.0, 2.0])
+    path.write_text(path.read_text().replace("20240509\n", "20241399\n", 1))
+
+    table = consolidate_output.read_csv_table(path, "forecasters")
+    assert table.schema == consolidate_output.consolidated_schema("forecasters")
+    assert table["release_date"].null_count == 1
+    assert table["survey_date"].to_pylist()[0].strftime("%Y%m") == "202405"
+
+
+def test_rows_clustered_by_series(output, monkeypatch):
+    germany = write_month(output, "202402", [3.0, 3.5])
+    germany.write_text(germany.read_text().replace("USA", "Germany"))
+    monkeypatch.setattr(consolidate_output, "ROW_GROUP_ROWS", 2)
+    consolidate_output.consolidate("forecasters", compression="snappy")
+
+    parquet = pq.ParquetFile(output / "forecasters.parquet")
+    groups = [
+        parquet.read_row_group(i, columns=["country", "survey_date", "value"]).to_pydict()
+        for i in range(parquet.num_row_groups)
+    ]
+    # Germany first, and a row group never mixes countries
+    assert [group["country"] for group in groups] == [
+        ["Germany", "Germany"], ["USA", "USA"], ["USA", "USA"],
+    ]
+    assert [v for group in groups for v in group["value"]] == [3.0, 3.5, 1.0, 2.0, 4.0, 5.0]
+    column = parquet.metadata.row_group(1).column(0)
+    assert column.compression == "SNAPPY"
+    assert column.statistics.min == column.statistics.max == "USA"
@@ -0,0 +1,62 @@
+"""Tests for the CountryWorksheet long-format reshape on an in-memory sheet."""
+
+import pandas as pd
+import pytest
+
+from consensus_economics.worksheets.country_worksheet import CountryWorksheet
+
+
+class InMemoryCountryWorksheet(CountryWorksheet):
+    """CountryWorksheet over a prepared grid instead of an xlsx file."""
+
+    def __init__(self, frame: pd.DataFrame) -> None:
+        self._frame = frame
+        super().__init__("202409", "USA")
+
+    def _get_worksheet(self) -> pd.DataFrame:
+        return self._frame
+
+
+@pytest.fixture
+def worksheet():
+    grid = [[None] * 6 for _ in range(28)]
+    grid[1][1:6] = ["Gross Domestic", None, "Policy Rate", None, None]
+    grid[2][1] = "Product"
+    grid[3][0] = "September 9, 2024"
+    grid[4][1:3] = ["real, % change", "real, % change"]
+    grid[6][0:6] = ["Consensus (Mean)", 2.5, "1.75", 40.0, 55.0, 5.0]
+    grid[7][0:6] = ["High", " na ", 3.0, "n/a", None, None]
+    grid[8][0:3] = ["Not a statistic", 9.9, 9.9]
+    grid[25][0:3] = ["Goldman Sachs", 2.4, "x"]
+    grid[26][0:3] = ["Acme Bank", "", 1.5]
+    return InMemoryCountryWorksheet(pd.DataFrame(grid))
+
+
+def test_long_format_rows(worksheet):
+    df = worksheet.forecasters_data
+    gdp = df[df["variable"] == "Gross Domestic Product"]
+
+    assert list(zip(gdp["source"], gdp["statistic"], gdp["year"], gdp["value"])) == [
+        ("Consensus", "mean", 2024, 2.5),
+        ("Consensus", "mean", 2025, 1.75),
+        ("Consensus", "high", 2025, 3.0),
+        ("Acme Bank", "forecast", 2025, 1.5),
+        ("Goldman Sachs", "forecast", 2024, 2.4),
+    ]
+    assert (gdp["unit"] == "real, % change").all()
+    assert worksheet.release_date == "20240909"
+
+
+def test_monetary_policy_triple_keeps_increase_leg(worksheet):
+    df = worksheet.forecasters_data
+    policy = df[df["variable"] == "Policy Rate"]
+
+    assert list(zip(policy["source"], policy["year"], policy["value"])) == [
+        ("Increase", 2024, 40.0),
+    ]
+
+
+def test_skipped_cells_counted(worksheet):
+    worksheet.forecasters_data
+    # "x" for Goldman Sachs, plus one per non-empty triple row
+    assert worksheet.skipped_cells == 3
@@ -0,0 +1,74 @@
+"""Tests for the memory-mapped consensus cube."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from consensus_economics import cube
+from consensus_economics.cube import ConsensusCube
+
+
+def concepts_panel() -> pd.DataFrame:
+    rows = []
+    for month in [1, 2, 4]:  # no March issue
+        for country, concept in [("Japan", "GDP"), ("Japan", "CPI"), ("Italy", "GDP")]:
+            for year in [2024, 2025, 2026]:
+                for statistic in ["mean", "count"]:
+                    rows.append({
+                        "country": country,
+                        "concept_id": concept,
+                        "source": "Consensus",
+                        "statistic": statistic,
+                        "year": year,
+                        "value": month + (year - 2024) / 10 if statistic == "mean" else 20.0,
+                        "survey_date": pd.Timestamp(2024, month, 1),
+                    })
+    rows.append({**rows[0], "source": "Bank A", "statistic": "forecast", "value": -1.0})
+    rows.append({**rows[0], "concept_id": None, "value": -1.0})
+    return pd.DataFrame(rows)
+
+
+@pytest.fixture
+def cube_dir(tmp_path):
+    planes, labels = cube.build_cube(concepts_panel(), statistics=["mean", "count"])
+    cube.write_cube(tmp_path / "cube", planes, labels)
+    return tmp_path / "cube"
+
+
+def test_labels_and_values(cube_dir):
+    consensus = ConsensusCube(cube_dir)
+    assert consensus.statistics == ["mean", "count"]
+    months = [str(month) for month in consensus.months]
+    assert months == ["2024-01", "2024-02", "2024-03", "2024-04"]
+    assert consensus.countries.tolist() == ["Italy", "Japan"]
+    assert consensus.concepts.tolist() == ["CPI", "GDP"]
+    assert consensus.shape == (4, 2, 2, 2)
+
+    frame = consensus.frame("Japan", "GDP")
+    assert frame.loc["2024-04"].tolist() == [4.0, 4.1]
+    assert frame.loc["2024-03"].isna().all()
+    assert np.isnan(consensus.sel(country="Italy", concept="CPI")).all()
+    assert (consensus.sel("count", offset=1, start="2024-04") == 20).sum() == 3
+
+
+def test_views_share_the_memory_map(cube_dir):
+    consensus = ConsensusCube(cube_dir)
+    plane = consensus.plane("mean")
+    assert isinstance(plane, np.memmap)
+    view = consensus.sel(country="Japan", start="2024-02", end="2024-02")
+    assert np.shares_memory(view, plane)
+    assert not view.flags.writeable
+    with pytest.raises(KeyError):
+        consensus.sel(country="France")
+    with pytest.raises(KeyError):
+        consensus.plane("std_dev")
+
+
+def test_rebuild_drops_old_planes_and_rejects_mismatch(cube_dir):
+    planes, labels = cube.build_cube(concepts_panel(), statistics=["mean"])
+    cube.write_cube(cube_dir, planes, labels)
+    assert sorted(path.name for path in cube_dir.glob("*.npy")) == ["mean.npy"]
+
+    np.save(cube_dir / "mean.npy", np.zeros((1, 1, 1, 1)))
+    with pytest.raises(ValueError):
+        ConsensusCube(cube_dir).plane("mean")
@@ -0,0 +1,55 @@
+"""Tests for the partitioned Parquet dataset of per-month outputs."""
+
+import pandas as pd
+import pytest
+
+from consensus_economics import dataset
+from consensus_economics.schema import FOREX_SCHEMA
+
+
+@pytest.fixture
+def output_dir(tmp_path, monkeypatch):
+    (tmp_path / "data" / "output").mkdir(parents=True)
+    monkeypatch.chdir(tmp_path)
+    return tmp_path / "data" / "output"
+
+
+def forex_month(release_date: str) -> pd.DataFrame:
+    return pd.DataFrame({
+        "currency": ["CAD", "JPY"],
+        "reference": ["USD", "USD"],
+        "year": [2024, 2024],
+        "horizon": [3, 12],
+        "current_value": [1.35, 140.0],
+        "forecasted_value": [1.30, 135.5],
+        "release_date": [release_date, release_date],
+    })
+
+
+def test_month_written_with_fixed_schema(output_dir):
+    path = dataset.write_month(forex_month("20240909"), "forex", "202409")
+    assert path == (
+        output_dir / "dataset" / "kind=forex" / "survey_year=2024"
+        / "survey_date=2024-09-01" / "part-0.parquet"
+    )
+    assert dataset.to_table(forex_month("20240909"), "forex").schema == FOREX_SCHEMA
+
+
+def test_read_back_with_partition_columns(output_dir):
+    dataset.write_month(forex_month("20240909"), "forex", "202409")
+    dataset.write_month(forex_month(""), "forex", "202410")
+
+    df = dataset.open_dataset("forex").to_table().to_pandas()
+    assert df["survey_date"].dt.strftime("%Y%m").unique().tolist() == ["202409", "202410"]
+    assert (df["survey_year"] == 2024).all()
+    assert df["currency"].dtype == "category"
+    # Unparseable release dates become nulls rather than failing the month
+    assert df["release_date"].isna().tolist() == [False, False, True, True]
+
+
+def test_remove_month(output_dir):
+    dataset.write_month(forex_month("20240909"), "forex", "202409")
+    dataset.remove_month("forex", "202409")
+    assert dataset.month_files("forex") == []
+    with pytest.raises(FileNotFoundError):
+        dataset.open_dataset("forex")
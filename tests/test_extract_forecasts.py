@@ -0,0 +1,123 @@
+"""Tests for the extraction CLI on generated workbooks."""
+
+import shutil
+
+import pytest
+
+from benchmarks import synthetic
+from consensus_economics.manifest import ExtractionManifest
+from consensus_economics.worksheets import sheet_cache
+from consensus_economics.worksheets.base_worksheet import clear_workbook_cache
+from consensus_economics.worksheets.country_worksheet import CountryWorksheet
+from mains.getters import extract_forecasts, get_forex_forecasts
+
+DATE = "202409"
+COUNTRIES = synthetic.country_names(3)
+
+
+@pytest.fixture
+def workbook(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(sheet_cache, "SHEET_CACHE_ENABLED", False)
+    path = synthetic.write_workbook(
+        tmp_path / "data" / "xlsx" / f"{DATE}.xlsx", DATE, countries=3, forecasters=4
+    )
+    yield path
+    clear_workbook_cache()
+
+
+def test_parsed_month_is_recorded(workbook, tmp_path):
+    manifest = ExtractionManifest(tmp_path / "manifest.json")
+    rows = extract_forecasts.extract_forecasters(DATE, COUNTRIES, manifest)
+
+    assert rows > 0
+    assert manifest.entry(DATE, "forecasters")["rows"] == rows
+
+
+def test_failed_country_leaves_month_pending(workbook, tmp_path, monkeypatch):
+    parse = CountryWorksheet.forecasters_data.fget
+
+    def failing(self):
+        if self.sheet_name == "Japan":
+            raise ValueError("unreadable sheet")
+        return parse(self)
+
+    monkeypatch.setattr(CountryWorksheet, "forecasters_data", property(failing))
+    manifest = ExtractionManifest(tmp_path / "manifest.json")
+    rows = extract_forecasts.extract_forecasters(DATE, COUNTRIES, manifest)
+
+    # The other countries are still written, but the month is retried next run
+    assert rows > 0 and extract_forecasts.output_file(DATE, "forecasters").exists()
+    assert manifest.entry(DATE, "forecasters") is None
+    assert not extract_forecasts.is_up_to_date(DATE, "forecasters", manifest, COUNTRIES)
+
+
+def test_unreadable_workbook_keeps_existing_output(workbook, tmp_path, monkeypatch):
+    manifest = ExtractionManifest(tmp_path / "manifest.json")
+    extract_forecasts.extract_forecasters(DATE, COUNTRIES, manifest)
+    output = extract_forecasts.output_file(DATE, "forecasters")
+    extracted = output.read_text()
+
+    def unreadable(date, country):
+        raise ValueError("File is not a zip file")
+
+    monkeypatch.setattr(extract_forecasts, "process_country", unreadable)
+    manifest = ExtractionManifest(tmp_path / "other.json")
+    assert extract_forecasts.extract_forecasters(DATE, COUNTRIES, manifest) == 0
+    assert output.read_text() == extracted
+    assert manifest.entry(DATE, "forecasters") is None
+
+
+def test_empty_month_is_recorded(workbook, tmp_path):
+    manifest = ExtractionManifest(tmp_path / "manifest.json")
+    assert extract_forecasts.extract_forecasters(DATE, ["Country 99"], manifest) == 0
+    assert manifest.entry(DATE, "forecasters")["rows"] == 0
+    # Not parsed again on the next run, though no output was written
+    assert extract_forecasts.is_up_to_date(DATE, "forecasters", manifest, ["Country 99"])
+
+
+def extracted(root):
+    """Every output CSV under root, and the manifest without timestamps."""
+    outputs = {
+        path.relative_to(root).as_posix(): path.read_text()
+        for path in sorted(root.glob("*/*/*.csv"))
+    }
+    manifest = ExtractionManifest.load(root / "manifest.json")
+    entries = {
+        (date, kind): {
+            key: value for key, value in manifest.entry(date, kind).items()
+            if key not in ("extracted_at", "xlsx_mtime_ns")
+        }
+        for date in ("202401", "202402", "202403") for kind in extract_forecasts.KINDS
+    }
+    return outputs, entries
+
+
+def test_parallel_run_matches_serial(tmp_path, monkeypatch):
+    monkeypatch.setattr(sheet_cache, "SHEET_CACHE_ENABLED", False)
+    xlsx = tmp_path / "xlsx"
+    synthetic.generate(xlsx, ["202401", "202402", "202403"], countries=3, forecasters=4)
+    results = []
+    for workers in (1, 2):
+        root = tmp_path / f"workers{workers}"
+        shutil.copytree(xlsx, root / "data" / "xlsx")
+        monkeypatch.chdir(root)
+        extract_forecasts.run([2024], countries=COUNTRIES, workers=workers)
+        clear_workbook_cache()
+        results.append(extracted(root / "data" / "output"))
+
+    (serial, serial_manifest), (parallel, parallel_manifest) = results
+    assert len(serial) == 6 and parallel == serial
+    assert parallel_manifest == serial_manifest
+
+
+def test_forex_years_report_files_found(tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+    synthetic.generate(tmp_path / "data" / "xlsx", ["202401", "202403"], countries=1)
+
+    assert get_forex_forecasts.available_dates(2023) == []
+    assert get_forex_forecasts.available_dates(2024) == ["202401", "202403"]
+    assert capsys.readouterr().out.splitlines() == [
+        "No xlsx files found for year 2023",
+        "Processing forex data for year 2024 (2 files found)",
+    ]
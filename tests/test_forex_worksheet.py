@@ -0,0 +1,38 @@
+"""Tests for the ForexWorksheet section reshape on an in-memory sheet."""
+
+import pandas as pd
+
+from consensus_economics.worksheets.forex_worksheet import ForexWorksheet
+
+
+class InMemoryForexWorksheet(ForexWorksheet):
+    """ForexWorksheet over a prepared grid instead of an xlsx file."""
+
+    def __init__(self, frame: pd.DataFrame) -> None:
+        self._frame = frame
+        super().__init__("202409")
+
+    def _get_worksheet(self) -> pd.DataFrame:
+        return self._frame
+
+
+def test_sections_melt_to_currency_horizon_rows():
+    grid = [[None] * 11 for _ in range(26)]
+    grid[3][0] = "September 9, 2024"
+    # USD section data starts at row 10, EUR section at row 21
+    grid[10][0], grid[10][3:11] = " Canadian Dollar", [1.35, None, 1.34, None, 1.3, None, "-", None]
+    grid[11][0], grid[11][3:11] = "Unknown Currency", [1.0, None, 1.0, None, 1.0, None, 1.0, None]
+    grid[12][0], grid[12][3:11] = "Japanese Yen", ["n/a", None, 140, None, 130, None, 120, None]
+    grid[21][0], grid[21][3:11] = "Swiss Franc", [0.95, None, "0.96", None, 0.97, None, 0.98, None]
+
+    df = InMemoryForexWorksheet(pd.DataFrame(grid)).forecasters_data
+
+    assert list(zip(df["currency"], df["reference"], df["horizon"], df["forecasted_value"])) == [
+        ("CAD", "USD", 3, 1.34),
+        ("CAD", "USD", 12, 1.3),
+        ("CHF", "EUR", 3, 0.96),
+        ("CHF", "EUR", 12, 0.97),
+        ("CHF", "EUR", 24, 0.98),
+    ]
+    assert (df["year"] == 2024).all()
+    assert (df["release_date"] == "20240909").all()
@@ -0,0 +1,92 @@
+"""Tests for the fixed-event to fixed-horizon conversion."""
+
+import os
+
+import pandas as pd
+import pytest
+
+from consensus_economics import horizons
+from mains.getters import consolidate_output
+from tests.test_consolidate_output import run_steps, write_month
+
+
+def panel_rows():
+    rows = []
+    for month, current, following in [(1, 2.0, 3.0), (4, 1.2, 2.4), (12, 1.0, 2.2)]:
+        for year, value in [(2024, current), (2025, following), (2026, 9.9)]:
+            rows.append({
+                "country": "Japan", "variable": "GDP", "source": "Bank A",
+                "statistic": "forecast", "year": year, "value": value, "unit": "%",
+                "survey_date": pd.Timestamp(2024, month, 1),
+            })
+    # No next-year forecast in this month: dropped
+    rows.append({**rows[0], "source": "Bank B"})
+    return pd.DataFrame(rows)
+
+
+def test_month_weighted_average():
+    result = horizons.fixed_horizon(panel_rows())
+    assert result["survey_date"].dt.month.tolist() == [1, 4, 12]
+    assert result["weight"].tolist() == pytest.approx([1.0, 0.75, 1 / 12])
+    expected = [2.0, 0.75 * 1.2 + 0.25 * 2.4, 1.0 / 12 + 2.2 * 11 / 12]
+    assert result["value"].tolist() == pytest.approx(expected)
+    assert result["next_year"].tolist() == [3.0, 2.4, 2.2]
+
+
+def test_first_row_wins_within_month():
+    df = panel_rows()
+    duplicate = df.iloc[[0]].assign(value=7.0)
+    result = horizons.fixed_horizon(pd.concat([df, duplicate], ignore_index=True))
+    assert result["current_year"].iloc[0] == 2.0
+
+
+def write_two_years(output, date, current, following):
+    path = write_month(output, date, [current, following])
+    df = pd.read_csv(path)
+    df["year"] = [int(date[:4]), int(date[:4]) + 1]
+    df["source"] = "Bank 0"
+    df.to_csv(path, index=False)
+    return path
+
+
+def test_incremental_matches_full(tmp_path, monkeypatch):
+    output = tmp_path / "data" / "output"
+    output.mkdir(parents=True)
+    monkeypatch.chdir(tmp_path)
+    write_two_years(output, "202401", 1.0, 2.0)
+    write_two_years(output, "202402", 1.5, 2.5)
+    consolidate_output.consolidate("forecasters")
+    horizons.update_fixed_horizon()
+
+    write_two_years(output, "202403", 1.8, 2.6)
+    changed = write_two_years(output, "202402", 1.6, 2.6)
+    os.utime(changed, ns=(0, 10**18))
+    replaced = consolidate_output.consolidate_incremental("forecasters")
+    assert replaced == {"202402", "202403"}
+    horizons.update_fixed_horizon(replaced)
+    incremental = pd.read_parquet(horizons.fixed_horizon_path())
+
+    horizons.update_fixed_horizon()
+    full = pd.read_parquet(horizons.fixed_horizon_path())
+    pd.testing.assert_frame_equal(incremental, full)
+    assert full["current_year"].tolist() == [1.0, 1.6, 1.8]
+
+
+def test_months_consolidated_without_the_flag_are_added(tmp_path, monkeypatch, capsys):
+    output = tmp_path / "data" / "output"
+    output.mkdir(parents=True)
+    monkeypatch.chdir(tmp_path)
+    write_two_years(output, "202401", 1.0, 2.0)
+    write_two_years(output, "202402", 1.5, 2.5)
+    run_steps(fixed_horizon=True)
+    write_two_years(output, "202403", 1.8, 2.6)
+    run_steps()
+    capsys.readouterr()
+
+    run_steps(fixed_horizon=True)
+    assert "fixed horizon: 3 rows" in capsys.readouterr().out
+    result = pd.read_parquet(horizons.fixed_horizon_path())
+    assert result["survey_date"].dt.strftime("%Y%m").tolist() == ["202401", "202402", "202403"]
+
+    run_steps(fixed_horizon=True)
+    assert "fixed horizon: up to date" in capsys.readouterr().out
@@ -0,0 +1,83 @@
+"""Tests for the extraction manifest's change detection."""
+
+import os
+
+import pytest
+
+from consensus_economics.manifest import ExtractionManifest
+
+DATE = "202409"
+
+
+@pytest.fixture
+def files(tmp_path):
+    xlsx = tmp_path / f"{DATE}.xlsx"
+    xlsx.write_bytes(b"workbook v1")
+    output = tmp_path / f"{DATE}.csv"
+    output.write_text("rows")
+    return xlsx, output
+
+
+@pytest.fixture
+def manifest(tmp_path, files):
+    xlsx, _ = files
+    manifest = ExtractionManifest(tmp_path / "manifest.json")
+    manifest.record(DATE, "forex", xlsx, "1", rows=10)
+    return manifest
+
+
+def test_unrecorded_month_is_not_current(tmp_path, files):
+    xlsx, output = files
+    manifest = ExtractionManifest(tmp_path / "m.json")
+    assert not manifest.is_current(DATE, "forex", xlsx, "1", [output])
+
+
+def test_recorded_month_is_current_after_reload(tmp_path, files, manifest):
+    xlsx, output = files
+    manifest.save()
+    loaded = ExtractionManifest.load(tmp_path / "manifest.json")
+    assert loaded.is_current(DATE, "forex", xlsx, "1", [output])
+    assert not loaded.is_current(DATE, "forecasters", xlsx, "1", [output])
+
+
+def test_touched_but_unchanged_workbook_is_current(files, manifest):
+    xlsx, output = files
+    stat = xlsx.stat()
+    os.utime(xlsx, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+    assert manifest.is_current(DATE, "forex", xlsx, "1", [output])
+    assert manifest.entry(DATE, "forex")["xlsx_mtime_ns"] == stat.st_mtime_ns + 10**9
+
+
+@pytest.mark.parametrize("change", ["content", "parser", "options", "output"])
+def test_changes_invalidate_entry(files, manifest, change):
+    xlsx, output = files
+    version, options = "1", ""
+    if change == "content":
+        xlsx.write_bytes(b"workbook v2, corrected")
+    elif change == "parser":
+        version = "2"
+    elif change == "options":
+        options = "other countries"
+    else:
+        output.unlink()
+
+    assert not manifest.is_current(DATE, "forex", xlsx, version, [output], options)
+
+
+def test_formats_not_written_from_the_workbook_are_not_current(tmp_path, files, manifest):
+    xlsx, output = files
+    parquet = tmp_path / "part-0.parquet"
+    parquet.write_bytes(b"rows")
+    assert not manifest.is_current(DATE, "forex", xlsx, "1", [parquet], formats=["parquet"])
+
+    # Formats written from the same workbook add up
+    manifest.record(DATE, "forex", xlsx, "1", rows=10, formats=["parquet"])
+    both = ["csv", "parquet"]
+    assert manifest.is_current(DATE, "forex", xlsx, "1", [output, parquet], formats=both)
+
+    # A parquet-only run on a changed workbook leaves the old csv behind
+    xlsx.write_bytes(b"workbook v2, corrected")
+    manifest.record(DATE, "forex", xlsx, "1", rows=12, formats=["parquet"])
+    assert manifest.is_current(DATE, "forex", xlsx, "1", [parquet], formats=["parquet"])
+    assert not manifest.is_current(DATE, "forex", xlsx, "1", [output])
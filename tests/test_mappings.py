@@ -0,0 +1,148 @@
+"""Tests for resolving observations against the variable concept map."""
+
+import pandas as pd
+
+from consensus_economics import mappings
+from consensus_economics.mappings import MAP_COLUMNS, load_variable_index
+from consensus_economics.mappings.index import VariableMapIndex
+
+
+def _map(rows):
+    mapping = pd.DataFrame(
+        rows, columns=["country", "raw_variable", "valid_from", "valid_to", "concept_id"]
+    )
+    for col in ("valid_from", "valid_to"):
+        mapping[col] = pd.to_datetime(mapping[col])
+    return mapping
+
+
+MAPPING = VariableMapIndex(_map([
+    ("Japan", "GDP", "2000-01-01", "2010-12-01", "GDP_OLD"),
+    ("Japan", "GDP", "2011-01-01", None, "GDP_NEW"),
+    ("Japan", "CPI", "2005-01-01", "2008-12-01", "CPI"),
+    ("Italy", "GDP", "1990-01-01", None, "GDP_IT"),
+]))
+
+
+def _resolve(rows):
+    panel = pd.DataFrame(rows, columns=["country", "variable", "survey_date"])
+    position, covered = MAPPING.lookup(
+        panel["country"], panel["variable"], pd.to_datetime(panel["survey_date"])
+    )
+    return MAPPING.column("concept_id", position).tolist(), covered.tolist()
+
+
+def test_picks_range_in_force():
+    concepts, covered = _resolve([
+        ("Japan", "GDP", "2005-06-01"),
+        ("Japan", "GDP", "2011-01-01"),
+        ("Japan", "GDP", "2030-01-01"),
+        ("Italy", "GDP", "2020-01-01"),
+    ])
+    assert concepts == ["GDP_OLD", "GDP_NEW", "GDP_NEW", "GDP_IT"]
+    assert covered == [True, True, True, True]
+
+
+def test_dates_outside_ranges_use_nearest_entry():
+    concepts, covered = _resolve([
+        ("Japan", "GDP", "1995-01-01"),  # before the first range
+        ("Japan", "CPI", "2012-01-01"),  # after a closed range
+    ])
+    assert concepts == ["GDP_OLD", "CPI"]
+    assert covered == [False, False]
+
+
+def test_unknown_labels_unresolved():
+    concepts, covered = _resolve([
+        ("Japan", "Unemployment", "2005-01-01"),
+        ("France", "GDP", "2005-01-01"),
+    ])
+    assert concepts == [None, None]
+    assert covered == [False, False]
+
+
+def test_categorical_inputs_and_empty_map():
+    panel = pd.DataFrame({
+        "country": pd.Categorical(["Italy", "Spain"]),
+        "variable": pd.Categorical(["GDP", "GDP"]),
+        "survey_date": pd.to_datetime(["2020-01-01", "2020-01-01"]),
+    })
+    position, _ = MAPPING.lookup(panel["country"], panel["variable"], panel["survey_date"])
+    assert position.tolist() == [3, -1]
+
+    empty = VariableMapIndex(MAPPING.frame.iloc[:0])
+    position, covered = empty.lookup(panel["country"], panel["variable"], panel["survey_date"])
+    assert position.tolist() == [-1, -1]
+    assert not covered.any()
+
+
+def test_contains():
+    known = MAPPING.contains(
+        pd.Series(["Japan", "Japan", "Italy", "Italy"]),
+        pd.Series(["CPI", "Unemployment", "GDP", "CPI"]),
+    )
+    assert known.tolist() == [True, False, True, False]
+
+
+def test_overlaps():
+    assert MAPPING.overlaps().empty
+    overlapping = VariableMapIndex(_map([
+        ("Japan", "GDP", "2000-01-01", "2010-12-01", "A"),
+        ("Japan", "GDP", "2010-06-01", None, "B"),
+        ("Italy", "GDP", "2011-01-01", None, "C"),
+    ]))
+    assert overlapping.overlaps()["concept_id"].tolist() == ["B"]
+
+
+def test_index_cached_by_content_hash(tmp_path, monkeypatch):
+    (tmp_path / "data").mkdir()
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(mappings, "_index_memo", {})
+    csv = tmp_path / "variable_map.csv"
+    rows = pd.DataFrame([["Japan", "GDP", "2000-01-01", "", "GDP"]], columns=MAP_COLUMNS[:5])
+    rows.reindex(columns=MAP_COLUMNS, fill_value="").to_csv(csv, index=False)
+
+    index = load_variable_index(csv)
+    cached = list((tmp_path / "data" / "cache" / "variable_map").glob("*.arrow"))
+    assert len(cached) == 1
+    assert load_variable_index(csv) is index
+
+    # A fresh process reads the compiled index instead of the CSV
+    load_csv = mappings.load_variable_map
+    monkeypatch.setattr(mappings, "_index_memo", {})
+    monkeypatch.setattr(mappings, "load_variable_map", None)
+    assert load_variable_index(csv).column("concept_id", [0]).tolist() == ["GDP"]
+
+    # Editing the map replaces the cached index
+    monkeypatch.setattr(mappings, "load_variable_map", load_csv)
+    rows["concept_id"] = "GDP_REAL"
+    rows.reindex(columns=MAP_COLUMNS, fill_value="").to_csv(csv, index=False)
+    assert load_variable_index(csv).column("concept_id", [0]).tolist() == ["GDP_REAL"]
+    remaining = list(cached[0].parent.glob("*.arrow"))
+    assert len(remaining) == 1 and remaining != cached
+
+
+def test_build_variable_map_appends_only_new_pairs(tmp_path, monkeypatch):
+    from mains.mappings import build_variable_map
+
+    (tmp_path / "data" / "output").mkdir(parents=True)
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(mappings, "_index_memo", {})
+    map_path = tmp_path / "variable_map.csv"
+    monkeypatch.setattr(build_variable_map, "MAP_PATH", map_path)
+    monkeypatch.setattr("sys.argv", ["build-variable-map"])
+    pd.DataFrame({
+        "country": ["Japan", "Japan"],
+        "variable": ["GDP", "CPI"],
+        "first_survey": ["2000-01-01", "2000-01-01"],
+        "last_survey": ["2020-01-01", "2020-01-01"],
+    }).to_csv(tmp_path / "data" / "output" / "variables.csv", index=False)
+    existing = pd.DataFrame([["Japan", "GDP", "1990-01-01", "", "GDP_REVIEWED"]],
+                            columns=MAP_COLUMNS[:5])
+    existing.reindex(columns=MAP_COLUMNS, fill_value="").to_csv(map_path, index=False)
+
+    build_variable_map.main()
+
+    result = pd.read_csv(map_path, dtype=str)
+    assert result["concept_id"].tolist() == ["CPI", "GDP_REVIEWED"]
+    assert result["mapping_status"].fillna("").tolist() == ["new", ""]
@@ -0,0 +1,63 @@
+"""Tests for per-stage run metrics."""
+
+import json
+
+import pytest
+
+from benchmarks import synthetic
+from consensus_economics import metrics
+from consensus_economics.manifest import ExtractionManifest
+from consensus_economics.worksheets import sheet_cache
+from mains.getters import extract_forecasts
+
+
+def test_stages_append_json_lines(tmp_path):
+    path = tmp_path / "metrics.jsonl"
+    run = metrics.RunMetrics(path, "extract-forecasts")
+    with metrics.activated(run):
+        with metrics.stage("parse", date="202409", sheet="USA") as event:
+            event["rows"] = 861
+        with pytest.raises(KeyError):
+            with metrics.stage("sheet_to_frame", date="202409", sheet="Narnia"):
+                raise KeyError("Narnia")
+    run.close()
+
+    records = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [record["stage"] for record in records] == ["parse", "sheet_to_frame", "run"]
+    assert {record["run"] for record in records} == {run.run_id}
+    assert records[0]["rows"] == 861 and records[0]["sheet"] == "USA"
+    assert records[1]["error"] == "KeyError"
+    assert records[2]["command"] == "extract-forecasts"
+    assert "parse" in run.summary() and "errors 1" in run.summary()
+
+
+def test_disabled_metrics_record_nothing():
+    assert not metrics.enabled()
+    with metrics.stage("parse", date="202409") as event:
+        event["rows"] = 1
+    assert "rows" not in event
+    metrics.record("write", 0.1, rows=1)
+
+
+def test_extraction_reports_each_stage(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(sheet_cache, "SHEET_CACHE_ENABLED", False)
+    synthetic.write_workbook(
+        tmp_path / "data" / "xlsx" / "202409.xlsx", "202409", countries=2, forecasters=3
+    )
+    run = metrics.RunMetrics()
+    with metrics.activated(run):
+        extract_forecasts.process_date(
+            "202409", synthetic.country_names(2), manifest=ExtractionManifest()
+        )
+
+    stages = {}
+    for record in run.records:
+        stages.setdefault(record["stage"], []).append(record)
+    assert len(stages["workbook_load"]) == 1
+    assert {record["sheet"] for record in stages["parse"]} == {"USA", "Japan", "Forex"}
+    assert len(stages["clean"]) == 2
+    written = {record["kind"]: record for record in stages["write"]}
+    assert written["forex"]["rows"] == 39
+    assert written["forecasters"]["bytes"] > 0
+    assert stages["month"][0]["workbook_cache_hits"] == 2
@@ -0,0 +1,90 @@
+"""Tests for the --profile stage profiler."""
+
+import pstats
+import tracemalloc
+
+import pytest
+
+from benchmarks import synthetic
+from consensus_economics import metrics, profiling
+from consensus_economics.worksheets import sheet_cache
+from consensus_economics.worksheets.base_worksheet import clear_workbook_cache
+from consensus_economics.worksheets.country_worksheet import CountryWorksheet
+
+
+def busy(n: int) -> int:
+    return sum(i * i for i in range(n))
+
+
+def test_selected_stages_and_months_are_profiled(tmp_path):
+    inner = metrics.RunMetrics()
+    profiler = profiling.StageProfiler(
+        tmp_path, ["month", "write"], months=["202409"], inner=inner
+    )
+    with metrics.activated(profiler):
+        for date in ("202408", "202409"):
+            with metrics.stage("month", date=date):
+                busy(500_000)
+                # Nested in the profiled month: runs, but is not profiled itself
+                with metrics.stage("write", date=date, kind="forex") as event:
+                    event["rows"] = 39
+    written = profiler.close()
+
+    assert {path.name for path in written} == {"month.pstats", "month.txt", "month.collapsed"}
+    assert profiler.unprofiled == {"write"}
+    assert (tmp_path / "month.txt").read_text().startswith("month: 1 profiled run(s)")
+    stats = pstats.Stats(str(tmp_path / "month.pstats"))
+    assert any(function == "busy" for _, _, function in stats.stats)
+    stacks = (tmp_path / "month.collapsed").read_text().splitlines()
+    assert stacks
+    for line in stacks:
+        stack, count = line.rsplit(" ", 1)
+        assert "test_profiling.py:" in stack and int(count) > 0
+    # Every stage still reaches the inner metrics
+    assert [record["stage"] for record in inner.records] == ["write", "month"] * 2
+    assert inner.records[0]["rows"] == 39
+
+
+def test_memory_report_names_parser_lines(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(sheet_cache, "SHEET_CACHE_ENABLED", False)
+    synthetic.write_workbook(
+        tmp_path / "data" / "xlsx" / "202409.xlsx", "202409", countries=1, forecasters=5
+    )
+    profiler = profiling.StageProfiler(tmp_path / "profiles", ["month"], memory=True)
+    try:
+        with metrics.activated(profiler):
+            with metrics.stage("month", date="202409"):
+                CountryWorksheet("202409", "USA").forecasters_data
+    finally:
+        clear_workbook_cache()
+    profiler.close()
+
+    report = (tmp_path / "profiles" / "month.memory.txt").read_text().splitlines()
+    assert report[0].startswith("month: peak allocated") and "(202409)" in report[0]
+    sites = report[2:]
+    assert sites and all(
+        "country_worksheet.py:" in site or "base_worksheet.py:" in site for site in sites
+    )
+    assert not any("metrics.stage" in site for site in sites)
+
+
+
+def allocate() -> list:
+    return [bytearray(64) for _ in range(100)]
+
+
+@pytest.mark.parametrize("raw", [True, False])
+def test_live_traces_report_innermost_frame(monkeypatch, raw):
+    monkeypatch.setattr(profiling, "RAW_TRACES", raw)
+    tracemalloc.start(5)
+    try:
+        blocks = allocate()
+        traces = list(profiling._live_traces())
+    finally:
+        tracemalloc.stop()
+
+    site = (__file__, allocate.__code__.co_firstlineno + 1)
+    sizes = [size for _, size, frames in traces if frames[0] == site]
+    assert len(sizes) >= len(blocks) and sum(sizes) >= 64 * len(blocks)
+    assert len({key for key, _, frames in traces if frames[0] == site}) < len(sizes)
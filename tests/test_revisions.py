@@ -0,0 +1,147 @@
+"""Tests for month-on-month forecast revisions."""
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+from consensus_economics import revisions
+from consensus_economics.schema import consolidated_schema
+from mains.getters import consolidate_output
+from tests.test_consolidate_output import run_steps, write_month
+
+
+def observation(month, value, source="Bank A", year=2025, variable="GDP"):
+    return {
+        "country": "Japan", "variable": variable, "source": source,
+        "statistic": "forecast", "year": year, "value": value, "unit": "%",
+        "release_date": pd.Timestamp(2024, month, 10),
+        "survey_date": pd.Timestamp(2024, month, 1),
+    }
+
+
+def write_panel(path, rows):
+    schema = consolidated_schema("forecasters")
+    table = pa.Table.from_pandas(pd.DataFrame(rows), schema=schema, preserve_index=False)
+    pq.write_table(table, path)
+
+
+def read(path):
+    df = pd.read_parquet(path)
+    for col in revisions.SERIES_KEYS[:4]:
+        df[col] = df[col].astype(str)
+    return df
+
+
+def test_flags_entries_exits_and_gaps(tmp_path):
+    panel, target = tmp_path / "forecasters.parquet", tmp_path / "revisions.parquet"
+    write_panel(panel, [
+        observation(1, 1.0), observation(2, 1.5), observation(4, 1.2),  # missing in March
+        observation(1, 2.0, source="Bank B"), observation(2, 2.0, source="Bank B"),
+        observation(3, 9.0, source="Bank C"), observation(2, 7.0, source="Bank C"),
+        observation(3, 8.0, source="Bank C"),  # repeated in a month: the first row counts
+    ])
+    revisions.update_revisions(panel=panel, target=target)
+    df = read(target)
+    assert df["survey_date"].is_monotonic_increasing
+
+    bank_a = df[df["source"] == "Bank A"]
+    assert bank_a["entry"].tolist() == [True, False, False]
+    assert bank_a["gap"].tolist() == [False, False, True]
+    assert bank_a["exit"].tolist() == [False, True, False]  # the latest month never exits
+    assert bank_a["revision"].iloc[1] == pytest.approx(0.5)
+    assert np.isnan(bank_a["revision"].iloc[[0, 2]]).all()
+    assert bank_a["previous_value"].iloc[2] == 1.5
+    assert bank_a["previous_survey_date"].iloc[2] == pd.Timestamp(2024, 2, 1)
+
+    assert df[df["source"] == "Bank B"]["exit"].tolist() == [False, True]
+    bank_c = df[df["source"] == "Bank C"]
+    assert bank_c["value"].tolist() == [7.0, 9.0]
+    assert bank_c["revision"].iloc[1] == pytest.approx(2.0)
+
+
+def random_panel(rng, months, sources=("A", "B", "C", "D")):
+    rows = []
+    for month in months:
+        for source in sources:
+            for year in [2024, 2025]:
+                if rng.random() < 0.7:
+                    rows.append(observation(month, float(rng.integers(0, 50)) / 10, source, year))
+    return rows
+
+
+@pytest.mark.parametrize("seed", range(6))
+@pytest.mark.parametrize("sources", [("A", "B", "C", "D"), ("A", None)])
+def test_incremental_matches_full(tmp_path, seed, sources):
+    # A None source is a series of its own (an unnamed forecaster row)
+    rng = np.random.default_rng(seed)
+    panel, target = tmp_path / "forecasters.parquet", tmp_path / "revisions.parquet"
+    rows = random_panel(rng, [1, 2, 3, 5, 6, 7, 8], sources)
+    write_panel(panel, rows)
+    revisions.update_revisions(panel=panel, target=target)
+
+    by_month = {}
+    for row in rows:
+        by_month.setdefault(row["survey_date"].month, []).append(row)
+    by_month[9] = random_panel(rng, [9], sources)  # appended
+    by_month[4] = random_panel(rng, [4], sources)  # filled in
+    by_month[6] = random_panel(rng, [6], sources)  # replaced
+    del by_month[2]  # removed
+    write_panel(panel, [row for month in sorted(by_month) for row in by_month[month]])
+
+    revisions.update_revisions(["202409", "202404", "202406", "202402"], panel, target)
+    incremental = read(target)
+    revisions.update_revisions(panel=panel, target=target)
+    pd.testing.assert_frame_equal(incremental, read(target))
+
+
+def test_no_months_replaced_keeps_the_table(tmp_path):
+    panel, target = tmp_path / "forecasters.parquet", tmp_path / "revisions.parquet"
+    write_panel(panel, [observation(1, 1.0), observation(2, 1.5)])
+    revisions.update_revisions(panel=panel, target=target)
+    full = read(target)
+
+    assert revisions.update_revisions(set(), panel, target) == 2
+    pd.testing.assert_frame_equal(full, read(target))
+
+
+def test_null_source_links_back_incrementally(tmp_path):
+    # An unnamed forecaster (null source) missing in the month before an
+    # appended one: its previous observation is looked up in the history
+    panel, target = tmp_path / "forecasters.parquet", tmp_path / "revisions.parquet"
+    rows = [observation(month, 1.0) for month in (6, 7, 8)] + [observation(6, 2.0, source=None)]
+    write_panel(panel, rows)
+    revisions.update_revisions(panel=panel, target=target)
+
+    write_panel(panel, rows + [observation(9, 1.0), observation(9, 2.5, source=None)])
+    revisions.update_revisions(["202409"], panel, target)
+    incremental = read(target)
+    revisions.update_revisions(panel=panel, target=target)
+    pd.testing.assert_frame_equal(incremental, read(target))
+    unnamed = incremental[incremental["source"] != "Bank A"]
+    assert unnamed["gap"].tolist() == [False, True]
+    assert unnamed["previous_value"].iloc[1] == 2.0
+
+
+def test_months_consolidated_without_the_flag_are_spliced(tmp_path, monkeypatch, capsys):
+    output = tmp_path / "data" / "output"
+    output.mkdir(parents=True)
+    monkeypatch.chdir(tmp_path)
+    write_month(output, "202401", [1.0, 2.0])
+    write_month(output, "202402", [1.5, 2.5])
+    run_steps(revisions=True)
+    write_month(output, "202403", [1.8])  # Bank 1 exits in February
+    run_steps()
+    capsys.readouterr()
+
+    run_steps(revisions=True)
+    assert "revisions: up to date" not in capsys.readouterr().out
+    incremental = read(revisions.revisions_path())
+    consolidate_output.consolidate("forecasters")
+    revisions.update_revisions()
+    pd.testing.assert_frame_equal(incremental, read(revisions.revisions_path()))
+    assert incremental["survey_date"].dt.strftime("%Y%m").tolist() == [
+        "202401", "202401", "202402", "202402", "202403",
+    ]
+    assert incremental["exit"].tolist() == [False, False, False, True, False]
@@ -0,0 +1,67 @@
+"""Tests for the series-level index of the consolidated panel."""
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from consensus_economics import series_index
+from consensus_economics.series_index import SeriesIndex, index_path, series_entries
+from consensus_economics.store import ConsensusStore
+from mains.getters import consolidate_output
+from tests.test_consolidate_output import output, write_month  # noqa: F401
+
+
+def test_series_entries_group_rows():
+    keys = pa.table({
+        "country": pa.array(["Japan", "Italy", "Japan", "Japan"]).dictionary_encode(),
+        "variable": pa.array(["GDP", "GDP", "GDP", "CPI"]).dictionary_encode(),
+        "source": pa.array(["A", None, "A", "A"]).dictionary_encode(),
+        "statistic": pa.array(["forecast"] * 4).dictionary_encode(),
+        "year": [2024, 2024, 2024, 2024],
+    })
+    entries = series_entries(keys, first_row=10).to_pydict()
+    assert entries["country"] == ["Italy", "Japan", "Japan"]
+    assert entries["variable"] == ["GDP", "CPI", "GDP"]
+    assert entries["rows"] == [[11], [13], [10, 12]]
+
+
+def test_store_reads_through_index(output, monkeypatch):  # noqa: F811
+    panel = output / "forecasters.parquet"
+    index = SeriesIndex.load(panel)
+    assert index is not None and index.num_rows == 5
+    assert index.lookup({"source": ["Bank 1"]}).tolist() == [1, 4]
+
+    monkeypatch.setattr("consensus_economics.store.INDEX_MAX_SHARE", 1.0)
+    query = ConsensusStore().query(source="Bank 1", start="2024-02", columns=["value"])
+    assert query.rows is not None
+    assert query.to_pandas()["value"].tolist() == [5.0]
+
+    monkeypatch.setattr("consensus_economics.store.INDEX_MAX_SHARE", 0.0)
+    query = ConsensusStore().query(source="Bank 1", start="2024-02", columns=["value"])
+    assert query.rows is None
+    assert query.to_pandas()["value"].tolist() == [5.0]
+
+
+def test_incremental_rewrites_index(output):  # noqa: F811
+    write_month(output, "202404", [6.0, 7.0, 8.0])
+    consolidate_output.consolidate_incremental("forecasters")
+
+    panel = output / "forecasters.parquet"
+    index = SeriesIndex.load(panel)
+    assert index is not None
+    table = pq.read_table(panel)
+    for source in ["Bank 0", "Bank 1", "Bank 2"]:
+        rows = index.lookup({"source": [source]})
+        expected = np.flatnonzero(table["source"].to_numpy(zero_copy_only=False) == source)
+        assert rows.tolist() == expected.tolist()
+
+
+def test_stale_index_ignored(output):  # noqa: F811
+    panel = output / "forecasters.parquet"
+    entries = pq.read_table(index_path(panel))
+    series_index.write_series_index(index_path(panel), [entries], "another-panel")
+    assert SeriesIndex.load(panel) is None
+    assert ConsensusStore().read(source="Bank 0")["value"].tolist() == [1.0, 3.0, 4.0]
+
+    index_path(panel).unlink()
+    assert SeriesIndex.load(panel) is None
@@ -0,0 +1,95 @@
+"""Tests for the on-disk cache of raw sheet grids."""
+
+import os
+from datetime import datetime
+
+import pytest
+from openpyxl import Workbook
+from pandas import DataFrame
+
+from consensus_economics.worksheets import sheet_cache
+from consensus_economics.worksheets.base_worksheet import BaseWorksheet, clear_workbook_cache
+from consensus_economics.worksheets.sheet_cache import SheetCache, decode_grid, encode_grid
+
+DATE = "202409"
+
+
+@pytest.fixture
+def xlsx_path(tmp_path, monkeypatch):
+    """A workbook under a data/xlsx folder that Paths() resolves to."""
+    folder = tmp_path / "data" / "xlsx"
+    folder.mkdir(parents=True)
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(sheet_cache, "SHEET_CACHE_ENABLED", True)
+
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "USA"
+    ws.cell(4, 1, "September 9, 2024")
+    ws.cell(7, 1, "Consensus (Mean)")
+    ws.cell(7, 2, 2.5)
+    ws.cell(7, 3, "na")
+    ws.cell(9, 5, 3)
+    path = folder / f"{DATE}.xlsx"
+    wb.save(path)
+
+    yield path
+    clear_workbook_cache()
+
+
+def test_grid_round_trip():
+    rows = [
+        (None, "text", 1.5),
+        (3, True, datetime(2024, 9, 9)),
+        (None, None),
+    ]
+    decoded = decode_grid(encode_grid(rows))
+    assert decoded == [list(rows[0]), list(rows[1]), [None, None, None]]
+    assert DataFrame(decoded).dtypes.equals(DataFrame(rows).dtypes)
+
+
+def test_worksheet_served_from_cache(xlsx_path, monkeypatch):
+    first = BaseWorksheet(DATE, "USA").worksheet
+    clear_workbook_cache()
+
+    # A cache hit must not open the workbook at all
+    monkeypatch.setattr(
+        BaseWorksheet, "workbook", property(lambda self: pytest.fail("workbook was opened"))
+    )
+    second = BaseWorksheet(DATE, "USA").worksheet
+    assert second.equals(first)
+
+
+def test_absent_sheet_raises_key_error_from_cache(xlsx_path):
+    BaseWorksheet(DATE, "USA").worksheet
+    with pytest.raises(KeyError):
+        SheetCache(xlsx_path.parent.parent / "cache" / "sheets").get(xlsx_path, "Atlantis")
+
+
+def test_prune_evicts_least_recently_used(tmp_path):
+    cache = SheetCache(tmp_path / "cache", max_bytes=None)
+    workbooks = []
+    for i in range(3):
+        path = tmp_path / f"{i}.xlsx"
+        path.write_bytes(bytes([i]) * 10)
+        cache.put(path, "USA", [(float(j),) * 50 for j in range(50)])
+        workbooks.append(path)
+    # Least recently read first: workbook 1, then 0, then 2
+    for path, age in zip(workbooks, (200, 300, 100)):
+        entry = cache._sheet_file(cache._entry_dir(path), "USA")
+        stamp = entry.stat().st_mtime - age
+        os.utime(entry, (stamp, stamp))
+
+    one_entry = cache.size() // 3
+    cache.prune(one_entry)
+
+    assert cache.get(workbooks[0], "USA") is None
+    assert cache.get(workbooks[1], "USA") is None
+    assert cache.get(workbooks[2], "USA") is not None
+    assert len(list(cache.root.iterdir())) == 1
+
+
+def test_prune_without_cache_directory(tmp_path):
+    cache = SheetCache(tmp_path / "sheet_cache")
+    assert cache.prune(0) == 0
+    assert not (tmp_path / "sheet_cache").exists()
@@ -0,0 +1,108 @@
+"""Tests for filtered reads of the consolidated panel."""
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+from consensus_economics import dataset, store
+from consensus_economics.mappings.index import VariableMapIndex
+from consensus_economics.schema import consolidated_schema
+from consensus_economics.store import ConsensusStore
+
+
+@pytest.fixture
+def output_dir(tmp_path, monkeypatch):
+    (tmp_path / "data" / "output").mkdir(parents=True)
+    monkeypatch.chdir(tmp_path)
+    return tmp_path / "data" / "output"
+
+
+def panel() -> pd.DataFrame:
+    """Two countries x two variables x six months, sorted as on disk."""
+    rows = []
+    for country in ["Germany", "Japan"]:
+        for variable in ["CPI", "GDP"]:
+            for month in range(1, 7):
+                for source, statistic in [("Bank A", "forecast"), ("Consensus", "mean")]:
+                    rows.append({
+                        "country": country,
+                        "variable": variable,
+                        "source": source,
+                        "statistic": statistic,
+                        "year": 2024 + month % 2,
+                        "value": float(month),
+                        "unit": "%",
+                        "release_date": pd.Timestamp(2024, month, 10),
+                        "survey_date": pd.Timestamp(2024, month, 1),
+                    })
+    return pd.DataFrame(rows)
+
+
+@pytest.fixture
+def panel_file(output_dir):
+    path = output_dir / "forecasters.parquet"
+    schema = consolidated_schema("forecasters")
+    table = pa.Table.from_pandas(panel(), schema=schema, preserve_index=False)
+    pq.write_table(table, path, row_group_size=12)
+    return path
+
+
+def test_filters_match_pandas(panel_file):
+    df = panel()
+    result = ConsensusStore().read(
+        country="Japan", variable=["GDP"], source="Consensus", statistic="mean",
+        start="2024-02", end="2024-04-01",
+    )
+    expected = df[
+        (df["country"] == "Japan") & (df["variable"] == "GDP")
+        & (df["source"] == "Consensus") & (df["statistic"] == "mean")
+        & df["survey_date"].between("2024-02-01", "2024-04-01")
+    ]
+    assert result["value"].tolist() == expected["value"].tolist() == [2.0, 3.0, 4.0]
+    assert result["country"].dtype == "category"
+
+
+def test_skips_row_groups_by_statistics(panel_file):
+    query = ConsensusStore().query(country="Japan", variable="CPI", columns=["value"])
+    assert pq.ParquetFile(panel_file).metadata.num_row_groups == 4
+    assert sum(f.num_row_groups for f in query.source.get_fragments()) == 1
+    assert query.count_rows() == 12
+    assert query.to_pandas().columns.tolist() == ["value"]
+
+    assert ConsensusStore().query(country="France").to_pandas().empty
+
+
+def test_batches_and_year_filter(panel_file):
+    batches = list(ConsensusStore().query(year=2025, columns=["year"]).to_batches(batch_size=5))
+    assert all(isinstance(batch, pa.RecordBatch) for batch in batches)
+    assert sum(batch.num_rows for batch in batches) == 24
+    with pytest.raises(ValueError):
+        ConsensusStore().query(columns=["concept_id"])
+
+
+def test_concept_filter_respects_validity(panel_file, monkeypatch):
+    mapping = pd.DataFrame({
+        "country": ["Germany", "Germany", "Japan"],
+        "raw_variable": ["CPI", "CPI", "GDP"],
+        "valid_from": ["2000-01-01", "2024-04-01", "2000-01-01"],
+        "valid_to": ["2024-03-01", "", ""],
+        "concept_id": ["CPI_OLD", "CPI", "GDP"],
+    })
+    monkeypatch.setattr(store, "load_variable_index", lambda: VariableMapIndex(mapping))
+
+    result = ConsensusStore().read(concept_id="CPI", statistic="forecast", columns=["value"])
+    assert result.columns.tolist() == ["value", "concept_id"]
+    assert result["value"].tolist() == [4.0, 5.0, 6.0]
+    assert ConsensusStore().query(concept_id="NONE").to_pandas().empty
+
+
+def test_partitioned_source(output_dir):
+    df = panel()
+    for date, month in df.groupby(df["survey_date"].dt.strftime("%Y%m")):
+        month = month.assign(release_date=month["release_date"].dt.strftime("%Y%m%d"))
+        dataset.write_month(month, "forecasters", date)
+
+    result = ConsensusStore(partitioned=True).read(country="Germany", start="2024-06")
+    assert len(result) == 4
+    assert (result["survey_date"] == "2024-06-01").all()
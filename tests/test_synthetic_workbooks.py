@@ -0,0 +1,53 @@
+"""The parsers on generated workbooks, which need no licensed data."""
+
+import pytest
+
+from benchmarks import synthetic
+from consensus_economics.worksheets import sheet_cache
+from consensus_economics.worksheets.base_worksheet import clear_workbook_cache
+from consensus_economics.worksheets.country_worksheet import CountryWorksheet
+from consensus_economics.worksheets.forex_worksheet import ForexWorksheet
+from tests.test_golden_parsers import EXPECTED_COUNTRY_COLUMNS, EXPECTED_FOREX_COLUMNS
+
+DATE = "202409"
+
+
+@pytest.fixture
+def workbook(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(sheet_cache, "SHEET_CACHE_ENABLED", False)
+    path = synthetic.write_workbook(
+        tmp_path / "data" / "xlsx" / f"{DATE}.xlsx", DATE,
+        countries=3, forecasters=4, variables=5, missing=0.0,
+    )
+    yield path
+    clear_workbook_cache()
+
+
+def test_country_sheets_parse_completely(workbook):
+    ws = CountryWorksheet(DATE, "Germany")
+    df = ws.forecasters_data
+
+    assert list(df.columns) == EXPECTED_COUNTRY_COLUMNS
+    assert ws.release_date == "20240909"
+    # 5 variables x 2 years x (5 statistics + 4 forecasters), plus the
+    # Increase leg of the monetary-policy triple
+    assert len(df) == 5 * 2 * 9 + 1
+    assert set(df["variable"]) == set(synthetic.variable_names(5)) | {synthetic.MONETARY_POLICY}
+    assert ws.skipped_cells == 1
+
+    gdp = df[(df["variable"] == "Gross Domestic Product") & (df["year"] == 2024)]
+    forecasts = gdp.loc[gdp["statistic"] == "forecast", "value"]
+    stats = gdp[gdp["source"] == "Consensus"].set_index("statistic")["value"]
+    assert stats["mean"] == pytest.approx(forecasts.mean(), abs=1e-4)
+    assert stats["high"] == forecasts.max() and stats["low"] == forecasts.min()
+    assert stats["count"] == 4
+
+
+def test_forex_sheet_parses_both_blocks(workbook):
+    df = ForexWorksheet(DATE).forecasters_data
+
+    assert list(df.columns) == EXPECTED_FOREX_COLUMNS
+    # 13 currencies x 3 horizons, as in the real workbooks
+    assert len(df) == 39
+    assert df.groupby("reference")["currency"].nunique().to_dict() == {"EUR": 4, "USD": 9}
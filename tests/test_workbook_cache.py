@@ -0,0 +1,91 @@
+"""Tests for the bounded LRU workbook cache."""
+
+import threading
+import time
+
+import pytest
+
+from consensus_economics.worksheets.workbook_cache import (
+    READ_ONLY_SIZE_FACTOR,
+    WorkbookCache,
+)
+
+
+class StubWorkbook:
+    def __init__(self, path, read_only):
+        self.path = path
+        self.read_only = read_only
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def files(tmp_path):
+    """Three 100-byte xlsx stand-ins."""
+    paths = {}
+    for date in ("202401", "202402", "202403"):
+        paths[date] = tmp_path / f"{date}.xlsx"
+        paths[date].write_bytes(b"x" * 100)
+    return paths
+
+
+def test_evicts_least_recently_used_entry(files):
+    cache = WorkbookCache(max_entries=2, max_bytes=None, loader=StubWorkbook)
+    first = cache.get("202401", files["202401"])
+    evicted = cache.get("202402", files["202402"])
+    assert cache.get("202401", files["202401"]) is first  # now most recent
+    cache.get("202403", files["202403"])
+
+    assert ("202401", True) in cache
+    assert ("202402", True) not in cache
+    assert evicted.closed and not first.closed
+    stats = cache.stats
+    assert (stats.hits, stats.misses, stats.evictions, stats.entries) == (1, 3, 1, 2)
+
+
+def test_byte_budget_keeps_most_recent(files):
+    one = 100 * READ_ONLY_SIZE_FACTOR
+    cache = WorkbookCache(max_entries=None, max_bytes=one * 2, loader=StubWorkbook)
+    for date in files:
+        cache.get(date, files[date])
+    assert cache.stats.bytes == one * 2
+    assert ("202401", True) not in cache
+
+    # A single workbook above the budget is still held
+    tiny = WorkbookCache(max_entries=None, max_bytes=1, loader=StubWorkbook)
+    tiny.get("202401", files["202401"])
+    assert len(tiny) == 1
+
+
+def test_clear_closes_workbooks(files):
+    cache = WorkbookCache(loader=StubWorkbook)
+    streamed = cache.get("202401", files["202401"])
+    full = cache.get("202401", files["202401"], read_only=False)
+    other = cache.get("202402", files["202402"])
+
+    cache.clear("202401")
+    assert streamed.closed and full.closed and not other.closed
+    assert len(cache) == 1 and cache.stats.bytes == 100 * READ_ONLY_SIZE_FACTOR
+
+
+def test_concurrent_gets_share_one_workbook(files):
+    def slow_loader(path, read_only):
+        time.sleep(0.01)
+        return StubWorkbook(path, read_only)
+
+    cache = WorkbookCache(loader=slow_loader)
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(cache.get("202401", files["202401"])))
+        for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(results) == 8
+    assert all(workbook is results[0] for workbook in results)
+    assert len(cache) == 1 and not results[0].closed